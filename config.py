@@ -29,6 +29,46 @@ class Config:
     # Configuración de actualizaciones
     AUTO_REFRESH_INTERVAL = 10000  # 10 segundos
     
+    # Instrumentación SQL (POS_SQL_TRACE=1): consultas por operación y log de consultas lentas
+    SQL_TRACE = os.environ.get("POS_SQL_TRACE", "0") == "1"
+    SQL_SLOW_QUERY_MS = float(os.environ.get("POS_SQL_SLOW_MS", "50"))
+    SQL_SLOW_QUERY_LOG = os.path.join("logs", "slow_queries.log")
+    
+    # Detector de congelamientos de la UI (POS_UI_WATCHDOG=1): retraso del event loop y pila del hilo principal
+    UI_WATCHDOG = os.environ.get("POS_UI_WATCHDOG", "0") == "1"
+    UI_WATCHDOG_INTERVAL_MS = int(os.environ.get("POS_UI_WATCHDOG_INTERVAL_MS", "50"))
+    UI_WATCHDOG_THRESHOLD_MS = int(os.environ.get("POS_UI_FREEZE_MS", "250"))
+    UI_WATCHDOG_LOG = os.path.join("logs", "ui_freezes.log")
+    
+    # Pestañas de administración: se construyen al abrirlas; con POS_ADMIN_PREWARM=1 se precargan tras el primer pintado
+    ADMIN_PREWARM_TABS = os.environ.get("POS_ADMIN_PREWARM", "0") == "1"
+    
+    # Contraseñas (PBKDF2) por instalación: los hashes con otros parámetros se regeneran al iniciar sesión
+    PASSWORD_HASH_ALGORITHM = os.environ.get("POS_PASSWORD_HASH", "sha256")
+    PASSWORD_HASH_ITERATIONS = int(os.environ.get("POS_PASSWORD_ITERATIONS", "100000"))
+    
+    # Caché en memoria de verificaciones recientes (re-login y desbloqueo); nunca se guarda en disco
+    AUTH_CACHE_SIZE = int(os.environ.get("POS_AUTH_CACHE_SIZE", "16"))
+    AUTH_CACHE_TTL_SECONDS = int(os.environ.get("POS_AUTH_CACHE_TTL", "300"))
+    
+    # Bloquear / cambiar de usuario: límite de memoria (MB) antes de descartar el panel de administración oculto
+    WINDOW_MEMORY_CAP_MB = int(os.environ.get("POS_WINDOW_MEMORY_CAP_MB", "350"))
+    
+    # Catálogo en memoria: cada cuántos segundos se consulta catalog_version por cambios de otras terminales
+    CATALOG_CHECK_SECONDS = float(os.environ.get("POS_CATALOG_CHECK_SECONDS", "5"))
+    
+    # Imágenes de productos: originales y miniaturas direccionadas por contenido, LRU de QPixmap en memoria
+    PRODUCT_IMAGE_DIR = os.path.join("data", "product_images")
+    THUMBNAIL_DIR = os.path.join("data", "thumbnails")
+    THUMBNAIL_SIZE = 96
+    PIXMAP_CACHE_SIZE = 256
+    
+    # Diario de escrituras (POS_WRITE_JOURNAL=1): órdenes y pagos se anotan con fsync por lotes y se aplican en segundo plano
+    WRITE_JOURNAL = os.environ.get("POS_WRITE_JOURNAL", "0") == "1"
+    WRITE_JOURNAL_PATH = os.path.join("data", "pending_writes.jsonl")
+    WRITE_JOURNAL_BATCH_SIZE = int(os.environ.get("POS_WRITE_JOURNAL_BATCH", "100"))
+    WRITE_JOURNAL_COMPACT_BYTES = 256 * 1024  # Vaciar el diario al superar este tamaño sin pendientes
+    
     @staticmethod
     def init_directories():
         """Crear directorios necesarios"""
@@ -1,7 +1,17 @@
-from .product_controller import ProductController
-from .order_controller import OrderController
-from .report_controller import ReportController
-from .payment_controller import PaymentController
+# controllers/__init__.py
+# Importación diferida: cada controlador se carga al usarse por primera vez
+import importlib
+
+_EXPORTS = {
+    'ProductController': '.product_controller',
+    'OrderController': '.order_controller',
+    'ReportController': '.report_controller',
+    'PaymentController': '.payment_controller',
+}
 
 __all__ = ['ProductController', 'OrderController', 'ReportController', 'PaymentController']
 
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,19 +2,22 @@
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QObject, pyqtSignal
 from views.login_window import LoginWindow
-from views.pos_window import POSWindow
-from views.admin_window import AdminWindow
 from models.user import UserRole
+from utils.process_memory import current_rss_mb
+from config import Config
+import gc
 
 class AppController(QObject):
     """Controlador principal de la aplicación que maneja el flujo entre ventanas"""
     
-    def __init__(self):
+    def __init__(self, memory_cap_mb=None):
         super().__init__()
         self.current_user = None
         self.login_window = None
         self.pos_window = None
         self.admin_window = None
+        # Memoria máxima con ventanas ocultas conservadas (bloquear / cambiar de usuario)
+        self.memory_cap_mb = Config.WINDOW_MEMORY_CAP_MB if memory_cap_mb is None else memory_cap_mb
         
     def start_application(self):
         """Iniciar la aplicación mostrando el login"""
@@ -58,6 +61,9 @@ class AppController(QObject):
                 self.show_admin_window()
             else:
                 self.show_pos_window()
+            
+            # Las ventanas que quedaron ocultas no deben superar el límite de memoria
+            self.enforce_memory_cap()
                 
         except Exception as e:
             print(f"❌ Error al manejar login exitoso: {e}")
@@ -67,11 +73,23 @@ class AppController(QObject):
     def show_pos_window(self):
         """Mostrar ventana POS para usuarios regulares"""
         try:
+            if self.pos_window is not None:
+                # Cambio de cajero: reutilizar ventana, vistas de cocina/historial y controladores
+                print("♻️ Reutilizando ventana POS...")
+                self.pos_window.set_user(self.current_user)
+                self.pos_window.showMaximized()
+                self.pos_window.activateWindow()
+                return
+            
             print("🍽️ Iniciando ventana POS...")
+            # Importación diferida: la ventana POS no se carga antes del login
+            from views.pos_window import POSWindow
             self.pos_window = POSWindow()
+            self.pos_window.set_user(self.current_user)
             
-            # Conectar señal de logout
+            # Conectar señales de logout y bloqueo
             self.pos_window.logout_requested.connect(self.handle_logout)
+            self.pos_window.lock_requested.connect(self.lock_session)
             
             # Mostrar en pantalla completa
             self.pos_window.showMaximized()
@@ -85,9 +103,23 @@ class AppController(QObject):
     def show_admin_window(self):
         """Mostrar ventana de administración para administradores"""
         try:
+            if self.admin_window is not None:
+                if self.admin_window.user.id == self.current_user.id:
+                    # Mismo administrador: desbloquear sin reconstruir
+                    print("♻️ Reutilizando ventana de administración...")
+                    self.admin_window.set_user(self.current_user)
+                    self.admin_window.showMaximized()
+                    self.admin_window.activateWindow()
+                    return
+                # Otro administrador: el panel muestra datos del anterior
+                self.evict_admin_window()
+            
             print("⚙️ Iniciando ventana de administración...")
+            # Importación diferida: pestañas de administración, reportes y configuración
+            from views.admin_window import AdminWindow
             self.admin_window = AdminWindow(self.current_user)
             self.admin_window.logout_requested.connect(self.handle_logout)
+            self.admin_window.lock_requested.connect(self.lock_session)
             
             # Mostrar en pantalla completa
             self.admin_window.showMaximized()
@@ -98,6 +130,44 @@ class AppController(QObject):
             import traceback
             traceback.print_exc()
     
+    def lock_session(self):
+        """Bloquear y cambiar de usuario conservando las ventanas, cachés y sesiones"""
+        try:
+            print("🔒 Sesión bloqueada")
+            for window in (self.pos_window, self.admin_window):
+                if window:
+                    window.hide()
+            
+            self.enforce_memory_cap()
+            
+            self.login_window = LoginWindow(locked_user=self.current_user)
+            self.login_window.login_successful.connect(self.handle_successful_login)
+            self.login_window.show()
+            
+        except Exception as e:
+            print(f"❌ Error al bloquear sesión: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def enforce_memory_cap(self):
+        """Descartar el panel de administración oculto si la memoria supera el límite"""
+        if self.admin_window is None or self.admin_window.isVisible():
+            return
+        rss_mb = current_rss_mb()
+        if rss_mb is None or rss_mb <= self.memory_cap_mb:
+            return
+        print(f"🧹 Memoria {rss_mb:.0f} MB > {self.memory_cap_mb} MB: descartando ventana de administración oculta")
+        self.evict_admin_window()
+    
+    def evict_admin_window(self):
+        """Cerrar y liberar la ventana de administración"""
+        if self.admin_window is None:
+            return
+        self.admin_window.close()
+        self.admin_window.deleteLater()
+        self.admin_window = None
+        gc.collect()
+    
     def handle_logout(self):
         """Manejar cierre de sesión"""
         try:
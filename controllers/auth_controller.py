@@ -1,15 +1,125 @@
 # controllers/auth_controller.py
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import and_
-from models.base import get_db
-from models.user import User, UserRole
+from models.base import ThreadSessionMixin
+from models.user import (User, UserRole, hash_password, verify_password_hash,
+                         password_hash_outdated)
+from config import Config
+from collections import OrderedDict
 from datetime import datetime
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 
-class AuthController:
+# Estados del login asíncrono (se informan a on_progress en el hilo de la UI)
+LOGIN_FINDING_USER = "🔍 Buscando usuario..."
+LOGIN_VERIFYING = "🔐 Verificando contraseña..."
+LOGIN_FINISHING = "✅ Iniciando sesión..."
+
+class VerificationCache:
+    """Caché en memoria de contraseñas verificadas recientemente (re-login y desbloqueo)
+    
+    No guarda la contraseña ni su hash PBKDF2: solo un HMAC con una clave
+    aleatoria del proceso, ligado al hash almacenado del usuario (si la
+    contraseña cambia, la entrada deja de coincidir). Acotada por tamaño y
+    tiempo de vida; nunca se escribe a disco.
+    """
+    
+    def __init__(self, max_entries=16, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._key = secrets.token_bytes(32)
+        self._entries = OrderedDict()  # user_id -> (huella, expira)
+        self._lock = threading.Lock()
+    
+    def _fingerprint(self, user_id, password_hash, password):
+        message = f"{user_id}\0{password_hash}\0{password}".encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+    
+    def check(self, user_id, password_hash, password):
+        """Verificar si la contraseña coincide con una verificación vigente"""
+        if self.max_entries <= 0:
+            return False
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return False
+            fingerprint, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return False
+        return hmac.compare_digest(fingerprint, self._fingerprint(user_id, password_hash, password))
+    
+    def store(self, user_id, password_hash, password):
+        """Registrar una verificación exitosa"""
+        if self.max_entries <= 0:
+            return
+        fingerprint = self._fingerprint(user_id, password_hash, password)
+        with self._lock:
+            self._entries[user_id] = (fingerprint, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id=None):
+        """Descartar la verificación de un usuario (o todas)"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+# Compartida por todas las instancias: el login se recrea en cada cierre de sesión
+verification_cache = VerificationCache(Config.AUTH_CACHE_SIZE, Config.AUTH_CACHE_TTL_SECONDS)
+
+def verify_credentials(salt, password_hash, password):
+    """Verificar la contraseña con PBKDF2 (sin sesión: se ejecuta en el hilo de trabajo)
+    
+    Returns:
+        dict: valid, y si el hash usa parámetros anteriores, el nuevo salt/hash
+    """
+    result = {'valid': verify_password_hash(password, salt, password_hash), 'rehash': None}
+    if result['valid'] and password_hash_outdated(password_hash):
+        # Regenerar aquí también: es otra derivación PBKDF2 completa
+        new_salt = secrets.token_hex(32)
+        result['rehash'] = (new_salt, hash_password(password, new_salt))
+    return result
+
+class AuthController(ThreadSessionMixin):
     """Controlador para autenticación y gestión de usuarios"""
     
     def __init__(self):
-        self.db = get_db()
+        self.init_sessions()
+        self._loader = None
+    
+    def find_active_user(self, username):
+        """Obtener usuario activo por nombre de usuario"""
+        return self.db.query(User).filter(
+            and_(
+                User.username == username,
+                User.is_active == True
+            )
+        ).first()
+    
+    def verify_password(self, user, password):
+        """Verificar contraseña usando primero la caché de verificaciones (desbloqueo rápido)"""
+        if verification_cache.check(user.id, user.password_hash, password):
+            return True
+        result = verify_credentials(user.salt, user.password_hash, password)
+        if result['valid']:
+            self._apply_rehash(user, result['rehash'])
+            verification_cache.store(user.id, user.password_hash, password)
+        return result['valid']
+    
+    def _apply_rehash(self, user, rehash):
+        """Guardar el hash regenerado con los parámetros actuales"""
+        if rehash is None:
+            return
+        user.salt, user.password_hash = rehash
+        self.db.commit()
+        print(f"🔐 Hash de contraseña actualizado para {user.username}")
     
     def login(self, username, password):
         """
@@ -19,29 +129,91 @@ class AuthController:
             tuple: (success: bool, user: User|None, message: str)
         """
         try:
-            user = self.db.query(User).filter(
-                and_(
-                    User.username == username,
-                    User.is_active == True
-                )
-            ).first()
+            user = self.find_active_user(username)
             
             if not user:
                 return False, None, "Usuario no encontrado o inactivo"
             
-            if not user.check_password(password):
+            if not self.verify_password(user, password):
                 return False, None, "Contraseña incorrecta"
             
-            # Actualizar último login
-            user.last_login = datetime.now()
-            self.db.commit()
-            
-            return True, user, "Login exitoso"
+            return self._complete_login(user)
             
         except Exception as e:
             self.db.rollback()
             return False, None, f"Error en autenticación: {str(e)}"
     
+    def _complete_login(self, user):
+        """Actualizar último login"""
+        user.last_login = datetime.now()
+        self.db.commit()
+        return True, user, "Login exitoso"
+    
+    def login_async(self, username, password, on_result, on_progress=None):
+        """
+        Autenticar usuario sin bloquear la UI
+        
+        La consulta y la actualización del usuario se hacen en el hilo de la UI
+        (la sesión es del hilo); solo la derivación PBKDF2 va al hilo de trabajo.
+        Si la contraseña está en la caché de verificaciones responde de inmediato.
+        
+        Args:
+            on_result: Callback con (success, user, message), en el hilo de la UI
+            on_progress: Callback con el estado actual (LOGIN_*), en el hilo de la UI
+        """
+        def report(state):
+            if on_progress:
+                on_progress(state)
+        
+        try:
+            report(LOGIN_FINDING_USER)
+            user = self.find_active_user(username)
+            if not user:
+                on_result(False, None, "Usuario no encontrado o inactivo")
+                return
+            
+            if verification_cache.check(user.id, user.password_hash, password):
+                report(LOGIN_FINISHING)
+                on_result(*self._complete_login(user))
+                return
+        except Exception as e:
+            self.db.rollback()
+            on_result(False, None, f"Error en autenticación: {str(e)}")
+            return
+        
+        def finish(result):
+            try:
+                if not result['valid']:
+                    on_result(False, None, "Contraseña incorrecta")
+                    return
+                report(LOGIN_FINISHING)
+                self._apply_rehash(user, result['rehash'])
+                verification_cache.store(user.id, user.password_hash, password)
+                on_result(*self._complete_login(user))
+            except Exception as e:
+                self.db.rollback()
+                on_result(False, None, f"Error en autenticación: {str(e)}")
+        
+        def fail(message):
+            on_result(False, None, f"Error en autenticación: {message}")
+        
+        if self._loader is None:
+            # Importación diferida: el controlador también se usa sin Qt (scripts)
+            from utils.background_loader import BackgroundLoader
+            self._loader = BackgroundLoader(max_threads=1)
+            self._loader.name = type(self).__name__
+        
+        report(LOGIN_VERIFYING)
+        self._loader.submit(
+            "login", verify_credentials, user.salt, user.password_hash, password,
+            on_result=finish, on_error=fail
+        )
+    
+    def cancel_login(self):
+        """Descartar un login asíncrono en curso"""
+        if self._loader is not None:
+            self._loader.cancel("login")
+    
     def create_user(self, username, password, full_name, email=None, role=UserRole.REGULAR):
         """
         Crear nuevo usuario
@@ -106,6 +278,7 @@ class AuthController:
             for key, value in kwargs.items():
                 if key == 'password':
                     user.set_password(value)
+                    verification_cache.invalidate(user.id)
                 elif hasattr(user, key):
                     setattr(user, key, value)
             
@@ -125,6 +298,7 @@ class AuthController:
             
             user.is_active = False
             self.db.commit()
+            verification_cache.invalidate(user.id)
             return True, "Usuario desactivado exitosamente"
             
         except Exception as e:
@@ -222,9 +396,8 @@ class AuthController:
             }
     
     def close(self):
-        """Cerrar conexión a la base de datos"""
-        if self.db:
-            self.db.close()
+        """Cerrar la sesión del hilo actual"""
+        self.reset_session()
     
     def __del__(self):
         """Destructor para cerrar la conexión"""
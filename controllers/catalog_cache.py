@@ -0,0 +1,221 @@
+# controllers/catalog_cache.py
+from models.base import session_scope
+from models.category import Category
+from models.product import Product
+from models.catalog_version import get_catalog_version
+from controllers.product_search import ProductSearchIndex, normalize_code
+from config import Config
+import threading
+import time
+import weakref
+
+class CatalogProduct:
+    """Producto del catálogo en memoria (sin sesión: se puede usar desde cualquier vista)"""
+
+    __slots__ = ("id", "name", "description", "price", "category_id", "image_path",
+                 "is_featured", "preparation_time", "sku")
+
+    def __init__(self, product):
+        self.id = product.id
+        self.name = product.name
+        self.description = product.description
+        self.price = product.price
+        self.category_id = product.category_id
+        self.image_path = product.image_path
+        self.is_featured = product.is_featured
+        self.preparation_time = product.preparation_time
+        self.sku = product.sku
+
+    def __repr__(self):
+        return f"<CatalogProduct(id={self.id}, name='{self.name}', price={self.price})>"
+
+class CatalogCategory:
+    """Categoría activa del catálogo en memoria"""
+
+    __slots__ = ("id", "name", "description")
+
+    def __init__(self, category):
+        self.id = category.id
+        self.name = category.name
+        self.description = category.description
+
+    def __repr__(self):
+        return f"<CatalogCategory(id={self.id}, name='{self.name}')>"
+
+class CatalogCache:
+    """Catálogo activo (categorías y productos) en memoria, indexado por id y categoría
+
+    - MenuController aplica sus cambios aquí después de confirmarlos
+      (actualización incremental, sin recargar de la base de datos).
+    - Los cambios de otras terminales se detectan con el contador
+      catalog_version de la base de datos, consultado como máximo cada
+      check_interval segundos.
+    - Las vistas se suscriben con subscribe() para redibujar cuando cambia.
+    - search() y get_product_by_code() responden desde memoria (búsqueda
+      del POS y lector de códigos de barras sin consultar la base de datos).
+    """
+
+    def __init__(self, check_interval=None):
+        self.check_interval = Config.CATALOG_CHECK_SECONDS if check_interval is None else check_interval
+        self.version = None
+        self._last_check = 0.0
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._categories = {}
+        self._products = {}
+        self._ordered_categories = ()
+        self._ordered_products = ()
+        self._by_category = {}
+        self._by_code = {}
+        self.search_index = ProductSearchIndex()
+
+    # === CONSULTAS (en memoria) ===
+
+    def get_categories(self):
+        """Categorías activas ordenadas por id"""
+        self.ensure_fresh()
+        return self._ordered_categories
+
+    def get_products(self, category_id=None):
+        """Productos activos, todos o de una categoría, ordenados por id"""
+        self.ensure_fresh()
+        if category_id is None:
+            return self._ordered_products
+        return self._by_category.get(category_id, ())
+
+    def get_product(self, product_id):
+        """Producto activo por id (None si no existe o está inactivo)"""
+        self.ensure_fresh()
+        return self._products.get(product_id)
+
+    def get_product_by_code(self, code):
+        """Producto activo por código SKU/PLU o de barras (None si no existe)"""
+        self.ensure_fresh()
+        return self._by_code.get(normalize_code(code))
+
+    def search(self, query, limit=50):
+        """Productos activos que coinciden con la búsqueda (nombre, descripción o código)"""
+        self.ensure_fresh()
+        with self._lock:
+            return self.search_index.search(query, limit)
+
+    # === SINCRONIZACIÓN ===
+
+    def ensure_fresh(self, force=False):
+        """Recargar si la versión de la base de datos cambió (consulta limitada por intervalo)
+
+        Returns:
+            bool: True si el catálogo se recargó
+        """
+        now = time.monotonic()
+        if not force and self.version is not None and now - self._last_check < self.check_interval:
+            return False
+        with self._lock:
+            self._last_check = now
+            with session_scope() as db:
+                db_version = get_catalog_version(db)
+                if self.version is not None and db_version == self.version:
+                    return False
+                self._load(db, db_version)
+        self._notify()
+        return True
+
+    def invalidate(self):
+        """Forzar la recarga completa en la próxima consulta"""
+        with self._lock:
+            self.version = None
+
+    def _load(self, db, db_version):
+        """Cargar categorías y productos activos"""
+        categories = db.query(Category).filter(Category.is_active == True).order_by(Category.id).all()
+        products = db.query(Product).filter(Product.is_active == True).order_by(Product.id).all()
+        self._categories = {category.id: CatalogCategory(category) for category in categories}
+        self._products = {product.id: CatalogProduct(product) for product in products}
+        self._reindex()
+        self.search_index.rebuild(self._ordered_products)
+        self.version = db_version
+        print(f"📦 Catálogo cargado: {len(self._categories)} categorías, {len(self._products)} productos (versión {db_version})")
+
+    def _reindex(self):
+        """Reconstruir las secuencias ordenadas y el índice por categoría"""
+        self._ordered_categories = tuple(self._categories[key] for key in sorted(self._categories))
+        self._ordered_products = tuple(self._products[key] for key in sorted(self._products))
+        by_category = {}
+        for product in self._ordered_products:
+            by_category.setdefault(product.category_id, []).append(product)
+        self._by_category = {key: tuple(value) for key, value in by_category.items()}
+        self._by_code = {normalize_code(product.sku): product for product in self._ordered_products if product.sku}
+
+    # === CAMBIOS LOCALES (MenuController, después del commit) ===
+
+    def _apply_local_change(self, change):
+        """Aplicar un cambio ya confirmado que incrementó catalog_version en uno"""
+        with self._lock:
+            if self.version is None:
+                # Aún no cargado: la primera consulta lo leerá completo
+                return
+            change()
+            self._reindex()
+            # Si otra terminal también cambió el catálogo, la versión no coincidirá y se recarga
+            self.version += 1
+        self._notify()
+
+    def product_changed(self, product):
+        """Producto creado o actualizado"""
+        def change():
+            if product.is_active:
+                cached = self._products[product.id] = CatalogProduct(product)
+                self.search_index.add(cached)
+            else:
+                self._products.pop(product.id, None)
+                self.search_index.remove(product.id)
+        self._apply_local_change(change)
+
+    def product_removed(self, product_id):
+        """Producto eliminado"""
+        def change():
+            self._products.pop(product_id, None)
+            self.search_index.remove(product_id)
+        self._apply_local_change(change)
+
+    def category_changed(self, category):
+        """Categoría creada o actualizada"""
+        def change():
+            if category.is_active:
+                self._categories[category.id] = CatalogCategory(category)
+            else:
+                self._categories.pop(category.id, None)
+        self._apply_local_change(change)
+
+    def category_removed(self, category_id):
+        """Categoría eliminada"""
+        self._apply_local_change(lambda: self._categories.pop(category_id, None))
+
+    # === SUSCRIPCIONES ===
+
+    def subscribe(self, callback):
+        """Llamar a callback() cuando el catálogo cambie (referencia débil para métodos de vistas)"""
+        if hasattr(callback, "__self__"):
+            self._listeners.append(weakref.WeakMethod(callback))
+        else:
+            self._listeners.append(lambda: callback)
+
+    def unsubscribe(self, callback):
+        """Dejar de recibir cambios"""
+        self._listeners = [ref for ref in self._listeners if ref() not in (None, callback)]
+
+    def _notify(self):
+        alive = []
+        for ref in self._listeners:
+            callback = ref()
+            if callback is None:
+                continue
+            alive.append(ref)
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️  Error al notificar cambio de catálogo: {e}")
+        self._listeners = alive
+
+# Compartido por todas las vistas del proceso
+catalog_cache = CatalogCache()
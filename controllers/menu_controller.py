@@ -1,20 +1,22 @@
 # controllers/menu_controller.py
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, and_, func
-from models.base import get_db
+from models.base import ThreadSessionMixin, begin_write
 from models.category import Category
 from models.product import Product
 from models.order_item import OrderItem
 from models.order import Order
+from models.catalog_version import bump_catalog_version
+from controllers.catalog_cache import catalog_cache
 from datetime import datetime, timedelta
 import os
 import shutil
 
-class MenuController:
+class MenuController(ThreadSessionMixin):
     """Controlador para gestión del menú"""
     
     def __init__(self):
-        self.db = get_db()
+        self.init_sessions()
         
     def refresh_session(self):
         self.db.expire_all()
@@ -43,9 +45,11 @@ class MenuController:
     def create_category(self, name, description=None):
         """Crear nueva categoría"""
         try:
+            begin_write(self.db)  # Cambio y versión del catálogo se confirman juntos
             # Verificar si ya existe
             existing = self.db.query(Category).filter(Category.name == name).first()
             if existing:
+                self.db.rollback()
                 return False, "Ya existe una categoría con ese nombre"
             
             category = Category(
@@ -53,8 +57,10 @@ class MenuController:
                 description=description.strip() if description else None
             )
             self.db.add(category)
+            bump_catalog_version(self.db)
             self.db.commit()
             self.db.refresh(category)
+            catalog_cache.category_changed(category)
             
             return True, f"Categoría '{name}' creada exitosamente"
             
@@ -65,8 +71,10 @@ class MenuController:
     def update_category(self, category_id, name=None, description=None, is_active=None):
         """Actualizar categoría"""
         try:
+            begin_write(self.db)  # Cambio y versión del catálogo se confirman juntos
             category = self.get_category_by_id(category_id)
             if not category:
+                self.db.rollback()
                 return False, "Categoría no encontrada"
             
             # Verificar nombre duplicado si se está cambiando
@@ -75,6 +83,7 @@ class MenuController:
                     and_(Category.name == name, Category.id != category_id)
                 ).first()
                 if existing:
+                    self.db.rollback()
                     return False, "Ya existe una categoría con ese nombre"
             
             # Actualizar campos
@@ -85,7 +94,9 @@ class MenuController:
             if is_active is not None:
                 category.is_active = is_active
             
+            bump_catalog_version(self.db)
             self.db.commit()
+            catalog_cache.category_changed(category)
             return True, f"Categoría '{category.name}' actualizada exitosamente"
             
         except Exception as e:
@@ -95,17 +106,24 @@ class MenuController:
     def delete_category(self, category_id):
         """Eliminar categoría (solo si no tiene productos)"""
         try:
+            begin_write(self.db)  # Cambio y versión del catálogo se confirman juntos
             category = self.get_category_by_id(category_id)
             if not category:
+                self.db.rollback()
                 return False, "Categoría no encontrada"
             
             # Verificar si tiene productos
             if category.products:
+                self.db.rollback()
                 return False, f"No se puede eliminar la categoría '{category.name}' porque tiene productos asociados"
             
+            category_id = category.id
+            category_name = category.name
             self.db.delete(category)
+            bump_catalog_version(self.db)
             self.db.commit()
-            return True, f"Categoría '{category.name}' eliminada exitosamente"
+            catalog_cache.category_removed(category_id)
+            return True, f"Categoría '{category_name}' eliminada exitosamente"
             
         except Exception as e:
             self.db.rollback()
@@ -138,13 +156,44 @@ class MenuController:
             print(f"Error al obtener producto: {e}")
             return None
     
+    def import_image(self, image_source):
+        """Importar una foto al almacén de imágenes (miniaturas incluidas) y devolver su ruta"""
+        # Importación diferida: requiere QtGui solo cuando hay imágenes
+        from utils.image_cache import import_product_image
+        return import_product_image(image_source)
+    
+    def release_image(self, image_path, exclude_product_id=None):
+        """Eliminar una imagen y sus miniaturas si ningún otro producto la usa"""
+        if not image_path or not os.path.exists(image_path):
+            return
+        try:
+            query = self.db.query(Product).filter(Product.image_path == image_path)
+            if exclude_product_id is not None:
+                query = query.filter(Product.id != exclude_product_id)
+            if query.first():
+                return
+            from utils.image_cache import remove_product_image
+            remove_product_image(image_path)
+        except Exception:
+            pass  # No fallar si no se puede eliminar la imagen
+    
+    def find_product_by_sku(self, sku, exclude_product_id=None):
+        """Producto con un código SKU/PLU (para evitar duplicados)"""
+        query = self.db.query(Product).filter(Product.sku == sku)
+        if exclude_product_id is not None:
+            query = query.filter(Product.id != exclude_product_id)
+        return query.first()
+    
     def create_product(self, name, price, category_id, description=None, cost=None, 
-                      preparation_time=None, stock=0):
-        """Crear nuevo producto"""
+                      preparation_time=None, stock=0, image_source=None, sku=None):
+        """Crear nuevo producto (image_source: foto a importar, opcional; sku: código SKU/PLU)"""
+        imported_image = None  # Se elimina si el producto no llega a guardarse
         try:
+            begin_write(self.db)  # Cambio y versión del catálogo se confirman juntos
             # Verificar que la categoría existe
             category = self.get_category_by_id(category_id)
             if not category:
+                self.db.rollback()
                 return False, None, "Categoría no encontrada"
             
             # Verificar nombre duplicado en la misma categoría
@@ -152,8 +201,14 @@ class MenuController:
                 and_(Product.name == name, Product.category_id == category_id)
             ).first()
             if existing:
+                self.db.rollback()
                 return False, None, "Ya existe un producto con ese nombre en esta categoría"
             
+            sku = sku.strip() if sku else None
+            if sku and self.find_product_by_sku(sku):
+                self.db.rollback()
+                return False, None, f"Ya existe un producto con el código '{sku}'"
+            
             product = Product(
                 name=name.strip(),
                 description=description.strip() if description else None,
@@ -161,34 +216,51 @@ class MenuController:
                 cost=float(cost) if cost else None,
                 category_id=category_id,
                 preparation_time=int(preparation_time) if preparation_time else None,
-                stock=int(stock) if stock else 0
+                stock=int(stock) if stock else 0,
+                sku=sku
             )
+            if image_source:
+                try:
+                    product.image_path = imported_image = self.import_image(image_source)
+                except Exception as e:
+                    self.db.rollback()
+                    return False, None, f"Error al importar la imagen: {str(e)}"
             
             self.db.add(product)
+            bump_catalog_version(self.db)
             self.db.commit()
+            imported_image = None  # Ya la usa el producto guardado
             self.db.refresh(product)
+            catalog_cache.product_changed(product)
             
             return True, product, f"Producto '{name}' creado exitosamente"
             
         except ValueError as e:
+            self.db.rollback()
+            self.release_image(imported_image)
             return False, None, "Error en los datos numéricos proporcionados"
         except Exception as e:
             self.db.rollback()
+            self.release_image(imported_image)
             return False, None, f"Error al crear producto: {str(e)}"
     
     def update_product(self, product_id, name=None, description=None, price=None, 
                       cost=None, category_id=None, preparation_time=None, 
-                      stock=None, is_active=None):
-        """Actualizar producto"""
+                      stock=None, is_active=None, image_source=None, sku=None):
+        """Actualizar producto (image_source: nueva foto a importar; sku: código, "" lo quita)"""
+        imported_image = None  # Se elimina si el cambio no llega a guardarse
         try:
+            begin_write(self.db)  # Cambio y versión del catálogo se confirman juntos
             product = self.get_product_by_id(product_id)
             if not product:
+                self.db.rollback()
                 return False, "Producto no encontrado"
             
             # Verificar categoría si se está cambiando
             if category_id and category_id != product.category_id:
                 category = self.get_category_by_id(category_id)
                 if not category:
+                    self.db.rollback()
                     return False, "Categoría no encontrada"
             
             # Verificar nombre duplicado si se está cambiando
@@ -198,8 +270,17 @@ class MenuController:
                     and_(Product.name == name, Product.category_id == cat_id, Product.id != product_id)
                 ).first()
                 if existing:
+                    self.db.rollback()
                     return False, "Ya existe un producto con ese nombre en esta categoría"
             
+            # Verificar código duplicado si se está cambiando
+            update_sku = sku is not None
+            if update_sku:
+                sku = sku.strip() or None
+                if sku and self.find_product_by_sku(sku, exclude_product_id=product_id):
+                    self.db.rollback()
+                    return False, f"Ya existe un producto con el código '{sku}'"
+            
             # Actualizar campos
             if name is not None:
                 product.name = name.strip()
@@ -217,38 +298,62 @@ class MenuController:
                 product.stock = int(stock) if stock else 0
             if is_active is not None:
                 product.is_active = is_active
-            
+            if update_sku:
+                product.sku = sku
+            previous_image = None
+            if image_source:
+                try:
+                    new_image = self.import_image(image_source)
+                except Exception as e:
+                    self.db.rollback()
+                    return False, f"Error al importar la imagen: {str(e)}"
+                if new_image != product.image_path:
+                    previous_image = product.image_path
+                    product.image_path = imported_image = new_image
+            
+            bump_catalog_version(self.db)
             self.db.commit()
+            imported_image = None  # Ya la usa el producto guardado
+            catalog_cache.product_changed(product)
+            if previous_image:
+                self.release_image(previous_image, exclude_product_id=product_id)
             return True, f"Producto '{product.name}' actualizado exitosamente"
             
         except ValueError as e:
+            self.db.rollback()
+            self.release_image(imported_image, exclude_product_id=product_id)
             return False, "Error en los datos numéricos proporcionados"
         except Exception as e:
             self.db.rollback()
+            self.release_image(imported_image, exclude_product_id=product_id)
             return False, f"Error al actualizar producto: {str(e)}"
     
     def delete_product(self, product_id):
         """Eliminar producto"""
         try:
+            begin_write(self.db)  # Cambio y versión del catálogo se confirman juntos
             product = self.get_product_by_id(product_id)
             if not product:
+                self.db.rollback()
                 return False, "Producto no encontrado"
             
             # Verificar si tiene órdenes asociadas
             has_orders = self.db.query(OrderItem).filter(OrderItem.product_id == product_id).first()
             if has_orders:
+                self.db.rollback()
                 return False, f"No se puede eliminar el producto '{product.name}' porque tiene ventas registradas"
             
-            # Eliminar imagen si existe
-            if product.image_path and os.path.exists(product.image_path):
-                try:
-                    os.remove(product.image_path)
-                except:
-                    pass  # No fallar si no se puede eliminar la imagen
-            
+            product_id = product.id
+            product_name = product.name
+            image_path = product.image_path
             self.db.delete(product)
+            bump_catalog_version(self.db)
             self.db.commit()
-            return True, f"Producto '{product.name}' eliminado exitosamente"
+            catalog_cache.product_removed(product_id)
+            
+            # Eliminar imagen y miniaturas si ningún otro producto las comparte
+            self.release_image(image_path)
+            return True, f"Producto '{product_name}' eliminado exitosamente"
             
         except Exception as e:
             self.db.rollback()
@@ -1,83 +1,231 @@
-from models.base import get_db
+from models.base import ThreadSessionMixin, begin_write
 from models.order import Order, OrderStatus
 from models.order_item import OrderItem
 from models.product import Product
-from datetime import datetime
+from models.money import to_cents, from_cents
+from utils.write_journal import get_write_journal, INTENT_CREATE_ORDER, INTENT_COMPLETE_PAYMENT
+from controllers.sales_rollup_controller import SalesRollupController
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload, joinedload
+from datetime import datetime, date, timedelta
 
-class OrderController:
+# Estados que la cocina considera activos (visibles en "Todos")
+KITCHEN_ACTIVE_STATUSES = [
+    OrderStatus.PENDING.value, OrderStatus.PREPARING.value,
+    OrderStatus.READY.value, OrderStatus.DELIVERED.value
+]
+
+# Días hacia atrás que la cocina muestra pedidos pagados
+KITCHEN_WINDOW_DAYS = 3
+
+def with_items(query):
+    """Precargar items y productos: 2 consultas extra fijas en lugar de una por orden/item"""
+    return query.options(
+        selectinload(Order.items).joinedload(OrderItem.product)
+    )
+
+def insert_order(db, items, customer_name="Cliente", table_number=None, created_at=None, prices=None):
+    """Insertar una orden y sus items en la transacción de db (sin commit)
+
+    Los precios y el total se calculan aquí con los precios vigentes de la
+    base de datos (una consulta IN para todos los productos); los items se
+    insertan en bloque. prices (product_id -> centavos) fija el precio de
+    los productos que incluye, p. ej. el que mostró el carrito.
+
+    Returns:
+        id de la orden creada
+    """
+    # Sumar cantidades de productos repetidos conservando el orden del carrito
+    quantities = {}
+    for item in items:
+        quantity = int(item['quantity'])
+        if quantity > 0:
+            quantities[item['product_id']] = quantities.get(item['product_id'], 0) + quantity
+    
+    unit_prices = {product_id: cents for product_id, cents in (prices or {}).items() if product_id in quantities}
+    missing = [product_id for product_id in quantities if product_id not in unit_prices]
+    if missing:
+        for product_id, price in db.query(Product.id, Product.price).filter(Product.id.in_(missing)):
+            unit_prices[product_id] = to_cents(price)
+    
+    total_cents = 0
+    item_rows = []
+    for product_id, quantity in quantities.items():
+        if product_id not in unit_prices:
+            continue  # Producto inexistente: se omite como antes
+        unit_cents = unit_prices[product_id]
+        total_cents += unit_cents * quantity
+        item_rows.append({
+            'product_id': product_id,
+            'quantity': quantity,
+            'unit_price': from_cents(unit_cents),
+            'subtotal': from_cents(unit_cents * quantity)
+        })
+    if not item_rows:
+        raise ValueError("La orden no tiene productos válidos")
+    
+    order = Order(
+        total=from_cents(total_cents),
+        customer_name=customer_name,
+        table_number=table_number,
+        status=OrderStatus.PENDING.value
+    )
+    if created_at is not None:
+        # updated_at queda con la hora de aplicación: el feed de cocina avanza por ese cursor
+        order.created_at = created_at
+    db.add(order)
+    db.flush()  # Obtener el id sin confirmar
+    order_id = order.id
+    
+    for row in item_rows:
+        row['order_id'] = order_id
+    # executemany: un solo INSERT para todos los items
+    db.execute(OrderItem.__table__.insert(), item_rows)
+    return order_id
+
+def mark_order_paid(db, order_id, payment_method="efectivo"):
+    """Marcar una orden como pagada en la transacción de db (sin commit)"""
+    # populate_existing: el estado anterior debe ser el de la base, no el de la sesión
+    order = db.query(Order).filter(Order.id == order_id).populate_existing().first()
+    if order:
+        old_status = order.status
+        # Marcar como PAID para que aparezca en historial de pagos
+        order.status = OrderStatus.PAID.value
+        order.payment_method = payment_method
+        order.updated_at = datetime.now()
+        SalesRollupController(db).apply_status_change(order, old_status)
+    return order
+
+def apply_order_intent(db, data, recorded_at):
+    """Aplicar una orden registrada en el diario de escrituras (sin commit)
+
+    Se cobran los precios guardados en la intención (los del carrito), no
+    los vigentes al aplicarla: una reproducción tras un corte o un cambio de
+    precio mientras el hilo escritor estaba atrasado no altera el total.
+    """
+    items = data['items']
+    prices = {item['product_id']: item['unit_cents'] for item in items if 'unit_cents' in item}
+    if 'total_cents' in data:
+        expected = sum(prices[item['product_id']] * item['quantity'] for item in items)
+        if expected != data['total_cents']:
+            raise ValueError(f"Total de la intención inconsistente: {data['total_cents']} != {expected}")
+    insert_order(db, items, data['customer_name'], data['table_number'],
+                 created_at=recorded_at, prices=prices)
+
+def apply_payment_intent(db, data, recorded_at):
+    """Aplicar un pago registrado en el diario de escrituras (sin commit)"""
+    status = db.query(Order.status).filter(Order.id == data['order_id']).scalar()
+    if status is None:
+        raise ValueError(f"Orden #{data['order_id']} no encontrada")
+    if status == OrderStatus.PAID.value:
+        return  # Pago repetido: la orden ya está pagada
+    mark_order_paid(db, data['order_id'], data['payment_method'])
+
+class OrderController(ThreadSessionMixin):
     def __init__(self):
-        self.db = get_db()
+        self.init_sessions()
     
     def create_order(self, items, customer_name="Cliente", table_number=None):
-        """Crear orden con información del cliente"""
-        total = 0
-        order_items = []
-        
-        for item in items:
-            product = self.db.query(Product).filter(Product.id == item['product_id']).first()
-            if product:
-                subtotal = product.price * item['quantity']
-                total += subtotal
-                
-                order_item = OrderItem(
-                    product_id=product.id,
-                    quantity=item['quantity'],
-                    unit_price=product.price,
-                    subtotal=subtotal
-                )
-                order_items.append(order_item)
-        
-        # Crear orden
-        order = Order(
-            total=total,
-            customer_name=customer_name,
-            table_number=table_number,
-            status=OrderStatus.PENDING.value
-        )
-        self.db.add(order)
-        self.db.commit()
+        """Crear orden con información del cliente en una sola transacción
+
+        Devuelve la orden con items y productos ya cargados.
+        """
+        try:
+            begin_write(self.db)  # Orden e items se confirman juntos
+            order_id = insert_order(self.db, items, customer_name, table_number)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         
-        # Agregar items
-        for item in order_items:
-            item.order_id = order.id
-            self.db.add(item)
+        # Items y productos precargados: cocina e impresora no vuelven a consultar
+        return with_items(self.db.query(Order)).filter(Order.id == order_id).populate_existing().one()
+    
+    def submit_order(self, items, customer_name="Cliente", table_number=None):
+        """Registrar una orden desde el POS sin esperar a SQLite si el diario de escrituras está activo
+
+        Returns:
+            Order creada, o None si quedó en el diario (se aplica en segundo plano)
+        """
+        journal = get_write_journal()
+        if journal is None:
+            return self.create_order(items, customer_name, table_number)
         
-        self.db.commit()
-        return order
+        # Validar contra el catálogo antes de registrar: el error llega al cajero y no al
+        # hilo escritor. Se guarda el precio cobrado; al aplicar no se vuelve a consultar
+        from controllers.catalog_cache import catalog_cache
+        intent_items = []
+        for item in items:
+            quantity = int(item['quantity'])
+            if quantity <= 0:
+                continue
+            product = catalog_cache.get_product(item['product_id'])
+            if product is None:
+                raise ValueError(f"Producto #{item['product_id']} no disponible")
+            unit_cents = item.get('unit_cents')
+            intent_items.append({
+                'product_id': item['product_id'],
+                'quantity': quantity,
+                'unit_cents': to_cents(product.price) if unit_cents is None else unit_cents
+            })
+        if not intent_items:
+            raise ValueError("La orden no tiene productos válidos")
+        journal.record(INTENT_CREATE_ORDER, {
+            'items': intent_items,
+            'total_cents': sum(item['unit_cents'] * item['quantity'] for item in intent_items),
+            'customer_name': customer_name,
+            'table_number': table_number
+        })
+        return None
     
     def update_order_status(self, order_id, new_status):
         """Actualizar estado del pedido"""
-        order = self.db.query(Order).filter(Order.id == order_id).first()
-        if order:
-            # Asegurar que se use el valor string del enum
-            if hasattr(new_status, 'value'):
-                order.status = new_status.value
-            else:
-                order.status = new_status
-            order.updated_at = datetime.now()
+        try:
+            begin_write(self.db)  # Estado y resumen diario se confirman juntos
+            order = self.db.query(Order).filter(Order.id == order_id).populate_existing().first()
+            if order:
+                old_status = order.status
+                # Asegurar que se use el valor string del enum
+                if hasattr(new_status, 'value'):
+                    order.status = new_status.value
+                else:
+                    order.status = new_status
+                order.updated_at = datetime.now()
+                SalesRollupController(self.db).apply_status_change(order, old_status)
             self.db.commit()
-            return order
-        return None
+        except Exception:
+            self.db.rollback()
+            raise
+        return order
     
-    def get_orders_by_status(self, status):
+    def _orders_query(self, eager_items=False):
+        """Consulta base de órdenes, opcionalmente con items y productos precargados"""
+        query = self.db.query(Order)
+        if eager_items:
+            query = with_items(query)
+        return query
+    
+    def get_orders_by_status(self, status, eager_items=False):
         """Obtener pedidos por estado"""
-        return self.db.query(Order).filter(Order.status == status).all()
+        return self._orders_query(eager_items).filter(Order.status == status).all()
     
-    def get_active_orders(self):
+    def get_active_orders(self, eager_items=False):
         """Obtener pedidos activos (no pagados ni cancelados)"""
-        return self.db.query(Order).filter(
+        return self._orders_query(eager_items).filter(
             Order.status.in_([OrderStatus.PENDING.value, OrderStatus.PREPARING.value, OrderStatus.READY.value, OrderStatus.DELIVERED.value])
         ).order_by(Order.created_at.asc()).all()
     
-    def get_all_orders_for_kitchen(self):
+    def get_kitchen_window_start(self):
+        """Inicio de la ventana de pedidos recientes que muestra la cocina"""
+        start_date = date.today() - timedelta(days=KITCHEN_WINDOW_DAYS)
+        return datetime.combine(start_date, datetime.min.time())
+    
+    def get_all_orders_for_kitchen(self, eager_items=False):
         """Obtener todos los pedidos para la vista de cocina (incluyendo pagados de los últimos días)"""
-        from datetime import date, timedelta, datetime
-        today = date.today()
         # Incluir pedidos de los últimos 3 días para mostrar pagados recientes
-        start_date = today - timedelta(days=3)
-        start_datetime = datetime.combine(start_date, datetime.min.time())
+        start_datetime = self.get_kitchen_window_start()
         
-        return self.db.query(Order).filter(
+        return self._orders_query(eager_items).filter(
             Order.status.in_([
                 OrderStatus.PENDING.value, OrderStatus.PREPARING.value, OrderStatus.READY.value, 
                 OrderStatus.DELIVERED.value, OrderStatus.PAID.value
@@ -85,18 +233,113 @@ class OrderController:
             Order.created_at >= start_datetime  # Últimos 3 días
         ).order_by(Order.created_at.desc()).all()  # Más recientes primero
     
-    def get_order_details(self, order_id):
+    def is_kitchen_visible(self, order, window_start=None):
+        """Indica si un pedido pertenece al conjunto que muestra la cocina"""
+        if order.status in KITCHEN_ACTIVE_STATUSES:
+            return True
+        if order.status == OrderStatus.PAID.value:
+            window_start = window_start or self.get_kitchen_window_start()
+            return order.created_at is not None and order.created_at >= window_start
+        return False
+    
+    def get_order_changes(self, since_cursor=None, eager_items=False):
+        """
+        Feed incremental de cambios de pedidos para la vista de cocina
+        
+        Los cambios se ordenan por (Order.updated_at, Order.id); el cursor
+        devuelto apunta al último cambio visto y se pasa en la siguiente llamada.
+        Sin cursor se devuelve una instantánea completa.
+        
+        Args:
+            since_cursor: Tupla (updated_at, id) de la llamada anterior o None
+            eager_items: Precargar items y productos de los pedidos devueltos
+            
+        Returns:
+            Dict con orders (pedidos visibles nuevos o modificados),
+            removed_ids (pedidos que ya no deben mostrarse), cursor y full
+        """
+        window_start = self.get_kitchen_window_start()
+        
+        if since_cursor is None:
+            # Cursor antes de la instantánea: un cambio entre ambas lecturas llega
+            # repetido en el siguiente feed en lugar de perderse
+            last = self.db.query(Order.updated_at, Order.id).filter(
+                Order.updated_at.isnot(None)
+            ).order_by(Order.updated_at.desc(), Order.id.desc()).first()
+            cursor = (last.updated_at, last.id) if last else since_cursor
+            
+            # Instantánea: activos + pagados recientes, igual que ambas consultas previas
+            orders = self._orders_query(eager_items).populate_existing().filter(
+                or_(
+                    Order.status.in_(KITCHEN_ACTIVE_STATUSES),
+                    and_(Order.status == OrderStatus.PAID.value,
+                         Order.created_at >= window_start)
+                )
+            ).all()
+            
+            return {
+                'orders': orders,
+                'removed_ids': [],
+                'cursor': cursor,
+                'full': True
+            }
+        
+        cursor_updated_at, cursor_id = since_cursor
+        changed = self._orders_query(eager_items).populate_existing().filter(
+            # Cota de rango para que SQLite busque en ix_orders_updated_at_id
+            Order.updated_at >= cursor_updated_at,
+            or_(
+                Order.updated_at > cursor_updated_at,
+                and_(Order.updated_at == cursor_updated_at, Order.id > cursor_id)
+            )
+        ).order_by(Order.updated_at.asc(), Order.id.asc()).all()
+        
+        orders = []
+        removed_ids = []
+        for order in changed:
+            if self.is_kitchen_visible(order, window_start):
+                orders.append(order)
+            else:
+                removed_ids.append(order.id)
+        
+        cursor = (changed[-1].updated_at, changed[-1].id) if changed else since_cursor
+        
+        return {
+            'orders': orders,
+            'removed_ids': removed_ids,
+            'cursor': cursor,
+            'full': False
+        }
+    
+    def get_order_details(self, order_id, eager_items=False):
         """Obtener detalles completos del pedido"""
-        return self.db.query(Order).filter(Order.id == order_id).first()
+        return self._orders_query(eager_items).filter(Order.id == order_id).first()
     
     def complete_payment(self, order_id, payment_method="efectivo"):
         """Marcar orden como pagada"""
-        order = self.db.query(Order).filter(Order.id == order_id).first()
-        if order:
-            # Marcar como PAID para que aparezca en historial de pagos
-            order.status = OrderStatus.PAID.value
-            order.payment_method = payment_method
-            order.updated_at = datetime.now()
+        try:
+            begin_write(self.db)  # Pago y resumen diario se confirman juntos
+            order = mark_order_paid(self.db, order_id, payment_method)
             self.db.commit()
-            return order
-        return None
\ No newline at end of file
+        except Exception:
+            self.db.rollback()
+            raise
+        return order
+    
+    def submit_payment(self, order_id, payment_method="efectivo"):
+        """Registrar un pago sin esperar a SQLite si el diario de escrituras está activo
+
+        Returns:
+            True si el pago se aplicó o quedó en el diario, False si la orden no existe
+        """
+        journal = get_write_journal()
+        if journal is None:
+            return self.complete_payment(order_id, payment_method) is not None
+        # Lectura sin bloqueo (WAL): no registrar pagos de órdenes inexistentes o ya pagadas
+        status = self.db.query(Order.status).filter(Order.id == order_id).scalar()
+        if status is None:
+            return False
+        if status == OrderStatus.PAID.value:
+            return True
+        journal.record(INTENT_COMPLETE_PAYMENT, {'order_id': order_id, 'payment_method': payment_method})
+        return True
\ No newline at end of file
@@ -1,25 +1,26 @@
 # controllers/payment_controller.py
-from models.base import get_db
+from models.base import ThreadSessionMixin
 from models.order import Order, OrderStatus
 from models.order_item import OrderItem
 from models.product import Product
+from controllers.order_controller import with_items
 from sqlalchemy import and_, or_, desc
 from datetime import datetime, date
-import pandas as pd
 from typing import List, Optional, Dict, Any
 
-class PaymentController:
+class PaymentController(ThreadSessionMixin):
     """Controlador para gestionar el historial de pagos"""
     
     def __init__(self):
-        self.db = get_db()
+        self.init_sessions()
     
     def get_payment_history(self, 
                           start_date: Optional[date] = None,
                           end_date: Optional[date] = None, 
                           search_term: Optional[str] = None,
                           page: int = 1,
-                          page_size: int = 20) -> Dict[str, Any]:
+                          page_size: int = 20,
+                          eager_items: bool = False) -> Dict[str, Any]:
         """
         Obtener historial de pagos con filtros
         
@@ -29,6 +30,7 @@ class PaymentController:
             search_term: Término de búsqueda (número de orden o nombre del cliente)
             page: Número de página
             page_size: Tamaño de página
+            eager_items: Precargar items y productos de la página (sin consultas N+1)
             
         Returns:
             Dict con orders, total_count, total_pages
@@ -70,7 +72,10 @@ class PaymentController:
         
         # Aplicar paginación
         offset = (page - 1) * page_size
-        orders = query.offset(offset).limit(page_size).all()
+        page_query = query.offset(offset).limit(page_size)
+        if eager_items:
+            page_query = with_items(page_query)
+        orders = page_query.all()
         
         # Calcular total de páginas
         total_pages = (total_count + page_size - 1) // page_size
@@ -83,9 +88,12 @@ class PaymentController:
             'page_size': page_size
         }
     
-    def get_order_details(self, order_id: int) -> Optional[Order]:
+    def get_order_details(self, order_id: int, eager_items: bool = False) -> Optional[Order]:
         """Obtener detalles completos de una orden"""
-        return self.db.query(Order).filter(Order.id == order_id).first()
+        query = self.db.query(Order)
+        if eager_items:
+            query = with_items(query)
+        return query.filter(Order.id == order_id).first()
     
     def get_payment_summary(self, 
                           start_date: Optional[date] = None,
@@ -181,7 +189,8 @@ class PaymentController:
             
             data.append(base_info)
         
-        # Crear DataFrame y exportar
+        # Crear DataFrame y exportar (pandas se carga solo al exportar)
+        import pandas as pd
         df = pd.DataFrame(data)
         
         # Reorganizar columnas
@@ -231,7 +240,7 @@ class PaymentController:
                 results[product.id] = {
                     'product_name': product.name,
                     'quantity_sold': 0,
-                    'total_revenue': 0.0
+                    'total_revenue': 0
                 }
             
             results[product.id]['quantity_sold'] += order_item.quantity
@@ -1,10 +1,10 @@
-from models.base import get_db
+from models.base import ThreadSessionMixin
 from models.product import Product
 from models.category import Category
 
-class ProductController:
+class ProductController(ThreadSessionMixin):
     def __init__(self):
-        self.db = get_db()
+        self.init_sessions()
     
     def get_all_products(self):
         return self.db.query(Product).filter(Product.is_active == True).all()
@@ -0,0 +1,210 @@
+# controllers/product_search.py
+"""
+Índice de búsqueda de productos en memoria para el POS.
+
+- Texto normalizado: sin tildes ni mayúsculas ("Café" == "cafe").
+- Cada palabra de la consulta debe coincidir como prefijo de alguna palabra
+  del nombre, la descripción o el código SKU/PLU del producto.
+- Si una palabra no coincide como prefijo se toleran errores de tipeo
+  (1 error desde 4 letras, 2 desde 8): los candidatos salen de un índice de
+  trigramas y se verifican con distancia de edición contra el prefijo.
+- Se actualiza producto por producto (lo mantiene CatalogCache).
+"""
+import bisect
+import re
+import unicodedata
+from collections import Counter
+
+# Peso de cada campo en la puntuación
+NAME_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+CODE_WEIGHT = 4.0
+# Bonificación por palabra completa y penalización por coincidencia con errores
+EXACT_BONUS = 1.0
+FUZZY_FACTOR = 0.5
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def normalize_text(text):
+    """Texto en minúsculas, sin tildes y con solo letras y dígitos separados por espacios"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", without_accents).strip()
+
+def normalize_code(code):
+    """Código SKU/PLU o de barras normalizado (None si está vacío)"""
+    code = (code or "").strip().casefold()
+    return code or None
+
+def max_typos(length):
+    """Errores de tipeo tolerados para una palabra de la consulta"""
+    if length >= 8:
+        return 2
+    if length >= 4:
+        return 1
+    return 0
+
+def trigrams(token):
+    """Trigramas de una palabra con marca de inicio (favorece el comienzo de la palabra)"""
+    padded = f"^{token}"
+    return {padded[i:i + 3] for i in range(max(1, len(padded) - 2))}
+
+def prefix_distance(query, token, limit):
+    """Menor distancia de edición entre query y algún prefijo de token (limit + 1 si la supera)"""
+    previous = list(range(len(query) + 1))
+    best = previous[-1]
+    for i, token_char in enumerate(token, 1):
+        current = [i]
+        row_min = i
+        for j, query_char in enumerate(query, 1):
+            cost = 0 if query_char == token_char else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        best = min(best, current[-1])
+        if row_min > limit:
+            break
+        previous = current
+    return best if best <= limit else limit + 1
+
+class ProductSearchIndex:
+    """Índice invertido de palabras -> productos con búsqueda por prefijo y tolerante a errores"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Vaciar el índice"""
+        self._postings = {}         # palabra -> {product_id: peso del campo}
+        self._sorted_tokens = []    # palabras ordenadas (búsqueda por prefijo con bisect)
+        self._trigrams = {}         # trigrama -> {palabras}
+        self._product_tokens = {}   # product_id -> {palabra: peso}
+        self._products = {}         # product_id -> producto
+
+    def __len__(self):
+        return len(self._products)
+
+    # === MANTENIMIENTO ===
+
+    def rebuild(self, products):
+        """Indexar de nuevo todo el catálogo"""
+        self.clear()
+        for product in products:
+            self.add(product)
+
+    def add(self, product):
+        """Indexar o reindexar un producto"""
+        if product.id in self._products:
+            self.remove(product.id)
+        self._products[product.id] = product
+
+        weights = {}
+        for field, weight in ((product.name, NAME_WEIGHT), (product.description, DESCRIPTION_WEIGHT)):
+            for token in normalize_text(field).split():
+                weights[token] = max(weights.get(token, 0), weight)
+        code = normalize_code(getattr(product, "sku", None))
+        if code:
+            for token in normalize_text(code).split() + [code]:
+                weights[token] = max(weights.get(token, 0), CODE_WEIGHT)
+
+        self._product_tokens[product.id] = weights
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._sorted_tokens, token)
+                for gram in trigrams(token):
+                    self._trigrams.setdefault(gram, set()).add(token)
+            postings[product.id] = weight
+
+    def remove(self, product_id):
+        """Quitar un producto del índice"""
+        self._products.pop(product_id, None)
+        for token in self._product_tokens.pop(product_id, {}):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(product_id, None)
+            if postings:
+                continue
+            # Palabra sin productos: sacarla de los índices auxiliares
+            del self._postings[token]
+            index = bisect.bisect_left(self._sorted_tokens, token)
+            if index < len(self._sorted_tokens) and self._sorted_tokens[index] == token:
+                del self._sorted_tokens[index]
+            for gram in trigrams(token):
+                tokens = self._trigrams.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[gram]
+
+    # === BÚSQUEDA ===
+
+    def _prefix_tokens(self, prefix):
+        """Palabras indexadas que comienzan con prefix"""
+        index = bisect.bisect_left(self._sorted_tokens, prefix)
+        matches = []
+        while index < len(self._sorted_tokens) and self._sorted_tokens[index].startswith(prefix):
+            matches.append(self._sorted_tokens[index])
+            index += 1
+        return matches
+
+    def _fuzzy_tokens(self, query_token):
+        """Palabras cuyo prefijo está a pocos errores de tipeo de query_token"""
+        limit = max_typos(len(query_token))
+        if not limit:
+            return []
+        grams = trigrams(query_token)
+        # Cada error rompe como máximo tres trigramas
+        required = max(1, len(grams) - 3 * limit)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self._trigrams.get(gram, ()))
+        return [token for token, shared in counts.items()
+                if shared >= required and prefix_distance(query_token, token, limit) <= limit]
+
+    def _match_token(self, query_token):
+        """Puntuación por producto para una palabra de la consulta"""
+        scores = {}
+        tokens = self._prefix_tokens(query_token)
+        factor = 1.0
+        if not tokens:
+            tokens = self._fuzzy_tokens(query_token)
+            factor = FUZZY_FACTOR
+        for token in tokens:
+            bonus = EXACT_BONUS if token == query_token else 0.0
+            for product_id, weight in self._postings[token].items():
+                score = (weight + bonus) * factor
+                if score > scores.get(product_id, 0):
+                    scores[product_id] = score
+        return scores
+
+    def search(self, query, limit=50):
+        """Productos que coinciden con todas las palabras de la consulta, mejor puntuados primero"""
+        query_tokens = normalize_text(query).split()
+        code = normalize_code(query)
+        if not query_tokens:
+            return []
+
+        totals = None
+        for query_token in dict.fromkeys(query_tokens):
+            scores = self._match_token(query_token)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {product_id: totals[product_id] + score
+                          for product_id, score in scores.items() if product_id in totals}
+            if not totals:
+                return []
+
+        # Código completo (p. ej. con guiones) al inicio
+        if code in self._postings:
+            for product_id in self._postings[code]:
+                if product_id in totals:
+                    totals[product_id] += CODE_WEIGHT
+
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], self._products[item[0]].name))
+        return [self._products[product_id] for product_id, _ in ranked[:limit]]
@@ -3,8 +3,10 @@ from models.order import Order, OrderStatus
 from models.order_item import OrderItem
 from models.product import Product
 from models.category import Category
+from models.daily_sales_rollup import DailySalesRollup
+from models.money import MoneyType
 from models.base import get_db
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func, and_, desc, case, Integer, type_coerce
 from datetime import datetime, date, timedelta
 from sqlalchemy import func, text, distinct
 from sqlalchemy.orm import sessionmaker
@@ -31,28 +33,158 @@ class ReportsController:
             return datetime.combine(date_obj, datetime.max.time())
         return date_obj
     
+    def _rollup_range(self, start_date, end_date):
+        """Convertir fechas del período a días del resumen diario"""
+        start_day = start_date.date() if isinstance(start_date, datetime) else start_date
+        end_day = end_date.date() if isinstance(end_date, datetime) else end_date
+        return start_day, end_day
+    
+    def get_daily_rollup(self, start_date, end_date):
+        """Obtener filas del resumen diario de ventas (solo días con ventas)"""
+        try:
+            db = self.get_session()
+            start_day, end_day = self._rollup_range(start_date, end_date)
+            
+            rows = db.query(DailySalesRollup).filter(
+                DailySalesRollup.day >= start_day,
+                DailySalesRollup.day <= end_day,
+                DailySalesRollup.order_count > 0
+            ).order_by(DailySalesRollup.day).all()
+            
+            result = []
+            for row in rows:
+                result.append({
+                    'date': row.day,
+                    'total_sales': float(row.revenue),
+                    'order_count': row.order_count,
+                    'items_count': row.items_count,
+                    'avg_ticket': float(row.revenue) / row.order_count if row.order_count > 0 else 0.0,
+                    'categories': row.categories,
+                    'hours': row.hours
+                })
+            
+            db.close()
+            return result
+                
+        except Exception as e:
+            print(f"Error obteniendo resumen diario: {e}")
+            return []
+    
+    def _bucket_ranges(self, start_day, end_day, granularity):
+        """Generar los buckets del período en orden: [(clave, inicio, fin, etiqueta)]"""
+        buckets = []
+        if granularity == "day":
+            current = start_day
+            while current <= end_day:
+                buckets.append((current.isoformat(), current, current, current.strftime("%d/%m")))
+                current += timedelta(days=1)
+        elif granularity == "week":
+            # Semanas de 7 días contadas desde el inicio del período
+            current = start_day
+            index = 0
+            while current <= end_day:
+                week_end = min(current + timedelta(days=6), end_day)
+                buckets.append((index, current, week_end, f"Sem {index + 1}"))
+                current = week_end + timedelta(days=1)
+                index += 1
+        elif granularity == "month":
+            current = start_day.replace(day=1)
+            while current <= end_day:
+                if current.month == 12:
+                    next_month = current.replace(year=current.year + 1, month=1)
+                else:
+                    next_month = current.replace(month=current.month + 1)
+                buckets.append((
+                    current.strftime("%Y-%m"),
+                    max(current, start_day),
+                    min(next_month - timedelta(days=1), end_day),
+                    current.strftime("%m/%Y")
+                ))
+                current = next_month
+        else:
+            raise ValueError(f"Granularidad no soportada: {granularity}")
+        return buckets
+    
+    def get_bucketed_metrics(self, start_date, end_date, granularity="day"):
+        """Obtener métricas por día, semana o mes en una sola consulta GROUP BY
+        
+        Args:
+            start_date: Fecha inicial del período (inclusive)
+            end_date: Fecha final del período (inclusive)
+            granularity: "day", "week" (bloques de 7 días desde start_date) o "month"
+            
+        Returns:
+            Lista ordenada con un dict por bucket (incluye buckets sin ventas):
+            start, end, label, total_sales, total_orders, avg_ticket, active_days
+        """
+        start_day, end_day = self._rollup_range(start_date, end_date)
+        buckets = self._bucket_ranges(start_day, end_day, granularity)
+        
+        try:
+            db = self.get_session()
+            
+            if granularity == "day":
+                bucket_col = func.strftime('%Y-%m-%d', DailySalesRollup.day)
+            elif granularity == "week":
+                bucket_col = func.cast(
+                    (func.julianday(DailySalesRollup.day) - func.julianday(start_day.isoformat())) / 7,
+                    Integer
+                )
+            else:
+                bucket_col = func.strftime('%Y-%m', DailySalesRollup.day)
+            
+            rows = db.query(
+                bucket_col.label('bucket'),
+                func.sum(DailySalesRollup.revenue).label('total_sales'),
+                func.sum(DailySalesRollup.order_count).label('total_orders'),
+                func.sum(case((DailySalesRollup.order_count > 0, 1), else_=0)).label('active_days')
+            ).filter(
+                DailySalesRollup.day >= start_day,
+                DailySalesRollup.day <= end_day
+            ).group_by(bucket_col).all()
+            
+            db.close()
+            totals = {row.bucket: row for row in rows}
+            
+        except Exception as e:
+            print(f"Error obteniendo métricas por período: {e}")
+            totals = {}
+        
+        # Completar los buckets sin ventas con ceros
+        result = []
+        for key, bucket_start, bucket_end, label in buckets:
+            row = totals.get(key)
+            total_sales = float(row.total_sales or 0) if row else 0.0
+            total_orders = int(row.total_orders or 0) if row else 0
+            result.append({
+                'start': bucket_start,
+                'end': bucket_end,
+                'label': label,
+                'total_sales': total_sales,
+                'total_orders': total_orders,
+                'avg_ticket': total_sales / total_orders if total_orders > 0 else 0.0,
+                'active_days': int(row.active_days or 0) if row else 0
+            })
+        
+        return result
+    
     def get_sales_summary(self, start_date, end_date):
         """Obtener resumen de ventas para un período"""
         try:
             db = self.get_session()
+            start_day, end_day = self._rollup_range(start_date, end_date)
             
-            # Convertir fechas a datetime
-            start_datetime = self._ensure_datetime(start_date)
-            end_datetime = self._ensure_end_of_day(end_date)
-            
-            # Ventas totales
-            total_sales = db.query(func.sum(Order.total)).filter(
-                Order.created_at >= start_datetime,
-                Order.created_at <= end_datetime,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).scalar() or 0
+            # Leer totales del resumen diario en lugar de recorrer las órdenes
+            totals = db.query(
+                func.sum(DailySalesRollup.revenue).label('total_sales'),
+                func.sum(DailySalesRollup.order_count).label('total_orders')
+            ).filter(
+                DailySalesRollup.day >= start_day,
+                DailySalesRollup.day <= end_day
+            ).first()
             
-            # Total de órdenes
-            total_orders = db.query(func.count(Order.id)).filter(
-                Order.created_at >= start_datetime,
-                Order.created_at <= end_datetime,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).scalar() or 0
+            total_sales = totals.total_sales or 0
+            total_orders = totals.total_orders or 0
             
             # Ticket promedio
             avg_ticket = total_sales / total_orders if total_orders > 0 else 0
@@ -70,39 +202,14 @@ class ReportsController:
     
     def get_daily_sales(self, start_date, end_date):
         """Obtener ventas diarias para gráfico"""
-        try:
-            db = self.get_session()
-            
-            # Convertir fechas a datetime
-            start_datetime = self._ensure_datetime(start_date)
-            end_datetime = self._ensure_end_of_day(end_date)
-            
-            # Query para ventas por día
-            daily_sales = db.query(
-                func.date(Order.created_at).label('date'),
-                func.sum(Order.total).label('total_sales'),
-                func.count(Order.id).label('order_count')
-            ).filter(
-                Order.created_at >= start_datetime,
-                Order.created_at <= end_datetime,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).group_by(func.date(Order.created_at)).all()
-            
-            # Convertir a diccionario
-            sales_data = []
-            for row in daily_sales:
-                sales_data.append({
-                    'date': row.date,
-                    'total_sales': float(row.total_sales),
-                    'order_count': row.order_count
-                })
-            
-            db.close()
-            return sales_data
-                
-        except Exception as e:
-            print(f"Error obteniendo ventas diarias: {e}")
-            return []
+        return [
+            {
+                'date': day['date'].isoformat(),
+                'total_sales': day['total_sales'],
+                'order_count': day['order_count']
+            }
+            for day in self.get_daily_rollup(start_date, end_date)
+        ]
     
     def get_top_products(self, start_date, end_date, limit=10):
         """Obtener productos más vendidos"""
@@ -118,8 +225,8 @@ class ReportsController:
                 Product.cost,
                 Product.price,
                 func.sum(OrderItem.quantity).label('total_quantity'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue'),
-                func.avg(OrderItem.unit_price).label('avg_price'),
+                func.sum(OrderItem.subtotal).label('total_revenue'),
+                type_coerce(func.avg(OrderItem.unit_price), MoneyType).label('avg_price'),
                 func.max(Order.created_at).label('last_sale')
             ).select_from(Product).join(
                 OrderItem, Product.id == OrderItem.product_id
@@ -167,49 +274,31 @@ class ReportsController:
     def get_sales_by_category(self, start_date, end_date):
         """Obtener ventas por categoría"""
         try:
-            db = self.get_session()
-            
-            # Usar select_from() para especificar explícitamente las tablas y joins
-            category_sales = db.query(
-                Category.name,
-                func.count(func.distinct(Order.id)).label('order_count'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue'),
-                func.sum(OrderItem.quantity).label('total_items')
-            ).select_from(
-                Category
-            ).join(
-                Product, Category.id == Product.category_id
-            ).join(
-                OrderItem, Product.id == OrderItem.product_id
-            ).join(
-                Order, OrderItem.order_id == Order.id
-            ).filter(
-                Order.created_at >= start_date,
-                Order.created_at <= end_date,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).group_by(
-                Category.id, Category.name
-            ).order_by(
-                func.sum(OrderItem.quantity * OrderItem.unit_price).desc()
-            ).all()
+            # Sumar los buckets por categoría del resumen diario
+            totals = {}
+            for day in self.get_daily_rollup(start_date, end_date):
+                for name, bucket in day['categories'].items():
+                    total = totals.setdefault(name, {'order_count': 0, 'revenue': 0, 'total_items': 0})
+                    total['order_count'] += bucket.get('orders', 0)
+                    total['revenue'] += bucket.get('revenue', 0)  # centavos
+                    total['total_items'] += bucket.get('items', 0)
             
             # Calcular total general para porcentajes
-            total_revenue = sum(float(row.total_revenue or 0) for row in category_sales)
+            total_revenue = sum(total['revenue'] for total in totals.values())
             
             categories_data = []
-            for row in category_sales:
-                revenue = float(row.total_revenue or 0)
-                percentage = (revenue / total_revenue * 100) if total_revenue > 0 else 0
+            for name, total in sorted(totals.items(), key=lambda item: item[1]['revenue'], reverse=True):
+                revenue = total['revenue'] / 100
+                percentage = (total['revenue'] / total_revenue * 100) if total_revenue > 0 else 0
                 
                 categories_data.append({
-                    'name': row.name,
-                    'order_count': row.order_count or 0,
+                    'name': name,
+                    'order_count': total['order_count'],
                     'revenue': revenue,
                     'percentage': percentage,
-                    'total_items': row.total_items or 0
+                    'total_items': total['total_items']
                 })
             
-            db.close()
             return categories_data
                 
         except Exception as e:
@@ -218,48 +307,41 @@ class ReportsController:
             traceback.print_exc()
             return []
     
+    def _hourly_totals(self, start_date, end_date):
+        """Sumar los buckets por hora del resumen diario: {hora: {'orders', 'revenue' (centavos)}}"""
+        totals = {}
+        for day in self.get_daily_rollup(start_date, end_date):
+            for hour, bucket in day['hours'].items():
+                total = totals.setdefault(int(hour), {'orders': 0, 'revenue': 0})
+                total['orders'] += bucket.get('orders', 0)
+                total['revenue'] += bucket.get('revenue', 0)
+        return totals
+    
     def get_sales_by_hour(self, start_date, end_date):
         """Obtener análisis de ventas por horas del día"""
         try:
-            db = self.get_session()
-            
-            # Convertir fechas a datetime
-            start_datetime = self._ensure_datetime(start_date)
-            end_datetime = self._ensure_end_of_day(end_date)
-            
-            # Query para ventas por hora
-            hourly_sales = db.query(
-                func.extract('hour', Order.created_at).label('hour'),
-                func.count(Order.id).label('order_count'),
-                func.sum(Order.total).label('total_sales'),
-                func.avg(Order.total).label('avg_ticket')
-            ).filter(
-                Order.created_at >= start_datetime,
-                Order.created_at <= end_datetime,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).group_by(func.extract('hour', Order.created_at)).order_by('hour').all()
+            hourly_sales = self._hourly_totals(start_date, end_date)
             
             # Calcular total del día para porcentajes
-            total_daily_sales = sum(float(row.total_sales) for row in hourly_sales)
+            total_daily_sales = sum(total['revenue'] for total in hourly_sales.values())
             
             hours_data = []
-            for row in hourly_sales:
-                sales = float(row.total_sales)
-                percentage = (sales / total_daily_sales * 100) if total_daily_sales > 0 else 0
+            for hour in sorted(hourly_sales):
+                total = hourly_sales[hour]
+                sales = total['revenue'] / 100
+                percentage = (total['revenue'] / total_daily_sales * 100) if total_daily_sales > 0 else 0
                 
                 # Formatear rango de hora
-                hour = int(row.hour)
                 hour_range = f"{hour:02d}:00-{(hour+1):02d}:00"
                 
                 hours_data.append({
                     'hour_range': hour_range,
-                    'order_count': row.order_count,
+                    'order_count': total['orders'],
                     'total_sales': sales,
-                    'avg_ticket': float(row.avg_ticket),
+                    'avg_ticket': sales / total['orders'] if total['orders'] > 0 else 0.0,
                     'percentage': percentage
                 })
             
-            db.close()
             return hours_data
                 
         except Exception as e:
@@ -281,7 +363,7 @@ class ReportsController:
                 Product.price,
                 Product.cost,
                 func.sum(OrderItem.quantity).label('total_sold'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue')
+                func.sum(OrderItem.subtotal).label('total_revenue')
             ).join(OrderItem).join(Order).filter(
                 Order.created_at >= start_datetime,
                 Order.created_at <= end_datetime,
@@ -361,7 +443,7 @@ class ReportsController:
             low_products = db.query(
                 Product.name,
                 func.coalesce(func.sum(OrderItem.quantity), 0).label('total_quantity'),
-                func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0).label('total_revenue')
+                func.coalesce(func.sum(OrderItem.subtotal), 0).label('total_revenue')
             ).outerjoin(OrderItem).outerjoin(Order, 
                 (Order.id == OrderItem.order_id) & 
                 (Order.created_at >= start_date) & 
@@ -429,9 +511,9 @@ class ReportsController:
                 Product.price,
                 Category.name.label('category_name'),
                 func.sum(OrderItem.quantity).label('total_quantity'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue'),
+                func.sum(OrderItem.subtotal).label('total_revenue'),
                 func.count(distinct(Order.id)).label('orders_count'),
-                func.avg(OrderItem.unit_price).label('avg_unit_price')
+                type_coerce(func.avg(OrderItem.unit_price), MoneyType).label('avg_unit_price')
             ).join(OrderItem, Product.id == OrderItem.product_id
             ).join(Order, OrderItem.order_id == Order.id
             ).join(Category, Product.category_id == Category.id
@@ -516,28 +598,14 @@ class ReportsController:
     def get_period_metrics(self, start_date, end_date):
         """Obtener métricas del período"""
         try:
+            # Ventas, órdenes y ticket promedio desde el resumen diario
+            summary = self.get_sales_summary(start_date, end_date)
+            
             db = self.get_session()
             start_datetime = self._ensure_datetime(start_date)
             end_datetime = self._ensure_end_of_day(end_date)
             
-            # Ventas totales
-            total_sales = db.query(func.sum(Order.total)).filter(
-                Order.created_at >= start_datetime,
-                Order.created_at <= end_datetime,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).scalar() or 0
-            
-            # Número de órdenes
-            total_orders = db.query(func.count(Order.id)).filter(
-                Order.created_at >= start_datetime,
-                Order.created_at <= end_datetime,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).scalar() or 0
-            
-            # Ticket promedio
-            avg_ticket = total_sales / total_orders if total_orders > 0 else 0
-            
-            # Productos únicos vendidos
+            # Productos únicos vendidos (no es acumulable por día)
             unique_products = db.query(func.count(func.distinct(OrderItem.product_id))).join(Order).filter(
                 Order.created_at >= start_datetime,
                 Order.created_at <= end_datetime,
@@ -547,9 +615,9 @@ class ReportsController:
             db.close()
             
             return {
-                'total_sales': float(total_sales),
-                'total_orders': total_orders,
-                'avg_ticket': float(avg_ticket),
+                'total_sales': summary['total_sales'],
+                'total_orders': summary['total_orders'],
+                'avg_ticket': summary['avg_ticket'],
                 'unique_products': unique_products
             }
             
@@ -572,7 +640,7 @@ class ReportsController:
             categories_data = db.query(
                 Category.name,
                 func.sum(OrderItem.quantity).label('total_quantity'),
-                func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue'),
+                func.sum(OrderItem.subtotal).label('total_revenue'),
                 func.count(distinct(Product.id)).label('products_count')
             ).join(Product).join(OrderItem).join(Order).filter(
                 Order.created_at >= start_datetime,
@@ -581,7 +649,7 @@ class ReportsController:
             ).group_by(
                 Category.id, Category.name
             ).order_by(
-                desc(func.sum(OrderItem.quantity * OrderItem.unit_price))
+                desc(func.sum(OrderItem.subtotal))
             ).all()
             
             db.close()
@@ -604,31 +672,14 @@ class ReportsController:
     def get_hourly_report(self, start_date, end_date):
         """Obtener reporte de ventas por hora"""
         try:
-            db = self.get_session()
-            start_datetime = self._ensure_datetime(start_date)
-            end_datetime = self._ensure_end_of_day(end_date)
-            
-            # Consulta para obtener ventas por hora
-            hourly_data = db.query(
-                func.extract('hour', Order.created_at).label('hour'),
-                func.sum(Order.total).label('total_sales'),
-                func.count(Order.id).label('orders_count')
-            ).filter(
-                Order.created_at >= start_datetime,
-                Order.created_at <= end_datetime,
-                Order.status.in_([OrderStatus.DELIVERED.value, OrderStatus.PAID.value])
-            ).group_by(
-                func.extract('hour', Order.created_at)
-            ).order_by('hour').all()
-            
-            db.close()
+            hourly_data = self._hourly_totals(start_date, end_date)
             
             result = []
-            for item in hourly_data:
+            for hour in sorted(hourly_data):
                 result.append({
-                    'hour': int(item.hour),
-                    'total_sales': float(item.total_sales),
-                    'orders_count': item.orders_count
+                    'hour': hour,
+                    'total_sales': hourly_data[hour]['revenue'] / 100,
+                    'orders_count': hourly_data[hour]['orders']
                 })
             
             return result
@@ -0,0 +1,210 @@
+# controllers/sales_rollup_controller.py
+from models.base import get_db, begin_write
+from models.order import Order, OrderStatus
+from models.order_item import OrderItem
+from models.product import Product
+from models.category import Category
+from models.daily_sales_rollup import DailySalesRollup
+from models.money import to_cents, from_cents
+from sqlalchemy import func, distinct
+from datetime import datetime, date
+
+# Estados que los reportes cuentan como venta
+SALES_STATUSES = [OrderStatus.DELIVERED.value, OrderStatus.PAID.value]
+
+def _day_of(value):
+    """Normalizar date/datetime/str a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+class SalesRollupController:
+    """Mantener la tabla daily_sales_rollup a partir de las órdenes"""
+
+    def __init__(self, db=None):
+        # Compartir la sesión del llamador: si abrió begin_write, el resumen se
+        # confirma en la misma transacción que el cambio de estado
+        self.db = db or get_db()
+
+    @staticmethod
+    def is_sale(status):
+        """Verificar si un estado cuenta como venta"""
+        if hasattr(status, 'value'):
+            status = status.value
+        return status in SALES_STATUSES
+
+    def apply_status_change(self, order, old_status):
+        """Actualizar el resumen si el cambio de estado entra o sale de las ventas (sin commit)"""
+        was_sale = self.is_sale(old_status)
+        is_sale = self.is_sale(order.status)
+        if was_sale != is_sale:
+            self.apply_order(order, 1 if is_sale else -1)
+
+    def apply_order(self, order, sign=1):
+        """Sumar (sign=1) o restar (sign=-1) una orden al resumen de su día (sin commit)
+
+        Llamar dentro de begin_write: la lectura y escritura del JSON de la
+        fila no debe intercalarse con la de otra terminal.
+        """
+        created_at = order.created_at or datetime.now()
+        day = created_at.date()
+
+        # populate_existing: leer la fila actual aunque la sesión ya la tenga cargada
+        rollup = self.db.query(DailySalesRollup).filter(
+            DailySalesRollup.day == day
+        ).populate_existing().first()
+        if not rollup:
+            rollup = DailySalesRollup(day=day, order_count=0, revenue=0, items_count=0)
+            rollup.categories = {}
+            rollup.hours = {}
+            self.db.add(rollup)
+
+        # Items de la orden agrupados por categoría en una sola consulta
+        category_rows = self.db.query(
+            Category.name,
+            func.sum(OrderItem.quantity).label('items'),
+            func.sum(OrderItem.subtotal).label('revenue')
+        ).select_from(OrderItem).join(
+            Product, Product.id == OrderItem.product_id
+        ).join(
+            Category, Category.id == Product.category_id
+        ).filter(
+            OrderItem.order_id == order.id
+        ).group_by(Category.name).all()
+
+        total = to_cents(order.total or 0)
+        items = sum(int(row.items or 0) for row in category_rows)
+
+        rollup.order_count = (rollup.order_count or 0) + sign
+        rollup.revenue = from_cents(to_cents(rollup.revenue or 0) + sign * total)
+        rollup.items_count = (rollup.items_count or 0) + sign * items
+
+        categories = rollup.categories
+        for row in category_rows:
+            bucket = categories.setdefault(row.name, {'orders': 0, 'revenue': 0, 'items': 0})
+            bucket['orders'] += sign
+            bucket['revenue'] += sign * to_cents(row.revenue or 0)
+            bucket['items'] += sign * int(row.items or 0)
+            if bucket['orders'] <= 0:
+                del categories[row.name]
+        rollup.categories = categories
+
+        hours = rollup.hours
+        hour_key = str(created_at.hour)
+        bucket = hours.setdefault(hour_key, {'orders': 0, 'revenue': 0})
+        bucket['orders'] += sign
+        bucket['revenue'] += sign * total
+        if bucket['orders'] <= 0:
+            del hours[hour_key]
+        rollup.hours = hours
+
+        return rollup
+
+    def rebuild(self, start_date=None, end_date=None):
+        """Reconstruir el resumen desde las órdenes (todo el historial o un rango de días)"""
+        try:
+            begin_write(self.db)  # Borrado y reinserción se confirman juntos
+            rollup_query = self.db.query(DailySalesRollup)
+            order_filters = [Order.status.in_(SALES_STATUSES)]
+            if start_date:
+                start_day = _day_of(start_date)
+                rollup_query = rollup_query.filter(DailySalesRollup.day >= start_day)
+                order_filters.append(Order.created_at >= datetime.combine(start_day, datetime.min.time()))
+            if end_date:
+                end_day = _day_of(end_date)
+                rollup_query = rollup_query.filter(DailySalesRollup.day <= end_day)
+                order_filters.append(Order.created_at <= datetime.combine(end_day, datetime.max.time()))
+
+            rollup_query.delete(synchronize_session=False)
+
+            day_col = func.date(Order.created_at)
+            hour_col = func.extract('hour', Order.created_at)
+
+            # Totales por día
+            days = {}
+            for row in self.db.query(
+                day_col.label('day'),
+                func.count(Order.id).label('orders'),
+                func.sum(Order.total).label('revenue')
+            ).filter(*order_filters).group_by(day_col).all():
+                days[row.day] = {
+                    'orders': row.orders, 'revenue': row.revenue or 0,
+                    'items': 0, 'categories': {}, 'hours': {}
+                }
+
+            # Buckets por categoría
+            for row in self.db.query(
+                day_col.label('day'),
+                Category.name.label('category'),
+                func.count(distinct(Order.id)).label('orders'),
+                func.sum(OrderItem.quantity).label('items'),
+                func.sum(OrderItem.subtotal).label('revenue')
+            ).select_from(Order).join(
+                OrderItem, OrderItem.order_id == Order.id
+            ).join(
+                Product, Product.id == OrderItem.product_id
+            ).join(
+                Category, Category.id == Product.category_id
+            ).filter(*order_filters).group_by(day_col, Category.name).all():
+                if row.day not in days:
+                    continue
+                days[row.day]['items'] += int(row.items or 0)
+                days[row.day]['categories'][row.category] = {
+                    'orders': row.orders,
+                    'revenue': to_cents(row.revenue or 0),
+                    'items': int(row.items or 0)
+                }
+
+            # Buckets por hora
+            for row in self.db.query(
+                day_col.label('day'),
+                hour_col.label('hour'),
+                func.count(Order.id).label('orders'),
+                func.sum(Order.total).label('revenue')
+            ).filter(*order_filters).group_by(day_col, hour_col).all():
+                if row.day not in days:
+                    continue
+                days[row.day]['hours'][str(int(row.hour))] = {
+                    'orders': row.orders,
+                    'revenue': to_cents(row.revenue or 0)
+                }
+
+            for day, data in days.items():
+                rollup = DailySalesRollup(
+                    day=_day_of(day),
+                    order_count=data['orders'],
+                    revenue=data['revenue'],
+                    items_count=data['items']
+                )
+                rollup.categories = data['categories']
+                rollup.hours = data['hours']
+                self.db.add(rollup)
+
+            self.db.commit()
+            return True, len(days)
+
+        except Exception as e:
+            self.db.rollback()
+            print(f"❌ Error reconstruyendo resumen de ventas: {e}")
+            return False, 0
+
+    def ensure_built(self):
+        """Construir el resumen si está vacío y existen ventas (bases de datos anteriores)"""
+        if self.db.query(DailySalesRollup.day).first():
+            return False
+        if not self.db.query(Order.id).filter(Order.status.in_(SALES_STATUSES)).first():
+            return False
+        success, days = self.rebuild()
+        if success:
+            print(f"📊 Resumen diario de ventas construido ({days} días)")
+        return success
+
+    def get_days(self, start_date, end_date):
+        """Obtener filas del resumen con ventas entre dos fechas (inclusive)"""
+        return self.db.query(DailySalesRollup).filter(
+            DailySalesRollup.day >= _day_of(start_date),
+            DailySalesRollup.day <= _day_of(end_date),
+            DailySalesRollup.order_count > 0
+        ).order_by(DailySalesRollup.day).all()
@@ -9,14 +9,25 @@ Versión mejorada con manejo robusto de errores y señales
 import sys
 import signal
 import os
-from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtCore import Qt, QCoreApplication
 
 # Agregar directorio raíz al path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Reporte de arranque opcional (POS_STARTUP_REPORT=1): debe empezar antes de las demás importaciones
+from utils import startup_profile
+startup_profile.start()
+
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtCore import Qt, QCoreApplication, QTimer
+
 from controllers.app_controller import AppController
 from utils.database import init_database
+from utils import sql_trace
+from utils.ui_watchdog import UIWatchdog
+from utils.write_journal import start_write_journal, stop_write_journal
+from config import Config
+
+startup_profile.mark("importaciones")
 
 # Definir códigos de color ANSI para terminal
 class Colors:
@@ -42,11 +53,20 @@ def main():
     print(f"{Colors.CYAN}🚀 Iniciando Sistema POS RestauranteFast...{Colors.RESET}")
     
     try:
+        # Instrumentación SQL opcional (antes de la primera consulta)
+        if Config.SQL_TRACE:
+            sql_trace.enable(slow_ms=Config.SQL_SLOW_QUERY_MS, log_path=Config.SQL_SLOW_QUERY_LOG)
+        
         # Inicializar base de datos
         print(f"{Colors.BLUE}📂 Inicializando base de datos...{Colors.RESET}")
         init_database()
         print(f"{Colors.GREEN}✅ Base de datos lista{Colors.RESET}")
         
+        # Diario de escrituras opcional: reproduce las intenciones pendientes de una sesión anterior
+        if Config.WRITE_JOURNAL:
+            start_write_journal()
+        startup_profile.mark("base de datos")
+        
         # Configuraciones de alta resolución antes de crear la QApplication
         QCoreApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
         QCoreApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
@@ -59,6 +79,21 @@ def main():
         
         # Configurar aplicación para manejar Ctrl+C
         app.setQuitOnLastWindowClosed(True)
+        startup_profile.mark("QApplication")
+        
+        # Detector de congelamientos de la UI opcional
+        if Config.UI_WATCHDOG:
+            app.ui_watchdog = UIWatchdog(
+                app,
+                interval_ms=Config.UI_WATCHDOG_INTERVAL_MS,
+                threshold_ms=Config.UI_WATCHDOG_THRESHOLD_MS,
+                log_path=Config.UI_WATCHDOG_LOG
+            )
+            app.ui_watchdog.start()
+            app.aboutToQuit.connect(app.ui_watchdog.stop)
+        
+        if Config.WRITE_JOURNAL:
+            app.aboutToQuit.connect(stop_write_journal)
         
         print(f"{Colors.BLUE}🔐 Iniciando sistema de autenticación...{Colors.RESET}")
         
@@ -70,6 +105,11 @@ def main():
         
         # Iniciar aplicación con login
         app_controller.start_application()
+        startup_profile.mark("ventana de login")
+        
+        # Reporte al primer ciclo del event loop: el login ya se pintó
+        if startup_profile.is_enabled():
+            QTimer.singleShot(0, startup_profile.finish)
         
         print(f"{Colors.GREEN}✅ Sistema POS listo para usar!{Colors.RESET}")
         print(f"{Colors.CYAN}💡 Para salir use Ctrl+C o cierre la ventana{Colors.RESET}")
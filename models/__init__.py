@@ -5,5 +5,8 @@ from .product import Product
 from .order import Order
 from .order_item import OrderItem
 from .user import User
+from .daily_sales_rollup import DailySalesRollup
+from .catalog_version import CatalogVersion
+from .journal_entry import AppliedJournalEntry
 
-__all__ = ['Base', 'create_tables', 'get_db', 'Category', 'Product', 'Order', 'OrderItem', 'User']
+__all__ = ['Base', 'create_tables', 'get_db', 'Category', 'Product', 'Order', 'OrderItem', 'User', 'DailySalesRollup', 'CatalogVersion', 'AppliedJournalEntry']
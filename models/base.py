@@ -1,24 +1,31 @@
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
+from contextlib import contextmanager
 import os
 
-# Configuración de la base de datos
-DATABASE_URL = "sqlite:///data/pos.db"
+# Configuración de la base de datos (POS_DATABASE_URL permite usar otra base, p. ej. benchmarks)
+DATABASE_URL = os.environ.get("POS_DATABASE_URL", "sqlite:///data/pos.db")
 
 # Crear directorio data si no existe
 os.makedirs("data", exist_ok=True)
 
 # Configurar SQLAlchemy con configuraciones específicas para SQLite
+# Cada sesión toma una conexión del pool mientras la usa: con WAL los hilos lectores
+# no bloquean al hilo de la UI, y el pool nunca cierra una conexión que otro hilo tiene tomada
 engine = create_engine(
     DATABASE_URL, 
     echo=False,
-    poolclass=StaticPool,
+    poolclass=QueuePool,
+    pool_size=10,  # Conexiones que se conservan abiertas al devolverse
+    max_overflow=-1,  # Sin límite: un hilo extra abre una conexión en lugar de esperar
     connect_args={
         "check_same_thread": False,
         # Configurar SQLite para mejor manejo de decimales
-        "isolation_level": None
+        "isolation_level": None,
+        # Esperar en lugar de fallar si otro hilo está escribiendo
+        "timeout": 15
     }
 )
 
@@ -29,6 +36,7 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
     cursor.close()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -43,6 +51,81 @@ def get_db():
         db.close()
         raise
 
+@contextmanager
+def session_scope():
+    """Sesión para una unidad de trabajo: commit al salir, rollback si falla, siempre se cierra
+
+    Los objetos devueltos conservan sus atributos cargados después del cierre.
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def begin_write(db):
+    """Abrir una transacción de escritura real en la sesión (BEGIN IMMEDIATE)
+
+    La conexión usa el modo autocommit de pysqlite (isolation_level=None): sin
+    un BEGIN explícito cada sentencia se confirma sola y rollback no deshace
+    nada. Con BEGIN IMMEDIATE el bloqueo de escritura se toma al inicio y
+    commit/rollback de la sesión confirman o deshacen todo el bloque.
+    """
+    db.execute(text("BEGIN IMMEDIATE"))
+
+class ThreadSessionMixin:
+    """Sesión por hilo para controladores
+
+    Cada hilo que usa el controlador obtiene su propia sesión (y conexión),
+    así un worker en segundo plano no comparte el estado de la sesión de la UI.
+    """
+
+    def init_sessions(self):
+        """Crear el registro de sesiones por hilo del controlador"""
+        self.sessions = scoped_session(SessionLocal)
+
+    @property
+    def db(self):
+        """Sesión del hilo actual"""
+        return self.sessions()
+
+    def reset_session(self):
+        """Cerrar la sesión del hilo actual; la siguiente consulta abre una nueva con datos frescos"""
+        self.sessions.remove()
+
 def create_tables():
     """Crear todas las tablas"""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    create_indexes()
+
+def add_missing_columns():
+    """Agregar a tablas existentes las columnas opcionales nuevas de los modelos
+
+    create_all no altera tablas existentes. Solo se agregan columnas que
+    aceptan NULL (ALTER TABLE ADD COLUMN); sus índices los crea create_indexes.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+                print(f"  🧱 Columna agregada: {table.name}.{column.name}")
+
+def create_indexes():
+    """Crear índices declarados en los modelos que falten en bases de datos existentes"""
+    # create_all omite tablas existentes junto con sus índices nuevos
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,37 @@
+# models/catalog_version.py
+from sqlalchemy import Column, Integer, DateTime
+from datetime import datetime
+from models.base import Base
+
+# Fila única del contador
+CATALOG_VERSION_ID = 1
+
+class CatalogVersion(Base):
+    """Versión del catálogo (categorías y productos), compartida entre terminales"""
+
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<CatalogVersion(version={self.version})>"
+
+def bump_catalog_version(db):
+    """Incrementar la versión en la transacción de la sesión
+
+    Llamar dentro de begin_write: en modo autocommit la actualización se
+    confirmaría sola, antes que el cambio del catálogo.
+    """
+    updated = db.query(CatalogVersion).filter(CatalogVersion.id == CATALOG_VERSION_ID).update(
+        {CatalogVersion.version: CatalogVersion.version + 1, CatalogVersion.updated_at: datetime.now()},
+        synchronize_session=False
+    )
+    if not updated:
+        db.add(CatalogVersion(id=CATALOG_VERSION_ID, version=1))
+
+def get_catalog_version(db):
+    """Obtener la versión actual del catálogo (0 si nunca cambió)"""
+    version = db.query(CatalogVersion.version).filter(CatalogVersion.id == CATALOG_VERSION_ID).scalar()
+    return version or 0
@@ -0,0 +1,42 @@
+# models/daily_sales_rollup.py
+from sqlalchemy import Column, Integer, Date, DateTime, Text
+from datetime import datetime
+import json
+from models.base import Base
+from models.money import MoneyType
+
+class DailySalesRollup(Base):
+    """Resumen materializado de ventas por día (órdenes entregadas o pagadas)"""
+
+    __tablename__ = "daily_sales_rollup"
+
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, default=0, nullable=False)
+    revenue = Column(MoneyType, default=0, nullable=False)
+    items_count = Column(Integer, default=0, nullable=False)
+    # JSON (revenue en centavos): {"Categoría": {"orders": n, "revenue": c, "items": n}}
+    category_buckets = Column(Text, default="{}", nullable=False)
+    # JSON (revenue en centavos): {"13": {"orders": n, "revenue": c}}
+    hour_buckets = Column(Text, default="{}", nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<DailySalesRollup(day={self.day}, orders={self.order_count}, revenue={self.revenue})>"
+
+    @property
+    def categories(self):
+        """Buckets por categoría como diccionario"""
+        return json.loads(self.category_buckets or "{}")
+
+    @categories.setter
+    def categories(self, value):
+        self.category_buckets = json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+    @property
+    def hours(self):
+        """Buckets por hora como diccionario"""
+        return json.loads(self.hour_buckets or "{}")
+
+    @hours.setter
+    def hours(self, value):
+        self.hour_buckets = json.dumps(value, sort_keys=True)
@@ -0,0 +1,16 @@
+# models/journal_entry.py
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from models.base import Base
+
+class AppliedJournalEntry(Base):
+    """Intención del diario de escrituras ya aplicada (evita duplicarla al reproducir el diario)"""
+
+    __tablename__ = "applied_journal_entries"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(30), nullable=False)
+    applied_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f"<AppliedJournalEntry(id='{self.id}', kind='{self.kind}')>"
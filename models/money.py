@@ -0,0 +1,33 @@
+# models/money.py
+from sqlalchemy import Integer
+from sqlalchemy.types import TypeDecorator
+from decimal import Decimal, ROUND_HALF_UP
+
+CENT = Decimal("0.01")
+
+def to_cents(value):
+    """Convertir un monto (Decimal, float, int o str) a centavos enteros"""
+    if value is None:
+        return None
+    amount = Decimal(str(value))
+    return int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+def from_cents(cents):
+    """Convertir centavos enteros a Decimal con dos decimales"""
+    if cents is None:
+        return None
+    if isinstance(cents, float):
+        # SUM/AVG de SQLite pueden devolver REAL
+        cents = Decimal(str(cents)).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
+    return (Decimal(cents) / 100).quantize(CENT)
+
+class MoneyType(TypeDecorator):
+    """Dinero en punto fijo: se guarda como centavos enteros y se lee como Decimal"""
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return from_cents(value)
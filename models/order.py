@@ -1,9 +1,10 @@
 # models/order.py - VERSIÓN MEJORADA
-from sqlalchemy import Column, Integer, Float, DateTime, String, Enum
+from sqlalchemy import Column, Integer, DateTime, String, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 from models.base import Base
+from models.money import MoneyType
 
 class OrderStatus(enum.Enum):
     PENDING = "pending"      # Pendiente
@@ -15,9 +16,15 @@ class OrderStatus(enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Filtro por estado + rango de fechas (reportes, historial de pagos, cocina)
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        # Cursor (updated_at, id) del feed de cambios de cocina
+        Index("ix_orders_updated_at_id", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    total = Column(Float, nullable=False)
+    total = Column(MoneyType, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     status = Column(String(20), default=OrderStatus.PENDING.value)
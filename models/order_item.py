@@ -1,16 +1,23 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import Base
+from models.money import MoneyType
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        # Items de una orden (carga de items, joins de reportes)
+        Index("ix_order_items_order_id_product_id", "order_id", "product_id"),
+        # Ventas por producto (top productos, márgenes)
+        Index("ix_order_items_product_id", "product_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, ForeignKey("orders.id"))
     product_id = Column(Integer, ForeignKey("products.id"))
     quantity = Column(Integer, nullable=False)
-    unit_price = Column(Float, nullable=False)
-    subtotal = Column(Float, nullable=False)
+    unit_price = Column(MoneyType, nullable=False)
+    subtotal = Column(MoneyType, nullable=False)
     
     order = relationship("Order", back_populates="items")
     product = relationship("Product", back_populates="order_items")
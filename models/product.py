@@ -1,24 +1,8 @@
 from sqlalchemy import Column, Integer, String, Text, Numeric, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.types import TypeDecorator, String as SQLString
-from decimal import Decimal
 from models.base import Base
-
-class DecimalType(TypeDecorator):
-    """Tipo personalizado para manejar Decimals en SQLite como strings"""
-    impl = SQLString
-    cache_ok = True
-    
-    def process_bind_param(self, value, dialect):
-        if value is not None:
-            return str(value)
-        return value
-    
-    def process_result_value(self, value, dialect):
-        if value is not None:
-            return Decimal(value)
-        return value
+from models.money import MoneyType
 
 class Product(Base):
     __tablename__ = "products"
@@ -26,9 +10,10 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(150), nullable=False)
     description = Column(Text, nullable=True)
-    price = Column(DecimalType(10), nullable=False)
-    cost = Column(DecimalType(10), nullable=True)  # Costo para calcular margen
+    price = Column(MoneyType, nullable=False)
+    cost = Column(MoneyType, nullable=True)  # Costo para calcular margen
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    sku = Column(String(50), unique=True, index=True, nullable=True)  # Código SKU/PLU o de barras
     image_path = Column(String(255), nullable=True)  # Ruta de imagen
     is_active = Column(Boolean, default=True, nullable=False)
     is_featured = Column(Boolean, default=False, nullable=False)  # Producto destacado
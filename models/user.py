@@ -2,10 +2,47 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum
 from sqlalchemy.sql import func
 from models.base import Base
+from config import Config
 import enum
 import hashlib
+import hmac
 import secrets
 
+# Hashes guardados antes de registrar los parámetros: hex de PBKDF2-SHA256 con 100.000 iteraciones
+LEGACY_HASH_ALGORITHM = "sha256"
+LEGACY_HASH_ITERATIONS = 100000
+
+def hash_password(password, salt, algorithm=None, iterations=None):
+    """Crear hash PBKDF2 en formato pbkdf2_<algoritmo>$<iteraciones>$<hex>"""
+    algorithm = algorithm or Config.PASSWORD_HASH_ALGORITHM
+    iterations = iterations or Config.PASSWORD_HASH_ITERATIONS
+    digest = hashlib.pbkdf2_hmac(algorithm,
+                                 password.encode('utf-8'),
+                                 salt.encode('utf-8'),
+                                 iterations).hex()
+    return f"pbkdf2_{algorithm}${iterations}${digest}"
+
+def parse_password_hash(password_hash):
+    """Obtener (algoritmo, iteraciones, hex) de un hash guardado"""
+    if password_hash.startswith("pbkdf2_") and password_hash.count("$") == 2:
+        scheme, iterations, digest = password_hash.split("$")
+        return scheme[len("pbkdf2_"):], int(iterations), digest
+    return LEGACY_HASH_ALGORITHM, LEGACY_HASH_ITERATIONS, password_hash
+
+def verify_password_hash(password, salt, password_hash):
+    """Verificar una contraseña contra un hash guardado (no usa la sesión: apto para otros hilos)"""
+    algorithm, iterations, digest = parse_password_hash(password_hash)
+    candidate = hashlib.pbkdf2_hmac(algorithm,
+                                    password.encode('utf-8'),
+                                    salt.encode('utf-8'),
+                                    iterations).hex()
+    return hmac.compare_digest(candidate, digest)
+
+def password_hash_outdated(password_hash):
+    """Verificar si el hash usa parámetros distintos a los configurados"""
+    algorithm, iterations, _ = parse_password_hash(password_hash)
+    return (algorithm, iterations) != (Config.PASSWORD_HASH_ALGORITHM, Config.PASSWORD_HASH_ITERATIONS)
+
 class UserRole(enum.Enum):
     """Roles de usuario"""
     ADMIN = "admin"
@@ -36,15 +73,16 @@ class User(Base):
         self.password_hash = self._hash_password(password)
     
     def _hash_password(self, password):
-        """Crear hash seguro de la contraseña"""
-        return hashlib.pbkdf2_hmac('sha256', 
-                                 password.encode('utf-8'), 
-                                 self.salt.encode('utf-8'), 
-                                 100000).hex()
+        """Crear hash seguro de la contraseña con los parámetros configurados"""
+        return hash_password(password, self.salt)
     
     def check_password(self, password):
         """Verificar contraseña"""
-        return self.password_hash == self._hash_password(password)
+        return verify_password_hash(password, self.salt, self.password_hash)
+    
+    def needs_rehash(self):
+        """Verificar si el hash debe regenerarse con los parámetros actuales"""
+        return password_hash_outdated(self.password_hash)
     
     def set_password(self, password):
         """Cambiar contraseña"""
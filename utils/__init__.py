@@ -1,5 +1,16 @@
 # utils/__init__.py
-from .database import init_database
-from .printer import ReceiptPrinter
+# Importación diferida: utils.sql_trace o utils.colors no deben cargar la base
+# de datos ni los módulos de impresión
+import importlib
+
+_EXPORTS = {
+    'init_database': '.database',
+    'ReceiptPrinter': '.printer',
+}
 
 __all__ = ['init_database', 'ReceiptPrinter']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,140 @@
+# utils/background_loader.py
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+import itertools
+import traceback
+from utils import sql_trace
+
+class _LoadTask(QRunnable):
+    """Tarea del pool: ejecuta la consulta y entrega el resultado por señales"""
+
+    def __init__(self, loader, key, generation, fn, args, kwargs):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # Una solicitud más nueva ya la reemplazó: no consultar
+        if not self.loader.is_current(self.key, self.generation):
+            return
+        try:
+            with sql_trace.refresh(f"{self.loader.name}.{self.key}"):
+                result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.loader._failed.emit(self.key, self.generation, str(e))
+        else:
+            self.loader._finished.emit(self.key, self.generation, result)
+
+class BackgroundLoader(QObject):
+    """Ejecutar cargas de datos en un QThreadPool sin bloquear la UI
+
+    Cada carga se identifica con una clave (por ejemplo la vista). Una carga
+    nueva con la misma clave reemplaza a la anterior: si aún no empezó se
+    retira del pool y si ya terminó su resultado se descarta. Los callbacks
+    se ejecutan en el hilo de la UI, así la vista sigue mostrando los datos
+    anteriores hasta que llegan los nuevos.
+
+    La función se ejecuta en otro hilo: debe devolver datos simples u objetos
+    con sus relaciones ya cargadas, nunca widgets.
+    """
+
+    # Señales internas (clave, generación, resultado/error); llegan en cola al hilo de la UI
+    _finished = pyqtSignal(str, int, object)
+    _failed = pyqtSignal(str, int, str)
+
+    # Señales públicas para quien prefiera conectarse en lugar de usar callbacks
+    finished = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, max_threads=2, pool=None):
+        super().__init__(parent)
+        # Nombre para los resúmenes de la instrumentación SQL (la vista dueña)
+        self.name = type(parent).__name__ if parent is not None else type(self).__name__
+        if pool is None:
+            # Pool propio: las consultas de SQLite no se benefician de muchos hilos
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(max_threads)
+        self.pool = pool
+        self._generations = itertools.count(1)
+        self._current = {}   # clave -> generación vigente
+        self._tasks = {}     # clave -> tarea pendiente (para retirarla del pool)
+        self._callbacks = {} # clave -> (on_result, on_error)
+
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, **kwargs):
+        """Programar una carga; reemplaza cualquier carga pendiente con la misma clave
+
+        Returns:
+            Número de generación de la carga
+        """
+        self.cancel(key)
+
+        generation = next(self._generations)
+        task = _LoadTask(self, key, generation, fn, args, kwargs)
+        # Python conserva la referencia; el pool no debe borrar el objeto
+        task.setAutoDelete(False)
+
+        self._current[key] = generation
+        self._tasks[key] = task
+        self._callbacks[key] = (on_result, on_error)
+        self.pool.start(task)
+        return generation
+
+    def cancel(self, key):
+        """Cancelar la carga de una clave; si ya está en ejecución su resultado se descarta"""
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            self.pool.tryTake(task)
+        self._current.pop(key, None)
+        self._callbacks.pop(key, None)
+
+    def cancel_all(self):
+        """Cancelar todas las cargas (al cerrar la vista)"""
+        for key in list(self._current):
+            self.cancel(key)
+
+    def is_current(self, key, generation):
+        """Verificar si una generación sigue siendo la vigente para su clave"""
+        return self._current.get(key) == generation
+
+    def is_loading(self, key):
+        """Verificar si hay una carga vigente para la clave"""
+        return key in self._current
+
+    def wait(self, msecs=-1):
+        """Esperar a que terminen las tareas en ejecución (scripts y pruebas)"""
+        return self.pool.waitForDone(msecs)
+
+    def _take_callbacks(self, key, generation):
+        """Obtener los callbacks si el resultado es vigente y cerrar la carga"""
+        if not self.is_current(key, generation):
+            return None
+        self._current.pop(key, None)
+        self._tasks.pop(key, None)
+        return self._callbacks.pop(key, (None, None))
+
+    @pyqtSlot(str, int, object)
+    def _on_finished(self, key, generation, result):
+        callbacks = self._take_callbacks(key, generation)
+        if callbacks is None:
+            return
+        on_result, _ = callbacks
+        if on_result:
+            on_result(result)
+        self.finished.emit(key, result)
+
+    @pyqtSlot(str, int, str)
+    def _on_failed(self, key, generation, message):
+        callbacks = self._take_callbacks(key, generation)
+        if callbacks is None:
+            return
+        _, on_error = callbacks
+        if on_error:
+            on_error(message)
+        self.failed.emit(key, message)
@@ -0,0 +1,308 @@
+# utils/benchmark_controllers.py
+"""
+Benchmark de las rutas críticas de los controladores sobre bases sintéticas.
+
+Uso (desde la raíz del proyecto):
+    python -m utils.benchmark_controllers
+    python -m utils.benchmark_controllers --sizes 10k,100k --repeat 30
+    python -m utils.benchmark_controllers --baseline data/benchmarks/anterior.json --threshold 0.25
+
+Las bases se generan una sola vez con utils.generate_dataset y se reutilizan.
+Cada tamaño corre en un proceso aparte apuntando POS_DATABASE_URL a su base.
+El resultado se guarda como JSON para comparar entre commits; con --baseline
+el comando falla (código 1) si alguna ruta empeora más que el umbral.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, date, timedelta
+
+BENCHMARK_DIR = os.path.join("data", "benchmarks")
+DEFAULT_SIZES = "10k,100k,1m"
+
+def parse_size(text):
+    """Convertir '10k', '1m' o '5000' a número de órdenes"""
+    text = text.strip().lower()
+    multiplier = 1
+    if text.endswith("k"):
+        multiplier, text = 1000, text[:-1]
+    elif text.endswith("m"):
+        multiplier, text = 1000000, text[:-1]
+    return int(float(text) * multiplier)
+
+def percentile(sorted_values, fraction):
+    """Percentil con interpolación lineal sobre una lista ordenada"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(timings_ms, query_counts):
+    """Latencias (ms) y consultas por llamada de una ruta"""
+    values = sorted(timings_ms)
+    return {
+        'calls': len(values),
+        'min_ms': round(values[0], 3),
+        'p50_ms': round(percentile(values, 0.50), 3),
+        'p90_ms': round(percentile(values, 0.90), 3),
+        'p95_ms': round(percentile(values, 0.95), 3),
+        'p99_ms': round(percentile(values, 0.99), 3),
+        'max_ms': round(values[-1], 3),
+        'mean_ms': round(sum(values) / len(values), 3),
+        'queries': round(sum(query_counts) / len(query_counts), 1)
+    }
+
+class QueryCounter:
+    """Contar sentencias SQL ejecutadas por el engine"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+def get_benchmark_paths():
+    """Rutas a medir: [(nombre, preparar, ejecutar, limpiar)]
+
+    preparar() corre fuera de la medición (p. ej. sesión nueva) y limpiar()
+    al final de la ruta (p. ej. borrar las órdenes creadas).
+    """
+    from models.product import Product
+    from controllers.order_controller import OrderController
+    from controllers.payment_controller import PaymentController
+    from controllers.reports_controller import ReportsController
+    from controllers.menu_controller import MenuController
+
+    order_ctrl = OrderController()
+    payment_ctrl = PaymentController()
+    reports_ctrl = ReportsController()
+    menu_ctrl = MenuController()
+
+    end_date = date.today()
+    start_date = end_date - timedelta(days=30)
+
+    paths = []
+
+    # Crear órdenes: 3 productos activos por orden; se borran al terminar
+    product_ids = [
+        product_id for (product_id,) in
+        order_ctrl.db.query(Product.id).filter(Product.is_active == True).limit(3).all()
+    ]
+    created_ids = []
+
+    def create_order():
+        order = order_ctrl.create_order(
+            [{'product_id': product_id, 'quantity': 1} for product_id in product_ids],
+            customer_name="Benchmark"
+        )
+        created_ids.append(order.id)
+
+    def delete_created_orders():
+        from models.base import engine
+        if not created_ids:
+            return
+        placeholders = ", ".join("?" for _ in created_ids)
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"DELETE FROM order_items WHERE order_id IN ({placeholders})", tuple(created_ids)
+            )
+            connection.exec_driver_sql(
+                f"DELETE FROM orders WHERE id IN ({placeholders})", tuple(created_ids)
+            )
+        created_ids.clear()
+
+    paths.append(("OrderController.create_order", order_ctrl.reset_session, create_order, delete_created_orders))
+    paths.append(("OrderController.get_active_orders", order_ctrl.reset_session,
+                  order_ctrl.get_active_orders, None))
+    paths.append(("OrderController.get_all_orders_for_kitchen", order_ctrl.reset_session,
+                  order_ctrl.get_all_orders_for_kitchen, None))
+
+    # Historial de pagos como lo pide la vista (páginas de 15 con items precargados)
+    page_size = 15
+    total_pages = payment_ctrl.get_payment_history(page=1, page_size=page_size)['total_pages']
+    paths.append(("PaymentController.get_payment_history[first_page]", payment_ctrl.reset_session,
+                  lambda: payment_ctrl.get_payment_history(page=1, page_size=page_size, eager_items=True),
+                  None))
+    paths.append(("PaymentController.get_payment_history[last_page]", payment_ctrl.reset_session,
+                  lambda: payment_ctrl.get_payment_history(page=total_pages, page_size=page_size, eager_items=True),
+                  None))
+
+    # Todos los métodos públicos de ReportsController sobre los últimos 30 días
+    export_dir = tempfile.mkdtemp(prefix="pos_benchmark_")
+    for name, method in inspect.getmembers(ReportsController, inspect.isfunction):
+        if name.startswith("_") or name == "get_session":
+            continue
+        kwargs = {'start_date': start_date, 'end_date': end_date}
+        if 'file_path' in inspect.signature(method).parameters:
+            kwargs['file_path'] = os.path.join(export_dir, "reporte.xlsx")
+        paths.append((f"ReportsController.{name}", None,
+                      lambda method=getattr(reports_ctrl, name), kwargs=kwargs: method(**kwargs), None))
+
+    paths.append(("MenuController.get_categories_with_product_count", menu_ctrl.reset_session,
+                  menu_ctrl.get_categories_with_product_count, None))
+
+    return paths
+
+def run_benchmarks(repeat=20, warmup=2):
+    """Medir cada ruta en la base actual (POS_DATABASE_URL)"""
+    from models.base import engine
+    from models.order import Order
+
+    counter = QueryCounter(engine)
+    results = {}
+
+    for name, setup, run, cleanup in get_benchmark_paths():
+        timings = []
+        query_counts = []
+        for iteration in range(warmup + repeat):
+            if setup:
+                setup()
+            queries_before = counter.count
+            started = time.perf_counter()
+            run()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if iteration >= warmup:
+                timings.append(elapsed_ms)
+                query_counts.append(counter.count - queries_before)
+        if cleanup:
+            cleanup()
+
+        results[name] = summarize(timings, query_counts)
+        stats = results[name]
+        print(
+            f"   {name:<58} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  "
+            f"{stats['queries']:>6} consultas",
+            file=sys.stderr
+        )
+
+    from models.base import get_db
+    db = get_db()
+    try:
+        dataset = {'orders': db.query(Order.id).count()}
+    finally:
+        db.close()
+
+    return {'dataset': dataset, 'paths': results}
+
+def ensure_dataset(size, datasets_dir, regenerate=False):
+    """Ruta de la base sintética para un tamaño, generándola si no existe"""
+    from utils.generate_dataset import generate_dataset
+
+    path = os.path.join(datasets_dir, f"pos_{size}.db")
+    if regenerate or not os.path.exists(path):
+        print(f"🧪 Generando base de {size:,} órdenes en {path}...")
+        generate_dataset(output=path, orders=size, force=True)
+    return path
+
+def run_size_in_subprocess(db_path, repeat, warmup):
+    """Correr el benchmark de un tamaño en un proceso con su propia base"""
+    env = dict(os.environ, POS_DATABASE_URL=f"sqlite:///{os.path.abspath(db_path)}")
+    completed = subprocess.run(
+        [sys.executable, "-m", "utils.benchmark_controllers", "--worker",
+         "--repeat", str(repeat), "--warmup", str(warmup)],
+        env=env, stdout=subprocess.PIPE, check=True
+    )
+    return json.loads(completed.stdout.decode("utf-8").strip().splitlines()[-1])
+
+def get_commit():
+    """Commit actual del repositorio (si está disponible)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, check=True
+        ).stdout.decode().strip()
+    except Exception:
+        return None
+
+def compare_results(current, baseline, threshold=0.25, min_delta_ms=1.0):
+    """Comparar contra una corrida anterior: lista de regresiones (tamaño, ruta, métrica, antes, ahora)
+
+    Una ruta empeora si su p50 o p95 crece más que el umbral relativo y además
+    más que min_delta_ms (para ignorar ruido en rutas de microsegundos).
+    """
+    regressions = []
+    for size, size_results in current['results'].items():
+        baseline_paths = baseline.get('results', {}).get(size, {}).get('paths', {})
+        for name, stats in size_results['paths'].items():
+            previous = baseline_paths.get(name)
+            if not previous:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                before, now = previous[metric], stats[metric]
+                if now > before * (1 + threshold) and now - before > min_delta_ms:
+                    regressions.append((size, name, metric, before, now))
+    return regressions
+
+def main():
+    """Generar bases, medir cada tamaño, guardar JSON y comparar contra la línea base"""
+    parser = argparse.ArgumentParser(description="Benchmark de controladores sobre bases sintéticas")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Órdenes por base (por defecto {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=20, help="Llamadas medidas por ruta (por defecto 20)")
+    parser.add_argument("--warmup", type=int, default=2, help="Llamadas de calentamiento por ruta (por defecto 2)")
+    parser.add_argument("--datasets-dir", default=BENCHMARK_DIR, help="Carpeta de las bases sintéticas")
+    parser.add_argument("--regenerate", action="store_true", help="Regenerar las bases aunque existan")
+    parser.add_argument("--output", help="Archivo JSON de resultados (por defecto en data/benchmarks/)")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Empeoramiento relativo permitido (por defecto 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Diferencia mínima en ms para contar como regresión")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Proceso hijo: medir la base de POS_DATABASE_URL e imprimir el JSON en la última línea
+        print(json.dumps(run_benchmarks(args.repeat, args.warmup)))
+        return 0
+
+    os.makedirs(args.datasets_dir, exist_ok=True)
+    commit = get_commit()
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec="seconds"),
+            'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'warmup': args.warmup
+        },
+        'results': {}
+    }
+
+    for size_text in args.sizes.split(","):
+        size = parse_size(size_text)
+        db_path = ensure_dataset(size, args.datasets_dir, args.regenerate)
+        print(f"⏱️  Midiendo base de {size:,} órdenes...")
+        report['results'][size_text.strip().lower()] = run_size_in_subprocess(db_path, args.repeat, args.warmup)
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados guardados en {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            for size, name, metric, before, now in regressions:
+                print(f"❌ [{size}] {name} {metric}: {before:.2f} ms → {now:.2f} ms")
+            print(f"❌ {len(regressions)} regresión(es) sobre el umbral de {args.threshold:.0%}")
+            return 1
+        print(f"✅ Sin regresiones respecto a {args.baseline}")
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
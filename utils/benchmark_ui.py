@@ -0,0 +1,291 @@
+# utils/benchmark_ui.py
+"""
+Benchmark de construcción y refresco de vistas Qt sin pantalla (QT_QPA_PLATFORM=offscreen).
+
+Uso (desde la raíz del proyecto):
+    python -m utils.benchmark_ui
+    python -m utils.benchmark_ui --views pos,kitchen --sizes 50,500 --repeat 10
+    python -m utils.benchmark_ui --baseline data/benchmarks/ui_anterior.json
+
+Para cada tamaño N se genera una base con N productos activos, N pedidos en
+curso y suficientes pagos para una página de N filas. Cada vista y tamaño
+corre en un proceso aparte (el pico de memoria es por escenario) y mide:
+
+- pos: POSWindow (load_products al construir), load_products, cambio de
+  categoría, update_cart_display con N líneas y add_to_cart sobre ese carrito
+- kitchen: KitchenOrdersView (load_orders al construir), load_orders y
+  cambio de filtro
+- history: PaymentHistoryView, update_table con N filas y búsqueda por cliente
+"""
+import argparse
+import json
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+from utils.benchmark_controllers import (
+    BENCHMARK_DIR, QueryCounter, summarize, compare_results, get_commit
+)
+
+DEFAULT_VIEWS = "pos,kitchen,history"
+DEFAULT_SIZES = "20,100,500"
+# Productos del catálogo base de utils.generate_dataset (por variante)
+BASE_CATALOG_SIZE = 27
+
+def peak_rss_kb():
+    """Pico de memoria residente del proceso en KB (None si no está disponible)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta bytes, Linux KB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def ensure_ui_dataset(size, datasets_dir, regenerate=False):
+    """Base para vistas con exactamente size productos activos y size pedidos en curso"""
+    from utils.generate_dataset import generate_dataset
+
+    path = os.path.join(datasets_dir, f"ui_{size}.db")
+    if regenerate or not os.path.exists(path):
+        print(f"🧪 Generando base de vistas para N={size} en {path}...")
+        generate_dataset(
+            output=path,
+            months=1,
+            orders=max(2000, size * 4),
+            catalog_scale=math.ceil(size / BASE_CATALOG_SIZE),
+            active_orders=size,
+            force=True
+        )
+        # Dejar activos solo los primeros N productos
+        connection = sqlite3.connect(path)
+        try:
+            connection.execute("UPDATE products SET is_active = (id <= ?)", (size,))
+            connection.commit()
+        finally:
+            connection.close()
+    return path
+
+def measure(app, fn, *args):
+    """Tiempo (ms) de una llamada incluyendo el procesamiento de eventos pendientes (layout, polish)"""
+    started = time.perf_counter()
+    result = fn(*args)
+    app.processEvents()
+    return result, (time.perf_counter() - started) * 1000
+
+def measure_repeated(app, counter, repeat, fn, *args):
+    """Resumen de latencias y consultas de varias llamadas"""
+    timings = []
+    query_counts = []
+    for _ in range(repeat):
+        queries_before = counter.count
+        _, elapsed_ms = measure(app, fn, *args)
+        timings.append(elapsed_ms)
+        query_counts.append(counter.count - queries_before)
+    return summarize(timings, query_counts)
+
+def count_widgets(widget):
+    """Número de widgets en el árbol de una vista"""
+    from PyQt5.QtWidgets import QWidget
+    return len(widget.findChildren(QWidget)) + 1
+
+def bench_pos(app, counter, size, repeat):
+    """POSWindow: construcción, recarga de productos, cambio de categoría y carrito"""
+    from views.pos_window import POSWindow
+
+    paths = {}
+    queries_before = counter.count
+    window, elapsed_ms = measure(app, POSWindow)
+    paths['construct'] = summarize([elapsed_ms], [counter.count - queries_before])
+    window.resize(1366, 768)
+    app.processEvents()
+
+    paths['load_products'] = measure_repeated(app, counter, repeat, window.load_products)
+
+    # Alternar entre la primera categoría y "Todas"
+    state = {'toggle': False}
+    def change_category():
+        state['toggle'] = not state['toggle']
+        if state['toggle'] and len(window.category_buttons) > 1:
+            window.select_category(window.product_controller.get_all_categories()[0].id, window.category_buttons[1])
+        else:
+            window.select_category(None, window.category_buttons[0])
+    paths['select_category'] = measure_repeated(app, counter, repeat, change_category)
+
+    # Carrito con N líneas distintas
+    products = window.product_controller.get_all_products()[:size]
+    for product in products:
+        window.cart.add(product)
+    paths['update_cart_display'] = measure_repeated(app, counter, repeat, window.update_cart_display)
+    # Toque sobre una línea existente con el carrito lleno (solo se actualiza esa fila)
+    paths['add_to_cart'] = measure_repeated(app, counter, repeat, window.add_to_cart, products[-1])
+
+    return window, paths
+
+def bench_kitchen(app, counter, size, repeat):
+    """KitchenOrdersView: construcción, sincronización completa y cambio de filtro"""
+    from views.kitchen_orders_window import KitchenOrdersView
+    from models.order import OrderStatus
+
+    paths = {}
+    queries_before = counter.count
+    view, elapsed_ms = measure(app, KitchenOrdersView)
+    paths['construct'] = summarize([elapsed_ms], [counter.count - queries_before])
+    # Sin refrescos automáticos durante la medición
+    view.timer.stop()
+    view.resize(1366, 768)
+    app.processEvents()
+
+    paths['load_orders'] = measure_repeated(app, counter, repeat, view.load_orders)
+
+    state = {'toggle': False}
+    def change_filter():
+        state['toggle'] = not state['toggle']
+        view.filter_orders(OrderStatus.PENDING if state['toggle'] else None)
+    paths['filter_orders'] = measure_repeated(app, counter, repeat, change_filter)
+
+    return view, paths
+
+def bench_history(app, counter, size, repeat):
+    """PaymentHistoryView: construcción, tabla con N filas y búsqueda por cliente"""
+    from views.payment_history_window import PaymentHistoryView
+
+    paths = {}
+    queries_before = counter.count
+    view, elapsed_ms = measure(app, PaymentHistoryView)
+    paths['construct'] = summarize([elapsed_ms], [counter.count - queries_before])
+    view.resize(1366, 768)
+    app.processEvents()
+
+    # Página de N filas consultada en este hilo (la vista normalmente usa el pool)
+    view.page_size = size
+    start_date = view.start_date.date().toPyDate()
+    end_date = view.end_date.date().toPyDate()
+    orders = view.fetch_payment_history(start_date, end_date, None, 1)['orders']
+    paths['update_table'] = measure_repeated(app, counter, repeat, view.update_table, orders)
+
+    state = {'toggle': False}
+    def change_search():
+        state['toggle'] = not state['toggle']
+        search_term = "Juan" if state['toggle'] else None
+        view.show_payment_history(view.fetch_payment_history(start_date, end_date, search_term, 1))
+    paths['search'] = measure_repeated(app, counter, repeat, change_search)
+
+    return view, paths
+
+VIEW_BENCHMARKS = {
+    'pos': bench_pos,
+    'kitchen': bench_kitchen,
+    'history': bench_history,
+}
+
+def run_view_benchmark(view_name, size, repeat):
+    """Medir una vista en este proceso (base en POS_DATABASE_URL)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from models.base import engine
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    counter = QueryCounter(engine)
+
+    widget, paths = VIEW_BENCHMARKS[view_name](app, counter, size, repeat)
+    for name, stats in paths.items():
+        print(
+            f"   {view_name}.{name:<24} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  "
+            f"{stats['queries']:>6} consultas",
+            file=sys.stderr
+        )
+
+    return {
+        'dataset': {'size': size},
+        'paths': paths,
+        'widgets': count_widgets(widget),
+        'peak_rss_kb': peak_rss_kb()
+    }
+
+def run_in_subprocess(db_path, view_name, size, repeat):
+    """Correr un escenario (vista, tamaño) en un proceso con su propia base"""
+    env = dict(
+        os.environ,
+        POS_DATABASE_URL=f"sqlite:///{os.path.abspath(db_path)}",
+        QT_QPA_PLATFORM="offscreen"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-m", "utils.benchmark_ui", "--worker",
+         "--views", view_name, "--sizes", str(size), "--repeat", str(repeat)],
+        env=env, stdout=subprocess.PIPE, check=True
+    )
+    return json.loads(completed.stdout.decode("utf-8").strip().splitlines()[-1])
+
+def main():
+    """Generar bases, medir cada vista y tamaño, guardar JSON y comparar contra la línea base"""
+    parser = argparse.ArgumentParser(description="Benchmark de vistas Qt sin pantalla")
+    parser.add_argument("--views", default=DEFAULT_VIEWS, help=f"Vistas a medir (por defecto {DEFAULT_VIEWS})")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Productos/pedidos/filas por escenario (por defecto {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=10, help="Repeticiones de cada refresco (por defecto 10)")
+    parser.add_argument("--datasets-dir", default=BENCHMARK_DIR, help="Carpeta de las bases sintéticas")
+    parser.add_argument("--regenerate", action="store_true", help="Regenerar las bases aunque existan")
+    parser.add_argument("--output", help="Archivo JSON de resultados (por defecto en data/benchmarks/)")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Empeoramiento relativo permitido (por defecto 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Diferencia mínima en ms para contar como regresión")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    views = [view.strip() for view in args.views.split(",") if view.strip()]
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    unknown = [view for view in views if view not in VIEW_BENCHMARKS]
+    if unknown:
+        print(f"❌ Vistas desconocidas: {', '.join(unknown)} (opciones: {', '.join(VIEW_BENCHMARKS)})")
+        return 1
+
+    if args.worker:
+        # Proceso hijo: un escenario, JSON en la última línea
+        print(json.dumps(run_view_benchmark(views[0], sizes[0], args.repeat)))
+        return 0
+
+    os.makedirs(args.datasets_dir, exist_ok=True)
+    commit = get_commit()
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec="seconds"),
+            'commit': commit,
+            'repeat': args.repeat
+        },
+        'results': {}
+    }
+
+    for size in sizes:
+        db_path = ensure_ui_dataset(size, args.datasets_dir, args.regenerate)
+        for view_name in views:
+            print(f"⏱️  Midiendo {view_name} con N={size}...")
+            result = run_in_subprocess(db_path, view_name, size, args.repeat)
+            print(f"   {result['widgets']} widgets, pico de memoria {result['peak_rss_kb']} KB")
+            report['results'][f"{view_name}:{size}"] = result
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, f"benchmark_ui_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados guardados en {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            for scenario, name, metric, before, now in regressions:
+                print(f"❌ [{scenario}] {name} {metric}: {before:.2f} ms → {now:.2f} ms")
+            print(f"❌ {len(regressions)} regresión(es) sobre el umbral de {args.threshold:.0%}")
+            return 1
+        print(f"✅ Sin regresiones respecto a {args.baseline}")
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
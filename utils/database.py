@@ -4,6 +4,8 @@ from models.product import Product
 from models.order import Order, OrderStatus
 from models.order_item import OrderItem
 from models.user import User, UserRole
+from controllers.sales_rollup_controller import SalesRollupController
+from utils.migrations import migrate_money_to_cents
 from datetime import datetime, timedelta
 import random
 
@@ -11,8 +13,21 @@ def init_database():
     """Inicializar base de datos con datos de ejemplo solo si está vacía"""
     create_tables()
     
+    # Migrar montos de bases de datos anteriores a centavos enteros
+    migrated_tables = migrate_money_to_cents()
+    if migrated_tables:
+        print(f"  💱 Montos migrados a centavos: {', '.join(migrated_tables)}")
+    
     db = get_db()
     
+    # Construir el resumen diario de ventas en bases de datos existentes
+    sales_rollup = SalesRollupController(db)
+    if "daily_sales_rollup" in migrated_tables:
+        # Los buckets JSON anteriores guardaban montos, no centavos
+        sales_rollup.rebuild()
+    else:
+        sales_rollup.ensure_built()
+    
     # Verificar si ya hay usuarios (no solo categorías)
     if db.query(User).count() > 0:
         print("✅ Base de datos ya tiene usuarios, omitiendo inicialización")
@@ -171,5 +186,8 @@ def init_database():
     
     db.commit()
     
+    print("  📊 Construyendo resumen diario de ventas...")
+    SalesRollupController(db).rebuild()
+    
     db.close()
     print("✅ Base de datos inicializada con datos de ejemplo")
\ No newline at end of file
@@ -0,0 +1,384 @@
+# utils/generate_dataset.py
+"""
+Generar bases de datos sintéticas de alto volumen para pruebas de carga y benchmarks.
+
+Uso (desde la raíz del proyecto):
+    python -m utils.generate_dataset --months 12 --orders-per-day 300
+    python -m utils.generate_dataset --orders 1000000 --output data/pos_1m.db --force
+
+La base generada tiene el mismo esquema que data/pos.db (categorías, productos,
+usuarios por defecto, órdenes con items y resumen diario de ventas).
+"""
+import argparse
+import os
+import random
+import time
+from itertools import accumulate
+from datetime import datetime, date, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from models.base import Base, set_sqlite_pragma
+from models.category import Category
+from models.product import Product
+from models.order import OrderStatus
+from models.user import User, UserRole
+from models.money import to_cents
+from controllers.sales_rollup_controller import SalesRollupController
+
+DEFAULT_OUTPUT = os.path.join("data", "pos_synthetic.db")
+
+# Catálogo base: (categoría, descripción, probabilidad de aparecer en una orden, productos)
+# Cada producto: (nombre, precio, popularidad relativa)
+CATALOG = [
+    ("Hamburguesas", "Hamburguesas artesanales", 0.75, [
+        ("Clásica", 8.99, 10), ("Con Queso", 9.99, 8), ("Especial de la Casa", 12.99, 5),
+        ("Pollo Crispy", 10.50, 6), ("Vegetariana", 9.50, 2), ("Doble Carne", 13.50, 4),
+        ("BBQ Bacon", 12.50, 4), ("Mexicana", 11.00, 3),
+    ]),
+    ("Bebidas", "Bebidas frías y calientes", 0.70, [
+        ("Coca Cola", 2.50, 10), ("Agua Mineral", 1.50, 5), ("Jugo Natural", 3.00, 6),
+        ("Café Americano", 2.00, 3), ("Malteada", 4.50, 4), ("Limonada", 2.75, 5),
+        ("Té Helado", 2.50, 3), ("Cerveza", 3.50, 4),
+    ]),
+    ("Acompañamientos", "Papas, ensaladas y más", 0.55, [
+        ("Papas Fritas", 3.99, 10), ("Aros de Cebolla", 4.50, 5), ("Ensalada César", 5.99, 3),
+        ("Nuggets de Pollo", 6.50, 5), ("Papas con Queso", 5.25, 4), ("Yuca Frita", 3.75, 2),
+    ]),
+    ("Postres", "Dulces tentaciones", 0.20, [
+        ("Helado de Vainilla", 3.50, 6), ("Torta de Chocolate", 4.99, 5), ("Brownie", 5.50, 4),
+        ("Flan Casero", 3.99, 3), ("Cheesecake", 5.75, 3),
+    ]),
+]
+
+# Cantidad por línea y método de pago de las órdenes pagadas
+QUANTITY_WEIGHTS = [(1, 0.75), (2, 0.20), (3, 0.05)]
+PAYMENT_METHOD_WEIGHTS = [("efectivo", 0.55), ("tarjeta", 0.30), ("transferencia", 0.15)]
+# Demanda relativa por día de la semana (lunes=0)
+WEEKDAY_FACTORS = [0.80, 0.85, 0.90, 1.00, 1.25, 1.40, 1.10]
+CUSTOMER_NAMES = [
+    "Juan Pérez", "María García", "Carlos López", "Ana Martínez", "Luis Rodríguez",
+    "Sofía Gómez", "Andrés Díaz", "Valentina Torres", "Jorge Ramírez", "Camila Herrera",
+]
+
+OPENING_HOUR = 10
+CLOSING_HOUR = 23
+
+def _cumulative(weighted):
+    """Preparar una lista [(valor, peso)] para sorteos rápidos: (valores, pesos acumulados)"""
+    values, weights = zip(*weighted)
+    return values, list(accumulate(weights))
+
+def _weighted_choice(rng, cumulative):
+    """Elegir un valor de una lista preparada con _cumulative"""
+    values, cum_weights = cumulative
+    return rng.choices(values, cum_weights=cum_weights)[0]
+
+QUANTITIES = _cumulative(QUANTITY_WEIGHTS)
+PAYMENT_METHODS = _cumulative(PAYMENT_METHOD_WEIGHTS)
+# Estados de los pedidos en curso que se agregan con active_orders
+ACTIVE_STATUSES = _cumulative([
+    (OrderStatus.PENDING.value, 0.35), (OrderStatus.PREPARING.value, 0.30),
+    (OrderStatus.READY.value, 0.20), (OrderStatus.DELIVERED.value, 0.15),
+])
+
+def _order_time(rng, day):
+    """Hora de creación con picos de almuerzo (13:00) y cena (19:30)"""
+    while True:
+        roll = rng.random()
+        if roll < 0.45:
+            hour = rng.gauss(13.0, 1.0)
+        elif roll < 0.85:
+            hour = rng.gauss(19.5, 1.2)
+        else:
+            hour = rng.uniform(OPENING_HOUR, CLOSING_HOUR)
+        if OPENING_HOUR <= hour < CLOSING_HOUR:
+            break
+    return datetime.combine(day, datetime.min.time()) + timedelta(seconds=int(hour * 3600))
+
+def _order_status(rng, created_at, now, cancel_rate, unpaid_rate):
+    """Estado según la antigüedad: las órdenes recientes siguen en cocina"""
+    age_minutes = (now - created_at).total_seconds() / 60
+    if rng.random() < cancel_rate:
+        return OrderStatus.CANCELLED.value
+    if age_minutes < 15:
+        return OrderStatus.PENDING.value
+    if age_minutes < 35:
+        return OrderStatus.PREPARING.value
+    if age_minutes < 50:
+        return OrderStatus.READY.value
+    if rng.random() < unpaid_rate:
+        return OrderStatus.DELIVERED.value
+    return OrderStatus.PAID.value
+
+def _format_datetime(value):
+    """Formato de DateTime de SQLAlchemy para SQLite"""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def create_catalog(db, catalog_scale=1):
+    """Crear categorías y productos; catalog_scale > 1 agrega variantes de cada producto
+
+    Returns:
+        Lista por categoría de (probabilidad, sorteo de (product_id, precio_centavos))
+    """
+    mix = []
+    plu = 1000  # Códigos PLU consecutivos (búsqueda y lector de códigos del POS)
+    for category_name, description, probability, products in CATALOG:
+        category = Category(name=category_name, description=description)
+        db.add(category)
+        db.flush()
+
+        category_products = []
+        for variant in range(1, catalog_scale + 1):
+            for name, price, popularity in products:
+                product = Product(
+                    name=name if variant == 1 else f"{name} {variant}",
+                    description=f"{name} ({category_name.lower()})",
+                    price=price,
+                    cost=round(price * 0.4, 2),
+                    category_id=category.id,
+                    stock=100,
+                    preparation_time=10,
+                    sku=str(plu)
+                )
+                plu += 1
+                db.add(product)
+                db.flush()
+                category_products.append(((product.id, to_cents(price)), popularity / variant))
+        mix.append((probability, _cumulative(category_products)))
+
+    db.commit()
+    return mix
+
+def create_default_users(db):
+    """Crear los mismos usuarios por defecto que init_database"""
+    users = [
+        ("admin", "admin123", "Administrador Principal", UserRole.ADMIN),
+        ("usuario", "usuario123", "Usuario Regular", UserRole.REGULAR),
+        ("cajero", "cajero123", "Cajero Principal", UserRole.REGULAR),
+        ("gerente", "gerente123", "Gerente de Restaurante", UserRole.ADMIN),
+    ]
+    for username, password, full_name, role in users:
+        db.add(User(
+            username=username,
+            password=password,
+            full_name=full_name,
+            email=f"{username}@restaurantefast.com",
+            role=role
+        ))
+    db.commit()
+
+def _generate_order_items(rng, mix):
+    """Líneas (product_id, cantidad, precio_centavos) de una orden según la mezcla de categorías"""
+    lines = []
+    for probability, products in mix:
+        if rng.random() >= probability:
+            continue
+        product_id, price_cents = _weighted_choice(rng, products)
+        lines.append((product_id, _weighted_choice(rng, QUANTITIES), price_cents))
+
+    if not lines:
+        product_id, price_cents = _weighted_choice(rng, mix[0][1])
+        lines.append((product_id, 1, price_cents))
+    return lines
+
+def generate_dataset(output=DEFAULT_OUTPUT, months=6, orders_per_day=150, orders=None,
+                     end_date=None, seed=42, cancel_rate=0.05, unpaid_rate=0.03,
+                     catalog_scale=1, active_orders=0, batch_size=20000, force=False):
+    """Generar una base de datos sintética
+
+    Args:
+        output: Ruta del archivo SQLite a crear
+        months: Meses de historial hasta end_date
+        orders_per_day: Órdenes promedio por día (antes del factor por día de la semana)
+        orders: Total aproximado de órdenes; si se indica reemplaza orders_per_day
+        end_date: Último día del historial (por defecto hoy)
+        seed: Semilla para resultados reproducibles
+        cancel_rate: Proporción de órdenes canceladas
+        unpaid_rate: Proporción de órdenes entregadas sin pago registrado
+        catalog_scale: Variantes por producto del catálogo base
+        active_orders: Pedidos en curso adicionales (últimas 2 horas) para la vista de cocina
+        batch_size: Órdenes por lote de inserción
+        force: Sobrescribir el archivo si existe
+
+    Returns:
+        Diccionario con conteos y tiempo total
+    """
+    if os.path.exists(output):
+        if not force:
+            raise FileExistsError(f"{output} ya existe (use --force para sobrescribir)")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(output + suffix):
+                os.remove(output + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    now = datetime.now()
+    end_day = end_date or date.today()
+    start_day = end_day - timedelta(days=int(months * 30.4))
+    days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+
+    if orders:
+        # Repartir el total según los factores de cada día
+        total_factor = sum(WEEKDAY_FACTORS[day.weekday()] for day in days)
+        orders_per_day = orders / total_factor
+
+    engine = create_engine(
+        f"sqlite:///{output}",
+        connect_args={"check_same_thread": False, "isolation_level": None}
+    )
+    event.listen(engine, "connect", set_sqlite_pragma)
+    Base.metadata.create_all(bind=engine)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        print("  🍔 Creando catálogo y usuarios...")
+        mix = create_catalog(db, catalog_scale)
+        create_default_users(db)
+
+        print(f"  📋 Generando órdenes del {start_day} al {end_day}...")
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            # Carga masiva: sin fsync, se confirma en lotes
+            cursor.execute("PRAGMA synchronous=OFF")
+
+            order_sql = (
+                "INSERT INTO orders (id, total, created_at, updated_at, status, "
+                "customer_name, table_number, payment_method) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            )
+            item_sql = (
+                "INSERT INTO order_items (order_id, product_id, quantity, unit_price, subtotal) "
+                "VALUES (?, ?, ?, ?, ?)"
+            )
+
+            order_rows = []
+            item_rows = []
+            order_id = 0
+            item_count = 0
+
+            def flush():
+                cursor.execute("BEGIN")
+                cursor.executemany(order_sql, order_rows)
+                cursor.executemany(item_sql, item_rows)
+                cursor.execute("COMMIT")
+                order_rows.clear()
+                item_rows.clear()
+
+            def add_order(created_at, status, updated_at):
+                nonlocal order_id, item_count
+                order_id += 1
+
+                total = 0
+                for product_id, quantity, price_cents in _generate_order_items(rng, mix):
+                    subtotal = price_cents * quantity
+                    total += subtotal
+                    item_rows.append((order_id, product_id, quantity, price_cents, subtotal))
+                    item_count += 1
+
+                payment_method = None
+                if status == OrderStatus.PAID.value:
+                    payment_method = _weighted_choice(rng, PAYMENT_METHODS)
+
+                # Mesa o para llevar (None)
+                table_number = rng.randint(1, 20) if rng.random() < 0.65 else None
+                customer_name = rng.choice(CUSTOMER_NAMES) if rng.random() < 0.3 else "Cliente"
+
+                order_rows.append((
+                    order_id, total, _format_datetime(created_at), _format_datetime(updated_at),
+                    status, customer_name, table_number, payment_method
+                ))
+
+                if len(order_rows) >= batch_size:
+                    flush()
+                    print(f"     {order_id:,} órdenes...")
+
+            for day in days:
+                expected = orders_per_day * WEEKDAY_FACTORS[day.weekday()]
+                day_orders = max(0, int(round(rng.gauss(expected, expected * 0.1))))
+
+                for created_at in sorted(_order_time(rng, day) for _ in range(day_orders)):
+                    if created_at > now:
+                        continue
+                    status = _order_status(rng, created_at, now, cancel_rate, unpaid_rate)
+                    updated_at = min(created_at + timedelta(minutes=rng.randint(10, 60)), now)
+                    add_order(created_at, status, updated_at)
+
+            # Pedidos en curso para la cocina, en orden cronológico
+            for minutes_ago in sorted((rng.uniform(1, 120) for _ in range(active_orders)), reverse=True):
+                created_at = now - timedelta(minutes=minutes_ago)
+                add_order(created_at, _weighted_choice(rng, ACTIVE_STATUSES), created_at)
+
+            if order_rows:
+                flush()
+
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+        finally:
+            connection.close()
+
+        print("  📊 Construyendo resumen diario de ventas...")
+        success, rollup_days = SalesRollupController(db).rebuild()
+        if not success:
+            raise RuntimeError("No se pudo construir el resumen diario de ventas")
+
+        # Estadísticas para el planificador de consultas
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        'output': output,
+        'days': len(days),
+        'orders': order_id,
+        'order_items': item_count,
+        'rollup_days': rollup_days,
+        'seconds': round(time.perf_counter() - started, 1)
+    }
+
+def main():
+    """Generar la base sintética según los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Generar una base de datos sintética de alto volumen")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"Archivo SQLite a crear (por defecto {DEFAULT_OUTPUT})")
+    parser.add_argument("--months", type=float, default=6, help="Meses de historial (por defecto 6)")
+    parser.add_argument("--orders-per-day", type=float, default=150, help="Órdenes promedio por día (por defecto 150)")
+    parser.add_argument("--orders", type=int, help="Total aproximado de órdenes (reemplaza --orders-per-day)")
+    parser.add_argument("--end-date", help="Último día del historial (YYYY-MM-DD, por defecto hoy)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla aleatoria (por defecto 42)")
+    parser.add_argument("--cancel-rate", type=float, default=0.05, help="Proporción de órdenes canceladas")
+    parser.add_argument("--unpaid-rate", type=float, default=0.03, help="Proporción de órdenes entregadas sin pagar")
+    parser.add_argument("--catalog-scale", type=int, default=1, help="Variantes por producto del catálogo base")
+    parser.add_argument("--active-orders", type=int, default=0, help="Pedidos en curso adicionales para la cocina")
+    parser.add_argument("--force", action="store_true", help="Sobrescribir el archivo si existe")
+    args = parser.parse_args()
+
+    end_date = datetime.strptime(args.end_date, "%Y-%m-%d").date() if args.end_date else None
+
+    try:
+        stats = generate_dataset(
+            output=args.output,
+            months=args.months,
+            orders_per_day=args.orders_per_day,
+            orders=args.orders,
+            end_date=end_date,
+            seed=args.seed,
+            cancel_rate=args.cancel_rate,
+            unpaid_rate=args.unpaid_rate,
+            catalog_scale=args.catalog_scale,
+            active_orders=args.active_orders,
+            force=args.force
+        )
+    except FileExistsError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(
+        f"✅ {stats['output']}: {stats['orders']:,} órdenes, {stats['order_items']:,} items, "
+        f"{stats['days']} días en {stats['seconds']}s"
+    )
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
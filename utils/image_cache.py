@@ -0,0 +1,217 @@
+# utils/image_cache.py
+"""
+Imágenes de productos: miniaturas en disco direccionadas por contenido y
+caché LRU de QPixmap en memoria.
+
+- import_product_image() copia la foto original a data/product_images/<sha256>.<ext>
+  y genera sus miniaturas de tamaño fijo en data/thumbnails/<aa>/<sha256>_<tamaño>.png.
+  Dos productos con la misma foto comparten archivo y miniaturas.
+- PixmapCache.request() entrega la miniatura como QPixmap: desde la LRU si
+  ya está en memoria; si no, la decodifica en un hilo de trabajo (QImage es
+  seguro fuera del hilo de la UI, QPixmap no) y llama al callback en la UI.
+
+Así redibujar la grilla del POS no vuelve a decodificar fotos grandes.
+"""
+import hashlib
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QSize, Qt
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+from config import Config
+from utils.background_loader import BackgroundLoader
+
+_DIGEST_NAME = re.compile(r"^[0-9a-f]{64}$")
+_digest_memo = {}  # (ruta, mtime, tamaño) -> sha256 de imágenes con nombre no direccionado
+_digest_lock = threading.Lock()
+
+def file_digest(path):
+    """SHA-256 del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def image_digest(image_path):
+    """Digest de una imagen: el nombre si ya está direccionada por contenido, si no se calcula"""
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    if _DIGEST_NAME.match(stem):
+        return stem
+    stat = os.stat(image_path)
+    key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        digest = _digest_memo.get(key)
+    if digest is None:
+        digest = file_digest(image_path)
+        with _digest_lock:
+            _digest_memo[key] = digest
+    return digest
+
+def thumbnail_path(digest, size):
+    """Ruta de la miniatura de un digest y tamaño"""
+    return os.path.join(Config.THUMBNAIL_DIR, digest[:2], f"{digest}_{size}.png")
+
+def decode_scaled(image_path, size):
+    """Decodificar una imagen ya reducida a size x size (conservando proporción)"""
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    original = reader.size()
+    if original.isValid() and (original.width() > size or original.height() > size):
+        # JPEG se decodifica directamente a la resolución reducida
+        reader.setScaledSize(original.scaled(QSize(size, size), Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"No se pudo leer la imagen {image_path}: {reader.errorString()}")
+    if image.width() > size or image.height() > size:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+def ensure_thumbnail(image_path, size=None):
+    """Ruta de la miniatura, generándola si falta (apto para hilos de trabajo)"""
+    size = size or Config.THUMBNAIL_SIZE
+    path = thumbnail_path(image_digest(image_path), size)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image = decode_scaled(image_path, size)
+        # Escribir y renombrar: otro hilo nunca ve una miniatura a medias
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        if not image.save(temp_path, "PNG"):
+            raise ValueError(f"No se pudo guardar la miniatura {path}")
+        os.replace(temp_path, path)
+    return path
+
+def load_thumbnail(image_path, size=None):
+    """QImage de la miniatura (se ejecuta en el hilo de trabajo)"""
+    image = QImage(ensure_thumbnail(image_path, size))
+    if image.isNull():
+        raise ValueError(f"Miniatura inválida para {image_path}")
+    return image
+
+def import_product_image(source_path, sizes=None):
+    """Copiar una foto al almacén de imágenes y generar sus miniaturas
+
+    Returns:
+        Ruta guardada (para Product.image_path)
+    """
+    digest = file_digest(source_path)
+    extension = os.path.splitext(source_path)[1].lower() or ".img"
+    os.makedirs(Config.PRODUCT_IMAGE_DIR, exist_ok=True)
+    stored_path = os.path.join(Config.PRODUCT_IMAGE_DIR, f"{digest}{extension}")
+    if not os.path.exists(stored_path):
+        shutil.copyfile(source_path, stored_path)
+
+    for size in sizes or (Config.THUMBNAIL_SIZE,):
+        ensure_thumbnail(stored_path, size)
+    return stored_path
+
+def remove_product_image(image_path):
+    """Eliminar una imagen y sus miniaturas (el llamador verifica que nadie más la use)"""
+    if not image_path or not os.path.exists(image_path):
+        return
+    digest = image_digest(image_path)
+    thumbnails_dir = os.path.join(Config.THUMBNAIL_DIR, digest[:2])
+    if os.path.isdir(thumbnails_dir):
+        for name in os.listdir(thumbnails_dir):
+            if name.startswith(f"{digest}_"):
+                try:
+                    os.remove(os.path.join(thumbnails_dir, name))
+                except OSError:
+                    pass
+    os.remove(image_path)
+    if pixmap_cache is not None:
+        pixmap_cache.discard(digest)
+
+class PixmapCache(QObject):
+    """LRU acotada de QPixmap de miniaturas con decodificación en segundo plano"""
+
+    def __init__(self, max_entries=None, parent=None):
+        super().__init__(parent)
+        self.max_entries = max_entries or Config.PIXMAP_CACHE_SIZE
+        self._pixmaps = OrderedDict()  # (digest, tamaño) -> QPixmap
+        self._waiting = {}             # clave de carga -> [callbacks]
+        self.loader = BackgroundLoader(self, max_threads=2)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, image_path, size):
+        return (image_digest(image_path), size)
+
+    def get(self, image_path, size=None):
+        """QPixmap en memoria o None (no dispara carga)"""
+        size = size or Config.THUMBNAIL_SIZE
+        try:
+            key = self._key(image_path, size)
+        except OSError:
+            return None
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def request(self, image_path, callback, size=None):
+        """Entregar la miniatura a callback(QPixmap|None)
+
+        Returns:
+            El QPixmap si ya estaba en memoria (el callback también se llama), si no None
+        """
+        size = size or Config.THUMBNAIL_SIZE
+        if not image_path or not os.path.exists(image_path):
+            callback(None)
+            return None
+
+        pixmap = self.get(image_path, size)
+        if pixmap is not None:
+            self.hits += 1
+            callback(pixmap)
+            return pixmap
+
+        self.misses += 1
+        load_key = f"{image_path}|{size}"
+        waiting = self._waiting.get(load_key)
+        if waiting is not None:
+            # Ya se está decodificando: solo esperar el resultado
+            waiting.append(callback)
+            return None
+
+        self._waiting[load_key] = [callback]
+        self.loader.submit(
+            load_key, load_thumbnail, image_path, size,
+            on_result=lambda image: self._on_loaded(load_key, image_path, size, image),
+            on_error=lambda message: self._on_failed(load_key, message)
+        )
+        return None
+
+    def _on_loaded(self, load_key, image_path, size, image):
+        """Convertir a QPixmap en el hilo de la UI, guardar y avisar"""
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps[self._key(image_path, size)] = pixmap
+        while len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        for callback in self._waiting.pop(load_key, []):
+            callback(pixmap)
+
+    def _on_failed(self, load_key, message):
+        print(f"⚠️  Error al cargar miniatura: {message}")
+        for callback in self._waiting.pop(load_key, []):
+            callback(None)
+
+    def discard(self, digest):
+        """Quitar de memoria las miniaturas de una imagen"""
+        for key in [key for key in self._pixmaps if key[0] == digest]:
+            del self._pixmaps[key]
+
+    def clear(self):
+        """Vaciar la caché en memoria"""
+        self._pixmaps.clear()
+
+pixmap_cache = None
+
+def get_pixmap_cache():
+    """Caché compartida del proceso (se crea con la primera vista que la usa)"""
+    global pixmap_cache
+    if pixmap_cache is None:
+        pixmap_cache = PixmapCache()
+    return pixmap_cache
@@ -0,0 +1,89 @@
+# utils/migrations.py
+from sqlalchemy import MetaData
+from sqlalchemy.schema import CreateTable
+from models.base import Base, engine, create_indexes
+from models.money import MoneyType
+
+def _money_columns(table):
+    """Nombres de las columnas de dinero (centavos enteros) de una tabla"""
+    return [column.name for column in table.columns if isinstance(column.type, MoneyType)]
+
+def _pending_money_tables(cursor):
+    """Tablas existentes cuyas columnas de dinero aún no son INTEGER"""
+    pending = []
+    for table in Base.metadata.sorted_tables:
+        money_columns = _money_columns(table)
+        if not money_columns:
+            continue
+        info = cursor.execute(f'PRAGMA table_info("{table.name}")').fetchall()
+        declared = {row[1]: (row[2] or "").upper() for row in info}
+        if any(name in declared and declared[name] != "INTEGER" for name in money_columns):
+            pending.append((table, declared))
+    return pending
+
+def migrate_money_to_cents():
+    """Migrar columnas de dinero Float/DecimalType (texto) a centavos enteros
+
+    SQLite no permite cambiar el tipo de una columna, así que cada tabla se
+    reconstruye: crear tabla nueva, copiar convirtiendo a centavos, borrar la
+    anterior y renombrar. Es idempotente: no hace nada si ya está migrada.
+
+    Returns:
+        Lista con los nombres de las tablas migradas
+    """
+    # Conexión DBAPI directa: la transacción se controla con BEGIN/COMMIT explícitos
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        pending = _pending_money_tables(cursor)
+        if not pending:
+            return []
+
+        # Las llaves foráneas se desactivan fuera de la transacción
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        cursor.execute("BEGIN")
+        try:
+            # Copia del esquema para resolver las llaves foráneas de las tablas nuevas
+            scratch = MetaData()
+            for table in Base.metadata.sorted_tables:
+                table.to_metadata(scratch)
+
+            for table, declared in pending:
+                money_columns = _money_columns(table)
+                new_name = f"{table.name}__cents"
+                new_table = table.to_metadata(scratch, name=new_name)
+                cursor.execute(f'DROP TABLE IF EXISTS "{new_name}"')
+                cursor.execute(str(CreateTable(new_table).compile(dialect=engine.dialect)))
+
+                columns = [column.name for column in table.columns if column.name in declared]
+                select_exprs = []
+                for name in columns:
+                    if name in money_columns:
+                        # DecimalType guardaba texto y Float guardaba REAL: ambos a centavos
+                        select_exprs.append(
+                            f'CAST(ROUND(CAST("{name}" AS REAL) * 100) AS INTEGER)'
+                        )
+                    else:
+                        select_exprs.append(f'"{name}"')
+
+                column_list = ", ".join(f'"{name}"' for name in columns)
+                cursor.execute(
+                    f'INSERT INTO "{new_name}" ({column_list}) '
+                    f'SELECT {", ".join(select_exprs)} FROM "{table.name}"'
+                )
+                cursor.execute(f'DROP TABLE "{table.name}"')
+                cursor.execute(f'ALTER TABLE "{new_name}" RENAME TO "{table.name}"')
+
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+    finally:
+        connection.close()
+
+    # Los índices se eliminaron junto con las tablas anteriores
+    create_indexes()
+    return [table.name for table, _ in pending]
@@ -0,0 +1,116 @@
+# utils/query_plan_check.py
+"""
+Verificar con EXPLAIN QUERY PLAN que las consultas frecuentes usan los índices.
+
+Uso (desde la raíz del proyecto):
+    python -m utils.query_plan_check
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import func, and_, or_
+from models.base import engine, session_scope, create_tables
+from models.order import Order, OrderStatus
+from models.order_item import OrderItem
+from models.product import Product
+from controllers.order_controller import KITCHEN_ACTIVE_STATUSES
+from controllers.sales_rollup_controller import SALES_STATUSES
+
+def explain(query):
+    """Obtener las líneas de EXPLAIN QUERY PLAN de una consulta ORM"""
+    compiled = query.statement.compile(
+        dialect=engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params).fetchall()
+    return [row[-1] for row in rows]
+
+def get_hot_queries(db):
+    """Consultas frecuentes y el índice que debe usar cada una"""
+    now = datetime.now()
+    window_start = now - timedelta(days=3)
+
+    return [
+        (
+            "Historial de pagos (estado + rango de fechas)",
+            db.query(Order).filter(
+                Order.status == OrderStatus.PAID.value,
+                Order.created_at >= now - timedelta(days=30),
+                Order.created_at <= now
+            ).order_by(Order.created_at.desc()),
+            "ix_orders_status_created_at"
+        ),
+        (
+            "Pedidos activos de cocina",
+            db.query(Order).filter(
+                or_(
+                    Order.status.in_(KITCHEN_ACTIVE_STATUSES),
+                    and_(Order.status == OrderStatus.PAID.value, Order.created_at >= window_start)
+                )
+            ),
+            "ix_orders_status_created_at"
+        ),
+        (
+            "Feed de cambios de cocina (cursor updated_at, id)",
+            db.query(Order).filter(
+                Order.updated_at >= window_start,
+                or_(
+                    Order.updated_at > window_start,
+                    and_(Order.updated_at == window_start, Order.id > 0)
+                )
+            ).order_by(Order.updated_at.asc(), Order.id.asc()),
+            "ix_orders_updated_at_id"
+        ),
+        (
+            "Items de una página de órdenes",
+            db.query(OrderItem).filter(OrderItem.order_id.in_([1, 2, 3])),
+            "ix_order_items_order_id_product_id"
+        ),
+        (
+            "Ventas por producto en un período",
+            db.query(
+                Product.name, func.sum(OrderItem.quantity)
+            ).select_from(Product).join(
+                OrderItem, Product.id == OrderItem.product_id
+            ).join(
+                Order, OrderItem.order_id == Order.id
+            ).filter(
+                Order.created_at >= now - timedelta(days=30),
+                Order.status.in_(SALES_STATUSES)
+            ).group_by(Product.id, Product.name),
+            "ix_order_items_"
+        ),
+    ]
+
+def check_query_plans():
+    """Ejecutar EXPLAIN QUERY PLAN sobre las consultas frecuentes: [(nombre, ok, plan)]"""
+    results = []
+    with session_scope() as db:
+        for name, query, index_name in get_hot_queries(db):
+            plan = explain(query)
+            # Debe usar el índice esperado y no recorrer ninguna tabla completa
+            ok = any(index_name in line for line in plan) and not any(
+                line.startswith("SCAN") for line in plan
+            )
+            results.append((name, ok, plan))
+    return results
+
+def main():
+    """Imprimir el plan de cada consulta y fallar si alguna no usa su índice"""
+    create_tables()
+
+    failed = 0
+    for name, ok, plan in check_query_plans():
+        print(f"{'✅' if ok else '❌'} {name}")
+        for line in plan:
+            print(f"     {line}")
+        if not ok:
+            failed += 1
+
+    if failed:
+        print(f"❌ {failed} consulta(s) sin usar el índice esperado")
+        return 1
+    print("✅ Todas las consultas frecuentes usan índices")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
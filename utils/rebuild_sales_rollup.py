@@ -0,0 +1,32 @@
+# utils/rebuild_sales_rollup.py
+"""
+Reconstruir la tabla daily_sales_rollup desde las órdenes.
+
+Uso (desde la raíz del proyecto):
+    python -m utils.rebuild_sales_rollup
+    python -m utils.rebuild_sales_rollup --start 2024-01-01 --end 2024-12-31
+"""
+import argparse
+from models.base import create_tables
+from controllers.sales_rollup_controller import SalesRollupController
+
+def main():
+    """Reconstruir el resumen diario de ventas (todo el historial o un rango)"""
+    parser = argparse.ArgumentParser(description="Reconstruir daily_sales_rollup desde las órdenes")
+    parser.add_argument("--start", help="Primer día a reconstruir (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Último día a reconstruir (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    create_tables()
+
+    controller = SalesRollupController()
+    success, days = controller.rebuild(args.start, args.end)
+    controller.db.close()
+
+    if success:
+        print(f"✅ Resumen de ventas reconstruido: {days} días")
+        return 0
+    return 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+# utils/sql_trace.py
+"""
+Instrumentación opcional de SQL: consultas y tiempo por operación lógica.
+
+Se activa con POS_SQL_TRACE=1 (ver config.py y main.py) o llamando a enable().
+Mientras está desactivada, operation() y refresh() no hacen nada.
+
+- Cada método público de los controladores se etiqueta como operación
+  ("OrderController.get_active_orders") y acumula llamadas, sentencias y tiempo.
+- Las consultas que superan el umbral se escriben en un log rotativo con su
+  EXPLAIN QUERY PLAN.
+- refresh("KitchenOrdersView.refresh_orders") imprime un resumen por refresco
+  de la UI con el desglose por operación (útil para detectar patrones N+1).
+"""
+import atexit
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from sqlalchemy import event
+
+UNTAGGED = "(sin etiqueta)"
+
+_enabled = False
+_slow_ms = 50.0
+_slow_logger = None
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {}  # etiqueta -> {'calls', 'statements', 'sql_ms', 'wall_ms'}
+
+def is_enabled():
+    """Verificar si la instrumentación está activa"""
+    return _enabled
+
+def _frames():
+    """Pila de operaciones abiertas del hilo actual"""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def _record(tag, calls=0, statements=0, sql_ms=0.0, wall_ms=0.0):
+    with _lock:
+        entry = _stats.setdefault(tag, {'calls': 0, 'statements': 0, 'sql_ms': 0.0, 'wall_ms': 0.0})
+        entry['calls'] += calls
+        entry['statements'] += statements
+        entry['sql_ms'] += sql_ms
+        entry['wall_ms'] += wall_ms
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_trace_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("sql_trace_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+
+    stack = _frames()
+    # La sentencia cuenta para todas las operaciones abiertas (totales inclusivos)
+    for frame in stack:
+        frame['statements'] += 1
+        frame['sql_ms'] += elapsed_ms
+    if not stack:
+        _record(UNTAGGED, statements=1, sql_ms=elapsed_ms)
+
+    if elapsed_ms >= _slow_ms and _slow_logger is not None:
+        tag = stack[-1]['tag'] if stack else UNTAGGED
+        _log_slow_query(conn, statement, parameters, executemany, elapsed_ms, tag)
+
+def _log_slow_query(conn, statement, parameters, executemany, elapsed_ms, tag):
+    """Escribir una consulta lenta con su plan de ejecución"""
+    plan = []
+    if not executemany and statement.lstrip().upper().startswith("SELECT"):
+        try:
+            # Cursor DBAPI directo: no dispara los eventos de SQLAlchemy
+            explain_cursor = conn.connection.cursor()
+            try:
+                explain_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plan = [row[-1] for row in explain_cursor.fetchall()]
+            finally:
+                explain_cursor.close()
+        except Exception as e:
+            plan = [f"(EXPLAIN no disponible: {e})"]
+
+    lines = [
+        f"{elapsed_ms:.1f} ms [{tag}] hilo={threading.current_thread().name}",
+        f"  SQL: {' '.join(statement.split())}",
+        f"  Parámetros: {parameters if not executemany else f'{len(parameters)} filas'}",
+    ]
+    lines.extend(f"  PLAN: {line}" for line in plan)
+    _slow_logger.warning("\n".join(lines))
+
+@contextmanager
+def operation(tag):
+    """Agrupar las consultas de un bloque bajo una etiqueta (no hace nada si está desactivada)"""
+    if not _enabled:
+        yield None
+        return
+
+    stack = _frames()
+    frame = {'tag': tag, 'statements': 0, 'sql_ms': 0.0, 'children': {}}
+    stack.append(frame)
+    started = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        wall_ms = (time.perf_counter() - started) * 1000
+        frame['wall_ms'] = wall_ms
+        stack.pop()
+        _record(tag, calls=1, statements=frame['statements'], sql_ms=frame['sql_ms'], wall_ms=wall_ms)
+
+        # Desglose para el resumen de la operación que la contiene
+        if stack:
+            child = stack[-1]['children'].setdefault(tag, {'calls': 0, 'statements': 0, 'sql_ms': 0.0})
+            child['calls'] += 1
+            child['statements'] += frame['statements']
+            child['sql_ms'] += frame['sql_ms']
+
+@contextmanager
+def refresh(name):
+    """Operación de refresco de la UI: al terminar imprime su resumen de consultas"""
+    with operation(name) as frame:
+        yield frame
+    if frame is None:
+        return
+
+    print(
+        f"🧮 SQL [{name}]: {frame['statements']} consultas, "
+        f"{frame['sql_ms']:.1f} ms en SQL / {frame['wall_ms']:.1f} ms total"
+    )
+    for tag, child in sorted(frame['children'].items(), key=lambda item: -item[1]['sql_ms']):
+        # Ayudantes sin consultas (p. ej. filtros en memoria) no aportan al desglose
+        if not child['statements']:
+            continue
+        print(
+            f"     {tag}: {child['calls']} llamada(s), {child['statements']} consultas, "
+            f"{child['sql_ms']:.1f} ms"
+        )
+
+def traced_refresh(name):
+    """Decorador: ejecutar un método de refresco de la UI con resumen de consultas"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with refresh(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def traced(tag):
+    """Decorador: ejecutar la función como operación con la etiqueta dada"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with operation(tag):
+                return fn(*args, **kwargs)
+        wrapper.__sql_traced__ = True
+        return wrapper
+    return decorator
+
+def instrument_class(cls):
+    """Etiquetar cada método público definido en la clase como Clase.metodo"""
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(member):
+            continue
+        if getattr(member, "__sql_traced__", False):
+            continue
+        setattr(cls, name, traced(f"{cls.__name__}.{name}")(member))
+
+def instrument_controllers():
+    """Etiquetar los métodos de todos los controladores de datos"""
+    from controllers.order_controller import OrderController
+    from controllers.payment_controller import PaymentController
+    from controllers.reports_controller import ReportsController
+    from controllers.menu_controller import MenuController
+    from controllers.product_controller import ProductController
+    from controllers.auth_controller import AuthController
+    from controllers.sales_rollup_controller import SalesRollupController
+
+    for cls in (OrderController, PaymentController, ReportsController, MenuController,
+                ProductController, AuthController, SalesRollupController):
+        instrument_class(cls)
+
+def get_stats():
+    """Copia de las estadísticas acumuladas por etiqueta"""
+    with _lock:
+        return {tag: dict(entry) for tag, entry in _stats.items()}
+
+def reset_stats():
+    """Descartar las estadísticas acumuladas"""
+    with _lock:
+        _stats.clear()
+
+def print_stats(limit=25):
+    """Imprimir las operaciones con más tiempo en SQL"""
+    stats = get_stats()
+    if not stats:
+        return
+    print("🧮 Resumen SQL por operación (llamadas, consultas/llamada, ms SQL total):")
+    with_queries = [item for item in stats.items() if item[1]['statements']]
+    for tag, entry in sorted(with_queries, key=lambda item: -item[1]['sql_ms'])[:limit]:
+        per_call = entry['statements'] / entry['calls'] if entry['calls'] else entry['statements']
+        print(f"     {tag}: {entry['calls']}x, {per_call:.1f} consultas/llamada, {entry['sql_ms']:.1f} ms")
+
+def enable(engine=None, slow_ms=50.0, log_path=os.path.join("logs", "slow_queries.log"),
+           max_bytes=1024 * 1024, backup_count=5, instrument=True):
+    """Activar la instrumentación sobre el engine (por defecto el de models.base)
+
+    Args:
+        engine: Engine a instrumentar
+        slow_ms: Umbral en ms para el log de consultas lentas
+        log_path: Archivo del log rotativo de consultas lentas
+        max_bytes: Tamaño máximo de cada archivo del log
+        backup_count: Archivos rotados a conservar
+        instrument: Etiquetar automáticamente los métodos de los controladores
+    """
+    global _enabled, _slow_ms, _slow_logger
+    if _enabled:
+        return
+
+    if engine is None:
+        from models.base import engine
+
+    _slow_ms = float(slow_ms)
+    if log_path:
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        _slow_logger = logging.getLogger("pos.sql.slow")
+        _slow_logger.setLevel(logging.WARNING)
+        _slow_logger.propagate = False
+        _slow_logger.addHandler(handler)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if instrument:
+        instrument_controllers()
+
+    _enabled = True
+    atexit.register(print_stats)
+    print(f"🧮 Instrumentación SQL activa (consultas lentas ≥ {_slow_ms:.0f} ms → {log_path})")
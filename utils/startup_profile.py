@@ -0,0 +1,118 @@
+# utils/startup_profile.py
+"""
+Reporte de tiempo de arranque (POS_STARTUP_REPORT=1).
+
+Mide las fases del arranque (importaciones, base de datos, QApplication,
+login visible) y el tiempo de cada importación al estilo de `python -X importtime`:
+tiempo propio del módulo y tiempo acumulado con las importaciones que dispara.
+
+main.py llama a start() antes de sus importaciones, mark() al terminar cada
+fase y finish() en el primer ciclo del event loop, cuando el login ya se pintó.
+"""
+import os
+import sys
+import time
+
+ENV_VAR = "POS_STARTUP_REPORT"
+
+_started = None
+_marks = []     # (fase, instante)
+_imports = []   # (módulo, propio_ms, acumulado_ms, profundidad)
+_stack = []     # tiempos de hijos de las importaciones en curso
+_finder = None
+
+class _TimingLoader:
+    """Envuelve el loader real y mide exec_module"""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._create_seconds = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Las extensiones compiladas (PyQt5, sqlite3) hacen su trabajo aquí
+        started = time.perf_counter()
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._create_seconds = time.perf_counter() - started
+
+    def exec_module(self, module):
+        depth = len(_stack)
+        _stack.append(0.0)
+        started = time.perf_counter() - self._create_seconds
+        try:
+            self._loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - started
+            children = _stack.pop()
+            if _stack:
+                _stack[-1] += cumulative
+            _imports.append((module.__name__, (cumulative - children) * 1000, cumulative * 1000, depth))
+
+class _ImportTimer:
+    """Finder que delega en los demás y envuelve el loader del spec encontrado"""
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader)
+            return spec
+        return None
+
+def is_enabled():
+    """Verificar si el reporte está activo"""
+    return _started is not None
+
+def start(force=False):
+    """Empezar a medir si POS_STARTUP_REPORT=1 (o force); instala el medidor de importaciones"""
+    global _started, _finder
+    if _started is not None or not (force or os.environ.get(ENV_VAR, "0") == "1"):
+        return
+    _started = time.perf_counter()
+    _finder = _ImportTimer()
+    sys.meta_path.insert(0, _finder)
+
+def mark(phase):
+    """Registrar el fin de una fase del arranque"""
+    if _started is not None:
+        _marks.append((phase, time.perf_counter()))
+
+def stop():
+    """Dejar de medir importaciones (las posteriores al arranque no interesan)"""
+    global _finder
+    if _finder is not None and _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+    _finder = None
+
+def report(limit=20):
+    """Imprimir las fases y las importaciones más costosas del arranque"""
+    if _started is None:
+        return
+    stop()
+
+    print("⏱️  Reporte de arranque:")
+    previous = _started
+    for phase, instant in _marks:
+        print(f"     {phase:<28} {(instant - previous) * 1000:>8.1f} ms  (acumulado {(instant - _started) * 1000:>8.1f} ms)")
+        previous = instant
+
+    # Paquetes de primer nivel importados directamente por la aplicación
+    top_level = [entry for entry in _imports if entry[3] == 0]
+    total_ms = sum(entry[2] for entry in top_level)
+    print(f"⏱️  Importaciones: {len(_imports)} módulos, {total_ms:.1f} ms")
+    print(f"     {'propio ms':>10} | {'acumulado ms':>12} | módulo")
+    for name, self_ms, cumulative_ms, depth in sorted(_imports, key=lambda entry: -entry[2])[:limit]:
+        print(f"     {self_ms:>10.1f} | {cumulative_ms:>12.1f} | {'  ' * depth}{name}")
+
+def finish(phase="login visible"):
+    """Marcar la última fase e imprimir el reporte"""
+    mark(phase)
+    report()
@@ -0,0 +1,150 @@
+# utils/ui_watchdog.py
+"""
+Monitor de latencia del event loop de Qt y detector de congelamientos de la UI.
+
+Un QTimer de alta frecuencia en el hilo de la UI marca un latido contra un
+reloj monótono. Un hilo auxiliar vigila el latido: si se atrasa más que el
+umbral, captura la pila de Python del hilo principal mientras sigue bloqueado.
+Al volver el event loop se registra la duración del congelamiento, la vista
+activa (POSWindow, KitchenOrdersView, ReportsView...) y la pila capturada.
+
+Se activa con POS_UI_WATCHDOG=1 (ver config.py y main.py).
+"""
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QApplication, QStackedWidget
+
+def describe_active_view():
+    """Nombre de la vista activa: cadena de widgets de views/ desde la ventana hasta el foco"""
+    app = QApplication.instance()
+    if app is None:
+        return "(sin aplicación)"
+
+    widget = app.focusWidget()
+    if widget is None:
+        window = app.activeWindow()
+        if window is None:
+            return "(sin ventana activa)"
+        # Sin foco: bajar por las pilas de vistas hasta la vista visible
+        widget = window
+        stack = widget.findChild(QStackedWidget)
+        while stack is not None and stack.currentWidget() is not None:
+            widget = stack.currentWidget()
+            stack = widget.findChild(QStackedWidget)
+
+    names = []
+    while widget is not None:
+        if type(widget).__module__.startswith("views."):
+            name = type(widget).__name__
+            if not names or names[0] != name:
+                names.insert(0, name)
+        widget = widget.parentWidget()
+    return " > ".join(names) if names else "(vista desconocida)"
+
+class UIWatchdog(QObject):
+    """Medir el retraso del event loop y registrar congelamientos con la pila del hilo principal"""
+
+    def __init__(self, parent=None, interval_ms=50, threshold_ms=250,
+                 log_path=os.path.join("logs", "ui_freezes.log"),
+                 max_bytes=1024 * 1024, backup_count=5):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.main_thread_id = threading.main_thread().ident
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._on_tick)
+
+        # Estado compartido con el hilo auxiliar (asignaciones simples, protegidas por el GIL)
+        self._last_beat = time.monotonic()
+        self._active_view = "(iniciando)"
+        self._captured_stack = None
+        self._captured_beat = None
+        self._stop_event = threading.Event()
+        self._monitor_thread = None
+
+        # Estadísticas
+        self.freeze_count = 0
+        self.max_lag_ms = 0.0
+        self.total_ticks = 0
+
+        self.logger = logging.getLogger("pos.ui.watchdog")
+        self.logger.setLevel(logging.WARNING)
+        self.logger.propagate = False
+        if log_path and not self.logger.handlers:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(handler)
+
+    def start(self):
+        """Iniciar el timer de latidos y el hilo auxiliar"""
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self.timer.start()
+        self._monitor_thread = threading.Thread(
+            target=self._monitor, name="UIWatchdog", daemon=True
+        )
+        self._monitor_thread.start()
+        print(f"🐶 Watchdog de UI activo (umbral {self.threshold_ms} ms, latido cada {self.interval_ms} ms)")
+
+    def stop(self):
+        """Detener el watchdog e imprimir el resumen"""
+        self.timer.stop()
+        self._stop_event.set()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join(timeout=1)
+            self._monitor_thread = None
+        print(
+            f"🐶 Watchdog de UI: {self.freeze_count} congelamiento(s), "
+            f"retraso máximo {self.max_lag_ms:.0f} ms"
+        )
+
+    def _on_tick(self):
+        """Latido en el hilo de la UI: medir el retraso respecto al intervalo esperado"""
+        now = time.monotonic()
+        lag_ms = (now - self._last_beat) * 1000 - self.interval_ms
+        beat = self._last_beat
+        self._last_beat = now
+        self.total_ticks += 1
+
+        if lag_ms > self.max_lag_ms:
+            self.max_lag_ms = lag_ms
+
+        if lag_ms >= self.threshold_ms:
+            # La pila solo corresponde a este congelamiento si se capturó durante él
+            stack = self._captured_stack if self._captured_beat == beat else None
+            self._report_freeze(lag_ms, stack)
+
+        self._captured_stack = None
+        self._captured_beat = None
+        self._active_view = describe_active_view()
+
+    def _monitor(self):
+        """Hilo auxiliar: capturar la pila del hilo principal cuando el latido se atrasa"""
+        poll_seconds = max(self.threshold_ms / 4000, 0.01)
+        while not self._stop_event.wait(poll_seconds):
+            beat = self._last_beat
+            late_ms = (time.monotonic() - beat) * 1000 - self.interval_ms
+            if late_ms >= self.threshold_ms and self._captured_beat != beat:
+                frame = sys._current_frames().get(self.main_thread_id)
+                if frame is not None:
+                    self._captured_stack = "".join(traceback.format_stack(frame))
+                    self._captured_beat = beat
+
+    def _report_freeze(self, lag_ms, stack):
+        """Registrar un congelamiento en el log y en la consola"""
+        self.freeze_count += 1
+        message = f"🧊 UI congelada {lag_ms:.0f} ms en {self._active_view}"
+        print(message)
+        if stack:
+            self.logger.warning(f"{message}\nPila del hilo principal:\n{stack}")
+        else:
+            self.logger.warning(f"{message} (sin pila: terminó antes de capturarla)")
@@ -0,0 +1,358 @@
+# utils/write_journal.py
+"""
+Diario de escrituras (write-behind) para que el POS no espere los commits de SQLite.
+
+Con POS_WRITE_JOURNAL=1 las órdenes y los pagos del POS se registran como
+intenciones en un archivo de solo anexado (data/pending_writes.jsonl) y un
+hilo de fondo las aplica a la base de datos por lotes:
+
+- record() escribe la línea y la entrega al sistema operativo antes de
+  volver (sobrevive a un cierre inesperado del proceso). El hilo escritor
+  hace un solo fsync por lote (sobrevive a un corte de energía).
+- Cada lote se aplica en una transacción junto con sus ids en
+  applied_journal_entries; al reproducir el diario las intenciones ya
+  aplicadas se omiten, así un corte entre el commit y la marca "done" no
+  duplica ventas.
+- Si la base está ocupada (copia de respaldo, reporte largo, checkpoint)
+  el lote se reintenta con espera creciente; nada se descarta.
+- Una intención que falla por sus datos (p. ej. producto eliminado) o por
+  un error permanente de la base (tabla faltante, error de disco) se copia
+  a <diario>.failed para revisión manual y no bloquea a las demás; la UI
+  la recibe con take_failures().
+- Al iniciar se reproducen las intenciones sin marca "done" ni "failed".
+- Sin pendientes y con el archivo grande, el diario se compacta.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from sqlalchemy.exc import OperationalError
+from config import Config
+
+INTENT_CREATE_ORDER = "create_order"
+INTENT_COMPLETE_PAYMENT = "complete_payment"
+
+# Espera entre reintentos cuando la base está ocupada (segundos)
+RETRY_INITIAL_SECONDS = 0.25
+RETRY_MAX_SECONDS = 5.0
+
+def is_busy_error(error):
+    """Error de SQLite que se resuelve esperando (base o tabla bloqueada por otra conexión)"""
+    message = str(getattr(error, "orig", error)).lower()
+    return "locked" in message or "busy" in message
+
+class JournalEntry:
+    """Intención registrada en el diario"""
+
+    __slots__ = ("id", "kind", "data", "recorded_at")
+
+    def __init__(self, entry_id, kind, data, recorded_at):
+        self.id = entry_id
+        self.kind = kind
+        self.data = data
+        self.recorded_at = recorded_at
+
+    def to_line(self):
+        return json.dumps({
+            "type": "intent", "id": self.id, "kind": self.kind,
+            "at": self.recorded_at.isoformat(), "data": self.data
+        }, ensure_ascii=False) + "\n"
+
+def read_journal(path):
+    """Intenciones pendientes de un diario (sin marca "done" ni "failed"), en orden"""
+    entries = {}
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Línea cortada por un cierre a mitad de escritura
+            if record.get("type") == "intent":
+                entries[record["id"]] = JournalEntry(
+                    record["id"], record["kind"], record["data"],
+                    datetime.fromisoformat(record["at"])
+                )
+            elif record.get("type") in ("done", "failed"):
+                entries.pop(record.get("id"), None)
+    return list(entries.values())
+
+class WriteJournal:
+    """Diario de intenciones con fsync por lotes y un hilo que las aplica a la base de datos"""
+
+    def __init__(self, appliers, path=None, batch_size=None, compact_bytes=None):
+        """
+        Args:
+            appliers: dict tipo -> fn(db, data, recorded_at) que aplica una intención sin commit
+        """
+        self.appliers = appliers
+        self.path = path or Config.WRITE_JOURNAL_PATH
+        self.batch_size = batch_size or Config.WRITE_JOURNAL_BATCH_SIZE
+        self.compact_bytes = compact_bytes or Config.WRITE_JOURNAL_COMPACT_BYTES
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._idle = threading.Condition(self._lock)
+        self._pending = deque()
+        self._dirty = False  # Hay líneas escritas sin fsync
+        self._file = None
+        self._thread = None
+        self._applied_ids = set()  # Aplicadas desde la última compactación
+        self._failed_ids = set()
+        self._new_failures = []  # (intención, error) aún no mostradas en la UI
+        self.applied_count = 0
+        self.failed_count = 0
+
+    # === CICLO DE VIDA ===
+
+    def start(self):
+        """Abrir el diario, encolar las intenciones sin aplicar e iniciar el hilo escritor"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        replayed = read_journal(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        # Terminar una línea cortada para que la siguiente no quede pegada a ella
+        if self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+                    self._file.flush()
+        self._pending.extend(replayed)
+        if replayed:
+            print(f"📒 Diario de escrituras: reproduciendo {len(replayed)} intenciones pendientes")
+        self._thread = threading.Thread(target=self._run, name="pos-write-journal", daemon=True)
+        self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, timeout=10.0):
+        """Aplicar lo pendiente (hasta timeout) y cerrar el diario; lo que quede se reproduce al iniciar"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        with self._lock:
+            pending = len(self._pending)
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                if not self._thread.is_alive():
+                    self._file.close()
+                    self._file = None
+        self._thread = None
+        print(f"📒 Diario de escrituras cerrado: {self.applied_count} aplicadas, "
+              f"{self.failed_count} fallidas, {pending} pendientes")
+
+    # === REGISTRO (hilo de la UI) ===
+
+    def record(self, kind, data):
+        """Registrar una intención; vuelve sin esperar a la base de datos
+
+        Returns:
+            id de la intención
+        """
+        if kind not in self.appliers:
+            raise ValueError(f"Tipo de intención desconocido: {kind}")
+        entry = JournalEntry(uuid.uuid4().hex, kind, data, datetime.now())
+        line = entry.to_line()
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("El diario de escrituras no está abierto")
+            self._file.write(line)
+            self._file.flush()
+            self._dirty = True
+            self._pending.append(entry)
+        self._wakeup.set()
+        return entry.id
+
+    def pending_count(self):
+        """Intenciones aún no aplicadas"""
+        with self._lock:
+            return len(self._pending)
+
+    def take_failures(self):
+        """Intenciones que fallaron desde la llamada anterior, como lista de (intención, error)"""
+        with self._lock:
+            failures, self._new_failures = self._new_failures, []
+        return failures
+
+    def wait_idle(self, timeout=None):
+        """Esperar a que no queden intenciones pendientes"""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    # === HILO ESCRITOR ===
+
+    def _run(self):
+        retry_delay = RETRY_INITIAL_SECONDS
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self._sync()
+
+            while True:
+                with self._lock:
+                    batch = [self._pending[i] for i in range(min(self.batch_size, len(self._pending)))]
+                if not batch:
+                    break
+                try:
+                    self._apply_batch(batch)
+                    retry_delay = RETRY_INITIAL_SECONDS
+                except OperationalError as e:
+                    # Base ocupada: reintentar el mismo lote más tarde
+                    print(f"⏳ Diario de escrituras: base ocupada, reintento en {retry_delay:.2f}s ({e.orig})")
+                    if self._stopping.wait(retry_delay):
+                        return
+                    retry_delay = min(retry_delay * 2, RETRY_MAX_SECONDS)
+                    continue
+                self._finish(batch)
+                self._sync()
+
+            self._maybe_compact()
+            if self._stopping.is_set():
+                return
+
+    def _sync(self):
+        """Un fsync para todas las líneas escritas desde el anterior"""
+        with self._lock:
+            if not self._dirty or self._file is None:
+                return
+            self._dirty = False
+            fileno = self._file.fileno()
+        os.fsync(fileno)
+
+    def _apply_batch(self, batch):
+        """Aplicar un lote en una transacción; si una intención falla, aislarla
+
+        Solo la base ocupada se propaga (OperationalError) para reintentar el
+        lote; cualquier otro error es permanente y la intención va a .failed.
+        """
+        try:
+            self._apply_in_transaction(batch)
+        except Exception as e:
+            if isinstance(e, OperationalError) and is_busy_error(e):
+                raise
+            if len(batch) == 1:
+                self._record_failure(batch[0], str(getattr(e, "orig", None) or e))
+                return
+            # Aplicar de a una para que una intención inválida no bloquee las demás
+            for entry in batch:
+                try:
+                    self._apply_in_transaction([entry])
+                except Exception as entry_error:
+                    if isinstance(entry_error, OperationalError) and is_busy_error(entry_error):
+                        raise
+                    self._record_failure(entry, str(getattr(entry_error, "orig", None) or entry_error))
+
+    def _apply_in_transaction(self, batch):
+        """Aplicar intenciones y registrar sus ids en la misma transacción"""
+        from models.base import session_scope, begin_write
+        from models.journal_entry import AppliedJournalEntry
+
+        batch = [entry for entry in batch if entry.id not in self._failed_ids]
+        if not batch:
+            return
+        with session_scope() as db:
+            begin_write(db)
+            already_applied = {
+                entry_id for (entry_id,) in db.query(AppliedJournalEntry.id).filter(
+                    AppliedJournalEntry.id.in_([entry.id for entry in batch])
+                )
+            }
+            applied = []
+            for entry in batch:
+                if entry.id in already_applied:
+                    continue
+                self.appliers[entry.kind](db, entry.data, entry.recorded_at)
+                db.add(AppliedJournalEntry(id=entry.id, kind=entry.kind))
+                applied.append(entry.id)
+        self.applied_count += len(applied)
+        self._applied_ids.update(entry.id for entry in batch)
+
+    def _record_failure(self, entry, error):
+        """Guardar una intención que no se pudo aplicar para revisión manual"""
+        self._failed_ids.add(entry.id)
+        self.failed_count += 1
+        print(f"❌ Diario de escrituras: no se pudo aplicar {entry.kind} {entry.id}: {error}")
+        with open(f"{self.path}.failed", "a", encoding="utf-8") as f:
+            record = json.loads(entry.to_line())
+            record["error"] = error
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            self._file.write(json.dumps({"type": "failed", "id": entry.id}) + "\n")
+            self._file.flush()
+            self._dirty = True
+            self._new_failures.append((entry, error))
+
+    def _finish(self, batch):
+        """Marcar el lote como aplicado y sacarlo de la cola"""
+        markers = "".join(json.dumps({"type": "done", "id": entry.id}) + "\n" for entry in batch)
+        with self._lock:
+            self._file.write(markers)
+            self._file.flush()
+            self._dirty = True
+            for _ in batch:
+                self._pending.popleft()
+            if not self._pending:
+                self._idle.notify_all()
+
+    def _maybe_compact(self):
+        """Vaciar el diario cuando todo está aplicado y el archivo creció"""
+        with self._lock:
+            if self._pending or self._file is None or self._file.tell() < self.compact_bytes:
+                return
+            self._file.close()
+            temp_path = f"{self.path}.tmp"
+            open(temp_path, "w").close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._dirty = False
+
+        # Las marcas de intenciones ya borradas del diario no se necesitan más
+        from models.base import session_scope
+        from models.journal_entry import AppliedJournalEntry
+        applied_ids = list(self._applied_ids)
+        try:
+            with session_scope() as db:
+                for start in range(0, len(applied_ids), 500):
+                    db.query(AppliedJournalEntry).filter(
+                        AppliedJournalEntry.id.in_(applied_ids[start:start + 500])
+                    ).delete(synchronize_session=False)
+            self._applied_ids.clear()
+            self._failed_ids.clear()
+        except OperationalError:
+            pass  # Se limpian en la próxima compactación
+
+_write_journal = None
+
+def get_write_journal():
+    """Diario de escrituras activo del proceso (None si está desactivado)"""
+    return _write_journal
+
+def start_write_journal(path=None):
+    """Iniciar el diario de escrituras con las intenciones de órdenes y pagos"""
+    global _write_journal
+    if _write_journal is not None:
+        return _write_journal
+    # Importación diferida: order_controller usa este módulo para registrar intenciones
+    from controllers.order_controller import apply_order_intent, apply_payment_intent
+    journal = WriteJournal({
+        INTENT_CREATE_ORDER: apply_order_intent,
+        INTENT_COMPLETE_PAYMENT: apply_payment_intent,
+    }, path=path)
+    journal.start()
+    _write_journal = journal
+    return journal
+
+def stop_write_journal(timeout=10.0):
+    """Detener el diario activo aplicando lo pendiente"""
+    global _write_journal
+    if _write_journal is not None:
+        _write_journal.stop(timeout)
+        _write_journal = None
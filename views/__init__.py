@@ -1,5 +1,16 @@
 # views/__init__.py
-from .pos_window import POSWindow
-from .payment_history_window import PaymentHistoryView
+# Importación diferida: cargar una vista no debe arrastrar a las demás
+# (el login no necesita POSWindow ni sus dependencias)
+import importlib
+
+_EXPORTS = {
+    'POSWindow': '.pos_window',
+    'PaymentHistoryView': '.payment_history_window',
+}
 
 __all__ = ['POSWindow', 'PaymentHistoryView']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,14 +9,10 @@ from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon, QPixmap, QPainter, QPen, QColor
 from utils.colors import ColorPalette, CommonStyles
 from controllers.auth_controller import AuthController
-from views.user_management_window import UserManagementWidget
-from views.menu_management_window import MenuManagementWidget
-from views.reports_view import ReportsView
-from views.printer_config_view import PrinterConfigView
+from config import Config
 from datetime import datetime, timedelta
 import sys
 import time
-import time
 
 class ActivitySparklineWidget(QLabel):
     """Widget para mostrar mini-gráfica de actividad"""
@@ -481,12 +477,19 @@ class AdminWindow(QMainWindow):
     
     # Señales
     logout_requested = pyqtSignal()
+    lock_requested = pyqtSignal()
     
-    def __init__(self, user):
+    # Precarga opcional de pestañas después del primer pintado
+    PREWARM_DELAY_MS = 1500
+    PREWARM_INTERVAL_MS = 300
+    
+    def __init__(self, user, prewarm_tabs=None):
         super().__init__()
         self.user = user
         # Controlador de autenticación para gestionar usuarios
         self.auth_ctrl = AuthController()
+        self.prewarm_tabs = Config.ADMIN_PREWARM_TABS if prewarm_tabs is None else prewarm_tabs
+        self._prewarm_started = False
         self.init_ui()
     
     def init_ui(self):
@@ -549,22 +552,17 @@ class AdminWindow(QMainWindow):
         dashboard.open_settings.connect(lambda: self.content_tabs.setCurrentIndex(4))
         self.content_tabs.addTab(dashboard, "🏠 Dashboard")
         
-        # Pestaña Usuarios funcional
-        self.users_widget = UserManagementWidget(self.user)
-        self.users_widget.user_updated.connect(self.refresh_user_stats)
-        self.content_tabs.addTab(self.users_widget, "👥 Usuarios")
-        
-        # Pestaña Menú funcional
-        self.menu_widget = MenuManagementWidget(self.user)
-        self.content_tabs.addTab(self.menu_widget, "🍽️ Menú")
-        
-        # Pestaña Reportes funcional
-        self.reports_widget = ReportsView()
-        self.content_tabs.addTab(self.reports_widget, "📊 Reportes")
-        
-        # Pestaña Configuración - Impresoras
-        self.printer_config_widget = PrinterConfigView()
-        self.content_tabs.addTab(self.printer_config_widget, "⚙️ Configuración")
+        # Pestañas de gestión: se construyen (y consultan) al activarse por primera vez
+        self.users_widget = None
+        self.menu_widget = None
+        self.reports_widget = None
+        self.printer_config_widget = None
+        self.lazy_tabs = {}  # índice -> (atributo, fábrica)
+        self.add_lazy_tab("users_widget", self.create_users_tab, "👥 Usuarios")
+        self.add_lazy_tab("menu_widget", self.create_menu_tab, "🍽️ Menú")
+        self.add_lazy_tab("reports_widget", self.create_reports_tab, "📊 Reportes")
+        self.add_lazy_tab("printer_config_widget", self.create_printer_config_tab, "⚙️ Configuración")
+        self.content_tabs.currentChanged.connect(self.ensure_tab)
         
         main_layout.addWidget(self.content_tabs)
         
@@ -575,6 +573,69 @@ class AdminWindow(QMainWindow):
             }}
         """)
     
+    def add_lazy_tab(self, attribute, factory, title):
+        """Agregar una pestaña con un contenedor vacío que se llena al activarla"""
+        container = QWidget()
+        container_layout = QVBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        index = self.content_tabs.addTab(container, title)
+        self.lazy_tabs[index] = (attribute, factory)
+    
+    def ensure_tab(self, index):
+        """Construir el contenido de la pestaña si aún no existe"""
+        entry = self.lazy_tabs.pop(index, None)
+        if entry is None:
+            return
+        attribute, factory = entry
+        try:
+            started = time.perf_counter()
+            widget = factory()
+            self.content_tabs.widget(index).layout().addWidget(widget)
+            setattr(self, attribute, widget)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"📑 Pestaña {self.content_tabs.tabText(index)} construida en {elapsed_ms:.0f} ms")
+        except Exception as e:
+            print(f"❌ Error al construir pestaña {self.content_tabs.tabText(index)}: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def create_users_tab(self):
+        """Pestaña Usuarios"""
+        from views.user_management_window import UserManagementWidget
+        widget = UserManagementWidget(self.user)
+        widget.user_updated.connect(self.refresh_user_stats)
+        return widget
+    
+    def create_menu_tab(self):
+        """Pestaña Menú"""
+        from views.menu_management_window import MenuManagementWidget
+        return MenuManagementWidget(self.user)
+    
+    def create_reports_tab(self):
+        """Pestaña Reportes"""
+        from views.reports_view import ReportsView
+        return ReportsView()
+    
+    def create_printer_config_tab(self):
+        """Pestaña Configuración - Impresoras"""
+        from views.printer_config_view import PrinterConfigView
+        return PrinterConfigView()
+    
+    def showEvent(self, event):
+        """Programar la precarga de pestañas después del primer pintado"""
+        super().showEvent(event)
+        if self.prewarm_tabs and not self._prewarm_started:
+            self._prewarm_started = True
+            QTimer.singleShot(self.PREWARM_DELAY_MS, self.prewarm_next_tab)
+    
+    def prewarm_next_tab(self):
+        """Construir una pestaña pendiente por ciclo para no bloquear la UI"""
+        if not self.lazy_tabs:
+            return
+        self.ensure_tab(min(self.lazy_tabs))
+        if self.lazy_tabs:
+            QTimer.singleShot(self.PREWARM_INTERVAL_MS, self.prewarm_next_tab)
+    
     def create_top_bar(self):
         """Crear barra superior"""
         top_bar = QFrame()
@@ -616,6 +677,27 @@ class AdminWindow(QMainWindow):
             }}
         """)
         logout_btn.clicked.connect(self.handle_logout)
+        
+        # Bloquear / cambiar de usuario sin cerrar el panel
+        lock_btn = QPushButton("🔒 Bloquear")
+        lock_btn.setFixedHeight(25)
+        lock_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {ColorPalette.SILVER_LAKE_BLUE};
+                color: {ColorPalette.PLATINUM};
+                border: none;
+                padding: 2px 10px;
+                border-radius: 8px;
+                font-weight: bold;
+                font-size: 11px;
+                max-width: 150px;
+            }}
+            QPushButton:hover {{
+                background-color: {ColorPalette.YINMN_BLUE};
+            }}
+        """)
+        lock_btn.clicked.connect(self.lock_requested.emit)
+        user_layout.addWidget(lock_btn)
         user_layout.addWidget(logout_btn)
         
         layout.addLayout(user_layout)
@@ -675,10 +757,18 @@ class AdminWindow(QMainWindow):
         
         return widget
     
+    def set_user(self, user):
+        """Actualizar el usuario al desbloquear (mismo administrador)"""
+        self.user = user
+        self.setWindowTitle(f"🛡️ Panel de Administración - {self.user.full_name}")
+        dashboard_widget = self.content_tabs.widget(0)
+        if hasattr(dashboard_widget, 'update_stats'):
+            dashboard_widget.update_stats()
+    
     def refresh_user_stats(self):
         """Refrescar estadísticas de usuarios en el dashboard"""
         # Actualizar las estadísticas del dashboard
-        if hasattr(self, 'users_widget'):
+        if self.users_widget is not None:
             dashboard_widget = self.content_tabs.widget(0)  # El dashboard es la primera pestaña
             if hasattr(dashboard_widget, 'update_stats'):
                 dashboard_widget.update_stats()
@@ -0,0 +1,132 @@
+# views/cart_model.py
+"""
+Modelo del carrito del POS.
+
+Guarda las líneas en orden de inserción con totales acumulados en centavos
+enteros (cada cambio suma o resta solo la diferencia de su línea) y emite
+señales por línea para que la vista toque únicamente la fila afectada.
+"""
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, pyqtSignal
+from models.money import to_cents, from_cents
+
+class CartLine:
+    """Línea del carrito: producto, cantidad y precio unitario en centavos"""
+
+    __slots__ = ("product", "quantity", "unit_cents")
+
+    def __init__(self, product, quantity):
+        self.product = product
+        self.quantity = quantity
+        self.unit_cents = to_cents(product.price)
+
+    @property
+    def subtotal_cents(self):
+        return self.unit_cents * self.quantity
+
+    @property
+    def subtotal(self):
+        """Subtotal de la línea como Decimal"""
+        return from_cents(self.subtotal_cents)
+
+class CartModel(QObject):
+    """Carrito con totales acumulados y señales de inserción, actualización y eliminación"""
+
+    line_inserted = pyqtSignal(int, int)  # product_id, fila
+    line_updated = pyqtSignal(int)        # product_id
+    line_removed = pyqtSignal(int)        # product_id
+    cleared = pyqtSignal()
+    totals_changed = pyqtSignal(object, int)  # total (Decimal), unidades
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lines = OrderedDict()  # product_id -> CartLine
+        self.total_cents = 0
+        self.item_count = 0
+
+    # === CONSULTAS ===
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __contains__(self, product_id):
+        return product_id in self._lines
+
+    def __iter__(self):
+        return iter(self._lines.values())
+
+    def line(self, product_id):
+        """Línea de un producto (None si no está en el carrito)"""
+        return self._lines.get(product_id)
+
+    @property
+    def total(self):
+        """Total del carrito como Decimal"""
+        return from_cents(self.total_cents)
+
+    def order_items(self):
+        """Líneas en el formato de OrderController.create_order, con el precio unitario mostrado (centavos)"""
+        return [{'product_id': line.product.id, 'quantity': line.quantity, 'unit_cents': line.unit_cents}
+                for line in self._lines.values()]
+
+    def as_dicts(self):
+        """Líneas en el formato {'product', 'quantity'} de la impresora"""
+        return [{'product': line.product, 'quantity': line.quantity} for line in self._lines.values()]
+
+    # === CAMBIOS ===
+
+    def add(self, product, quantity=1):
+        """Agregar unidades de un producto (crea la línea si no existe)"""
+        line = self._lines.get(product.id)
+        if line is None:
+            line = CartLine(product, quantity)
+            self._lines[product.id] = line
+            self._adjust(line.subtotal_cents, quantity)
+            self.line_inserted.emit(product.id, len(self._lines) - 1)
+        else:
+            line.quantity += quantity
+            self._adjust(line.unit_cents * quantity, quantity)
+            self.line_updated.emit(product.id)
+        self._emit_totals()
+
+    def set_quantity(self, product_id, quantity):
+        """Fijar la cantidad de una línea (0 o menos la elimina)"""
+        line = self._lines.get(product_id)
+        if line is None:
+            return
+        if quantity <= 0:
+            self.remove(product_id)
+            return
+        if quantity == line.quantity:
+            return
+        delta = quantity - line.quantity
+        line.quantity = quantity
+        self._adjust(line.unit_cents * delta, delta)
+        self.line_updated.emit(product_id)
+        self._emit_totals()
+
+    def remove(self, product_id):
+        """Quitar una línea"""
+        line = self._lines.pop(product_id, None)
+        if line is None:
+            return
+        self._adjust(-line.subtotal_cents, -line.quantity)
+        self.line_removed.emit(product_id)
+        self._emit_totals()
+
+    def clear(self):
+        """Vaciar el carrito"""
+        if not self._lines:
+            return
+        self._lines.clear()
+        self.total_cents = 0
+        self.item_count = 0
+        self.cleared.emit()
+        self._emit_totals()
+
+    def _adjust(self, cents, units):
+        self.total_cents += cents
+        self.item_count += units
+
+    def _emit_totals(self):
+        self.totals_changed.emit(self.total, self.item_count)
@@ -6,20 +6,39 @@ from PyQt5.QtGui import *
 from controllers.order_controller import OrderController
 from models.order import OrderStatus
 from datetime import datetime
+import time
 from utils.colors import ColorPalette, CommonStyles
 from utils.printer import ThermalPrinter
+from utils import sql_trace
+
+# Máximo de tarjetas ocultas que se conservan para reutilizar
+MAX_CARD_POOL = 24
+
+# Segundos que un pago registrado espera a verse como PAID antes de rehabilitar el botón
+PAYMENT_PENDING_SECONDS = 60
 
 class OrderCard(QFrame):
-    """Widget individual para mostrar cada pedido como sticky note mejorado"""
+    """Widget individual para mostrar cada pedido como sticky note mejorado
+    
+    Se construye una sola vez; set_order() actualiza en sitio solo lo que cambió,
+    lo que permite reutilizar la tarjeta para otro pedido.
+    """
     
     status_changed = pyqtSignal(int, OrderStatus)  # Señal para cambio de estado
     payment_requested = pyqtSignal(int)  # Señal para solicitar pago de una orden
     
     def __init__(self, order):
         super().__init__()
-        self.order = order
-        self.is_interactive = self.order.status != OrderStatus.PAID.value  # Solo interactivo si no está pagado
+        self.order = None
+        self.is_interactive = False
+        self.item_labels = []  # Etiquetas de items reutilizables
+        self._items_key = None
+        self._status = None
+        self.payment_pending = False
+        self._style_key = None
+        self._time_color = None
         self.init_ui()
+        self.set_order(order)
     
     def init_ui(self):
         # Tamaño fijo para mantener apariencia consistente
@@ -39,9 +58,6 @@ class OrderCard(QFrame):
         self.setFrameStyle(QFrame.Box)
         self.setAttribute(Qt.WA_StyledBackground)
         
-        # Estilo del card según el estado
-        self.update_card_style()
-        
         layout = QVBoxLayout(self)
         layout.setSpacing(6)  # Espaciado más generoso
         layout.setContentsMargins(12, 12, 12, 12)  # Márgenes más amplios
@@ -49,55 +65,25 @@ class OrderCard(QFrame):
         # Header con número de orden y tiempo - simplificado
         header_layout = QHBoxLayout()
         
-        order_label = QLabel(f"ORDEN #{self.order.id}")
-        order_label.setStyleSheet(f"""
+        self.order_label = QLabel()
+        self.order_label.setStyleSheet(f"""
             font-weight: bold; 
             font-size: {self.font_sizes['header']}px; 
             color: {ColorPalette.RICH_BLACK};
         """)
-        header_layout.addWidget(order_label)
+        header_layout.addWidget(self.order_label)
         
         header_layout.addStretch()
         
-        # Tiempo transcurrido - solo mostrar urgencia para estados activos de cocina
-        elapsed = datetime.now() - self.order.created_at
-        minutes = int(elapsed.total_seconds() / 60)
-        
-        # Solo aplicar colores de urgencia para estados donde es relevante
-        if self.order.status in [OrderStatus.PENDING.value, OrderStatus.PREPARING.value, OrderStatus.READY.value]:
-            # Determinar color según urgencia para estados activos
-            if minutes > 30:  # Muy urgente
-                time_color = ColorPalette.ERROR
-                urgency_icon = "🚨"
-            elif minutes > 20:  # Urgente
-                time_color = ColorPalette.WARNING
-                urgency_icon = "⚠️"
-            else:
-                time_color = ColorPalette.SILVER_LAKE_BLUE
-                urgency_icon = "⏱️"
-        else:
-            # Para pedidos entregados o pagados, usar color neutro sin urgencia
-            time_color = ColorPalette.SILVER_LAKE_BLUE
-            urgency_icon = "⏱️"
-        
-        time_label = QLabel(f"{urgency_icon} {minutes}min")
-        time_label.setStyleSheet(f"""
-            font-size: {self.font_sizes['items']}px; 
-            color: {time_color}; 
-            font-weight: bold;
-        """)
-        header_layout.addWidget(time_label)
+        # Tiempo transcurrido - se actualiza en cada refresco sin reconstruir la tarjeta
+        self.time_label = QLabel()
+        header_layout.addWidget(self.time_label)
         
         layout.addLayout(header_layout)
         
         # Información del cliente - más simple y visible
-        if self.order.table_number:
-            customer_info = f"{self.order.customer_name} - Mesa {self.order.table_number}"
-        else:
-            customer_info = f"{self.order.customer_name} - Para llevar"
-        
-        customer_label = QLabel(customer_info)
-        customer_label.setStyleSheet(f"""
+        self.customer_label = QLabel()
+        self.customer_label.setStyleSheet(f"""
             font-size: {self.font_sizes['customer']}px; 
             color: {ColorPalette.RICH_BLACK}; 
             font-weight: bold;
@@ -106,8 +92,8 @@ class OrderCard(QFrame):
             border-radius: 5px;
             border: 1px solid {ColorPalette.with_alpha(ColorPalette.YINMN_BLUE, 0.2)};
         """)
-        customer_label.setWordWrap(True)
-        layout.addWidget(customer_label)
+        self.customer_label.setWordWrap(True)
+        layout.addWidget(self.customer_label)
         
         # Línea separadora simple
         line = QFrame()
@@ -143,177 +129,166 @@ class OrderCard(QFrame):
         """)
         
         items_widget = QWidget()
-        items_layout = QVBoxLayout(items_widget)
-        items_layout.setContentsMargins(8, 6, 8, 6)
-        items_layout.setSpacing(5)  # Mayor espaciado entre items
-        
-        for item in self.order.items:
-            item_label = QLabel(f"{item.quantity}x {item.product.name}")
-            item_label.setStyleSheet(f"""
-                color: {ColorPalette.RICH_BLACK};
-                font-size: {self.font_sizes['items']}px;
-                padding: 8px 10px;
-                background-color: #ffffff;
-                border-radius: 6px;
-                border: 1px solid {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.3)};
-                font-weight: 500;
-                min-height: 24px;
-            """)
-            item_label.setWordWrap(True)
-            item_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            items_layout.addWidget(item_label)
+        self.items_layout = QVBoxLayout(items_widget)
+        self.items_layout.setContentsMargins(8, 6, 8, 6)
+        self.items_layout.setSpacing(5)  # Mayor espaciado entre items
+        
+        # Estilo compartido por todas las etiquetas de items (se formatea una vez)
+        self.item_style = f"""
+            color: {ColorPalette.RICH_BLACK};
+            font-size: {self.font_sizes['items']}px;
+            padding: 8px 10px;
+            background-color: #ffffff;
+            border-radius: 6px;
+            border: 1px solid {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.3)};
+            font-weight: 500;
+            min-height: 24px;
+        """
         
         items_scroll.setWidget(items_widget)
         layout.addWidget(items_scroll)
         
         # Estado actual - simple y claro
-        status_label = QLabel(f"Estado: {self.order.status_display}")
-        status_label.setAlignment(Qt.AlignCenter)
-        status_label.setStyleSheet(f"""
-            background-color: {self.order.status_color};
-            color: #ffffff;
-            font-weight: bold;
-            font-size: {self.font_sizes['status']}px;
-            padding: 8px;
-            border-radius: 8px;
-        """)
-        layout.addWidget(status_label)
+        self.status_label = QLabel()
+        self.status_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.status_label)
         
-        # Botones de acción - simplificados y mejorados
+        # Botones de acción - se crean una vez y se muestran según el estado
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(8)
         
         # Tamaño de botones
         btn_height = 32 if screen.width() <= 1366 else 36
         
-        if self.order.status == OrderStatus.PENDING.value:
-            start_btn = QPushButton("🚀 Iniciar")
-            start_btn.setFixedHeight(btn_height)
-            start_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {ColorPalette.YINMN_BLUE};
-                    color: #ffffff;
-                    border: none;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {ColorPalette.OXFORD_BLUE};
-                }}
-            """)
-            start_btn.clicked.connect(lambda: self.change_status(OrderStatus.PREPARING))
-            buttons_layout.addWidget(start_btn)
+        self.start_btn = QPushButton("🚀 Iniciar")
+        self.start_btn.setFixedHeight(btn_height)
+        self.start_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {ColorPalette.YINMN_BLUE};
+                color: #ffffff;
+                border: none;
+                padding: 8px 12px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 12px;
+            }}
+            QPushButton:hover {{
+                background-color: {ColorPalette.OXFORD_BLUE};
+            }}
+        """)
+        self.start_btn.clicked.connect(lambda: self.change_status(OrderStatus.PREPARING))
+        buttons_layout.addWidget(self.start_btn)
         
-        elif self.order.status == OrderStatus.PREPARING.value:
-            ready_btn = QPushButton("✅ Listo")
-            ready_btn.setFixedHeight(btn_height)
-            ready_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {ColorPalette.SUCCESS};
-                    color: #ffffff;
-                    border: none;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {ColorPalette.with_alpha(ColorPalette.SUCCESS, 0.8)};
-                }}
-            """)
-            ready_btn.clicked.connect(lambda: self.change_status(OrderStatus.READY))
-            buttons_layout.addWidget(ready_btn)
+        self.ready_btn = QPushButton("✅ Listo")
+        self.ready_btn.setFixedHeight(btn_height)
+        self.ready_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {ColorPalette.SUCCESS};
+                color: #ffffff;
+                border: none;
+                padding: 8px 12px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 12px;
+            }}
+            QPushButton:hover {{
+                background-color: {ColorPalette.with_alpha(ColorPalette.SUCCESS, 0.8)};
+            }}
+        """)
+        self.ready_btn.clicked.connect(lambda: self.change_status(OrderStatus.READY))
+        buttons_layout.addWidget(self.ready_btn)
         
-        elif self.order.status == OrderStatus.READY.value:
-            deliver_btn = QPushButton("🚚 Entregar")
-            deliver_btn.setFixedHeight(btn_height)
-            deliver_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {ColorPalette.SILVER_LAKE_BLUE};
-                    color: #ffffff;
-                    border: none;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {ColorPalette.YINMN_BLUE};
-                }}
-            """)
-            deliver_btn.clicked.connect(lambda: self.change_status(OrderStatus.DELIVERED))
-            buttons_layout.addWidget(deliver_btn)
-        
-        elif self.order.status == OrderStatus.DELIVERED.value:
-            # Botón de pago para órdenes entregadas
-            pay_btn = QPushButton("💳 Procesar Pago")
-            pay_btn.setFixedHeight(btn_height)
-            pay_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {ColorPalette.WARNING};
-                    color: #ffffff;
-                    border: none;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {ColorPalette.with_alpha(ColorPalette.WARNING, 0.8)};
-                }}
-            """)
-            pay_btn.clicked.connect(self.process_payment)
-            buttons_layout.addWidget(pay_btn)
-        
-        elif self.order.status == OrderStatus.PAID.value:
-            # Para pedidos pagados, mostrar solo una etiqueta informativa sin interacción
-            paid_label = QLabel("✅ COMPLETADO")
-            paid_label.setAlignment(Qt.AlignCenter)
-            paid_label.setFixedHeight(btn_height)
-            paid_label.setStyleSheet(f"""
-                QLabel {{
-                    background-color: {ColorPalette.SUCCESS};
-                    color: #ffffff;
-                    border: 2px solid {ColorPalette.with_alpha(ColorPalette.SUCCESS, 0.8)};
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }}
-            """)
-            buttons_layout.addWidget(paid_label)
+        self.deliver_btn = QPushButton("🚚 Entregar")
+        self.deliver_btn.setFixedHeight(btn_height)
+        self.deliver_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {ColorPalette.SILVER_LAKE_BLUE};
+                color: #ffffff;
+                border: none;
+                padding: 8px 12px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 12px;
+            }}
+            QPushButton:hover {{
+                background-color: {ColorPalette.YINMN_BLUE};
+            }}
+        """)
+        self.deliver_btn.clicked.connect(lambda: self.change_status(OrderStatus.DELIVERED))
+        buttons_layout.addWidget(self.deliver_btn)
+        
+        # Botón de pago para órdenes entregadas
+        self.pay_btn = QPushButton("💳 Procesar Pago")
+        self.pay_btn.setFixedHeight(btn_height)
+        self.pay_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {ColorPalette.WARNING};
+                color: #ffffff;
+                border: none;
+                padding: 8px 12px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 12px;
+            }}
+            QPushButton:hover {{
+                background-color: {ColorPalette.with_alpha(ColorPalette.WARNING, 0.8)};
+            }}
+        """)
+        self.pay_btn.clicked.connect(self.process_payment)
+        buttons_layout.addWidget(self.pay_btn)
+        
+        # Para pedidos pagados, mostrar solo una etiqueta informativa sin interacción
+        self.paid_label = QLabel("✅ COMPLETADO")
+        self.paid_label.setAlignment(Qt.AlignCenter)
+        self.paid_label.setFixedHeight(btn_height)
+        self.paid_label.setStyleSheet(f"""
+            QLabel {{
+                background-color: {ColorPalette.SUCCESS};
+                color: #ffffff;
+                border: 2px solid {ColorPalette.with_alpha(ColorPalette.SUCCESS, 0.8)};
+                padding: 8px 12px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 12px;
+            }}
+        """)
+        buttons_layout.addWidget(self.paid_label)
         
         # Botón cancelar (solo para pedidos que no están entregados, pagados o cancelados)
-        if self.order.status not in [OrderStatus.DELIVERED.value, OrderStatus.PAID.value, OrderStatus.CANCELLED.value]:
-            cancel_btn = QPushButton("❌")
-            cancel_btn.setFixedSize(btn_height, btn_height)
-            cancel_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {ColorPalette.ERROR};
-                    color: #ffffff;
-                    border: none;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {ColorPalette.with_alpha(ColorPalette.ERROR, 0.8)};
-                }}
-            """)
-            cancel_btn.setToolTip("Cancelar pedido")
-            cancel_btn.clicked.connect(lambda: self.change_status(OrderStatus.CANCELLED))
-            buttons_layout.addWidget(cancel_btn)
+        self.cancel_btn = QPushButton("❌")
+        self.cancel_btn.setFixedSize(btn_height, btn_height)
+        self.cancel_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {ColorPalette.ERROR};
+                color: #ffffff;
+                border: none;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 12px;
+            }}
+            QPushButton:hover {{
+                background-color: {ColorPalette.with_alpha(ColorPalette.ERROR, 0.8)};
+            }}
+        """)
+        self.cancel_btn.setToolTip("Cancelar pedido")
+        self.cancel_btn.clicked.connect(lambda: self.change_status(OrderStatus.CANCELLED))
+        buttons_layout.addWidget(self.cancel_btn)
+        
+        layout.addLayout(buttons_layout)
         
-        # Solo agregar layout si hay botones
-        if buttons_layout.count() > 0:
-            layout.addLayout(buttons_layout)
+        # Widget mostrado para cada estado del pedido
+        self.status_widgets = {
+            OrderStatus.PENDING.value: self.start_btn,
+            OrderStatus.PREPARING.value: self.ready_btn,
+            OrderStatus.READY.value: self.deliver_btn,
+            OrderStatus.DELIVERED.value: self.pay_btn,
+            OrderStatus.PAID.value: self.paid_label
+        }
         
         # Total - simple y visible
-        total_label = QLabel(f"Total: ${self.order.total:,.0f}")
-        total_label.setAlignment(Qt.AlignCenter)
-        total_label.setStyleSheet(f"""
+        self.total_label = QLabel()
+        self.total_label.setAlignment(Qt.AlignCenter)
+        self.total_label.setStyleSheet(f"""
             font-weight: bold; 
             font-size: {self.font_sizes['total']}px; 
             color: {ColorPalette.RICH_BLACK};
@@ -322,7 +297,125 @@ class OrderCard(QFrame):
             border-radius: 5px;
             border: 2px solid {ColorPalette.SUCCESS};
         """)
-        layout.addWidget(total_label)
+        layout.addWidget(self.total_label)
+    
+    def set_order(self, order):
+        """Mostrar un pedido actualizando solo lo que cambió respecto al anterior"""
+        self.order = order
+        self.is_interactive = order.status != OrderStatus.PAID.value  # Solo interactivo si no está pagado
+        
+        self.order_label.setText(f"ORDEN #{order.id}")
+        
+        if order.table_number:
+            customer_info = f"{order.customer_name} - Mesa {order.table_number}"
+        else:
+            customer_info = f"{order.customer_name} - Para llevar"
+        self.customer_label.setText(customer_info)
+        
+        self.update_items()
+        
+        if order.status != self._status:
+            self._status = order.status
+            self.update_status()
+        
+        self.total_label.setText(f"Total: ${order.total:,.0f}")
+        
+        self.update_elapsed_time()
+    
+    def update_items(self):
+        """Actualizar etiquetas de items reutilizando las existentes"""
+        texts = [f"{item.quantity}x {item.product.name}" for item in self.order.items]
+        if texts == self._items_key:
+            return
+        self._items_key = texts
+        
+        # Crear etiquetas adicionales solo si faltan
+        while len(self.item_labels) < len(texts):
+            item_label = QLabel()
+            item_label.setStyleSheet(self.item_style)
+            item_label.setWordWrap(True)
+            item_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+            self.items_layout.addWidget(item_label)
+            self.item_labels.append(item_label)
+        
+        for index, item_label in enumerate(self.item_labels):
+            if index < len(texts):
+                item_label.setText(texts[index])
+                item_label.show()
+            else:
+                item_label.hide()
+    
+    def update_status(self):
+        """Actualizar etiqueta de estado y botones visibles"""
+        self.status_label.setText(f"Estado: {self.order.status_display}")
+        self.status_label.setStyleSheet(f"""
+            background-color: {self.order.status_color};
+            color: #ffffff;
+            font-weight: bold;
+            font-size: {self.font_sizes['status']}px;
+            padding: 8px;
+            border-radius: 8px;
+        """)
+        
+        active_widget = self.status_widgets.get(self.order.status)
+        for widget in self.status_widgets.values():
+            widget.setVisible(widget is active_widget)
+        
+        self.cancel_btn.setVisible(self.order.status not in [
+            OrderStatus.DELIVERED.value, OrderStatus.PAID.value, OrderStatus.CANCELLED.value
+        ])
+    
+    def set_payment_pending(self, pending):
+        """Deshabilitar el botón de pago mientras el pago registrado no se ve aplicado"""
+        if pending == self.payment_pending:
+            return
+        self.payment_pending = pending
+        self.pay_btn.setEnabled(not pending)
+        self.pay_btn.setText("⏳ Pago registrado" if pending else "💳 Procesar Pago")
+    
+    def get_elapsed_minutes(self):
+        """Minutos transcurridos desde la creación del pedido"""
+        elapsed = datetime.now() - self.order.created_at
+        return int(elapsed.total_seconds() / 60)
+    
+    def update_elapsed_time(self):
+        """Actualizar etiqueta de tiempo y estilo de urgencia del card"""
+        minutes = self.get_elapsed_minutes()
+        
+        # Solo aplicar colores de urgencia para estados donde es relevante
+        if self.order.status in [OrderStatus.PENDING.value, OrderStatus.PREPARING.value, OrderStatus.READY.value]:
+            # Determinar color según urgencia para estados activos
+            if minutes > 30:  # Muy urgente
+                time_color = ColorPalette.ERROR
+                urgency_icon = "🚨"
+            elif minutes > 20:  # Urgente
+                time_color = ColorPalette.WARNING
+                urgency_icon = "⚠️"
+            else:
+                time_color = ColorPalette.SILVER_LAKE_BLUE
+                urgency_icon = "⏱️"
+        else:
+            # Para pedidos entregados o pagados, usar color neutro sin urgencia
+            time_color = ColorPalette.SILVER_LAKE_BLUE
+            urgency_icon = "⏱️"
+        
+        time_text = f"{urgency_icon} {minutes}min"
+        if self.time_label.text() != time_text:
+            self.time_label.setText(time_text)
+        
+        # Re-aplicar hojas de estilo solo cuando cambia el nivel de urgencia
+        if self._time_color != time_color:
+            self._time_color = time_color
+            self.time_label.setStyleSheet(f"""
+                font-size: {self.font_sizes['items']}px; 
+                color: {time_color}; 
+                font-weight: bold;
+            """)
+        
+        style_key = (self.order.status, time_color)
+        if self._style_key != style_key:
+            self._style_key = style_key
+            self.update_card_style()
     
     def update_card_style(self):
         """Actualizar estilo del card según el estado - más simple"""
@@ -400,7 +493,7 @@ class OrderCard(QFrame):
     
     def process_payment(self):
         """Emitir señal para procesar pago solo si la tarjeta es interactiva"""
-        if self.is_interactive:
+        if self.is_interactive and not self.payment_pending:
             self.payment_requested.emit(self.order.id)
 
 class KitchenOrdersView(QWidget):
@@ -412,12 +505,22 @@ class KitchenOrdersView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.order_controller = OrderController()
+        
+        # Estado local alimentado por el feed incremental de cambios
+        self.kitchen_orders = {}  # order_id -> Order
+        self.order_cards = {}  # order_id -> OrderCard
+        self.card_positions = {}  # order_id -> (fila, columna) en el grid
+        self.card_pool = []  # Tarjetas liberadas listas para reutilizar
+        self.changed_order_ids = set()  # Pedidos cuyas tarjetas deben actualizarse
+        self.pending_payments = {}  # order_id -> hora del pago registrado aún no visto como PAID
+        self.change_cursor = None
+        
         self.init_ui()
         self.load_orders()
         
-        # Timer para actualizar automáticamente
+        # Timer para actualizar automáticamente (solo aplica cambios)
         self.timer = QTimer()
-        self.timer.timeout.connect(self.load_orders)
+        self.timer.timeout.connect(self.refresh_orders)
         self.timer.start(10000)  # Actualizar cada 10 segundos
     
     def init_ui(self):
@@ -631,10 +734,15 @@ class KitchenOrdersView(QWidget):
         margins = 10 if self.is_small_screen else 20
         self.orders_layout.setContentsMargins(margins, margins, margins, margins)
         
-        # El número de columnas se calculará dinámicamente en load_orders()
+        # El número de columnas se calculará dinámicamente en render_orders()
         # según el ancho real de la ventana, no de la pantalla
         self.columns = 1  # Valor inicial
         
+        # Etiqueta reutilizable para mensajes (sin pedidos / errores)
+        self.message_label = QLabel()
+        self.message_label.setAlignment(Qt.AlignCenter)
+        self.message_label.hide()
+        
         scroll_area.setWidget(self.orders_container)
         main_layout.addWidget(scroll_area)
         
@@ -694,12 +802,8 @@ class KitchenOrdersView(QWidget):
         self.filter_buttons[status].setChecked(True)
         self.current_filter = status
         
-        # Forzar actualización de datos desde la base de datos antes de aplicar filtro
-        # Esto asegura que siempre tengamos los datos más recientes
-        self.order_controller = OrderController()  # Refrescar controlador
-        
-        # Recargar con filtro
-        self.load_orders()
+        # Traer cambios pendientes y aplicar el filtro sobre el estado local
+        self.refresh_orders()
     
     def calculate_columns(self):
         """Calcular número de columnas según el ancho disponible de la ventana"""
@@ -759,122 +863,51 @@ class KitchenOrdersView(QWidget):
             self.stats_label.setText(f"❌ Error en estadísticas: {str(e)}")
 
     def load_orders(self):
-        """Cargar y mostrar pedidos con filtros actualizados"""
+        """Sincronización completa de pedidos (descarta el cursor del feed)"""
+        self.change_cursor = None
+        self.refresh_orders()
+    
+    @sql_trace.traced_refresh("KitchenOrdersView.refresh_orders")
+    def refresh_orders(self):
+        """Aplicar el feed incremental de cambios y actualizar solo las tarjetas afectadas"""
         try:
-            # Mostrar indicador de carga
-
+            changes = self.order_controller.get_order_changes(self.change_cursor, eager_items=True)
             
-            # Recalcular número de columnas según el ancho actual de la ventana
-            self.columns = self.calculate_columns()
+            if changes['full']:
+                # Instantánea: los pedidos ausentes ya no se muestran
+                snapshot_ids = {order.id for order in changes['orders']}
+                for order_id in list(self.kitchen_orders):
+                    if order_id not in snapshot_ids:
+                        del self.kitchen_orders[order_id]
             
-            # Limpiar layout actual
-            for i in reversed(range(self.orders_layout.count())):
-                child = self.orders_layout.itemAt(i).widget()
-                if child:
-                    child.setParent(None)
+            for order in changes['orders']:
+                self.kitchen_orders[order.id] = order
+                self.changed_order_ids.add(order.id)
             
-            # Obtener pedidos según el filtro
-            if self.current_filter == OrderStatus.PAID:
-                # Para pedidos pagados, obtener todos los pedidos para tener acceso a los pagados
-                all_orders = self.order_controller.get_all_orders_for_kitchen()
-                # Filtrar solo los pagados
-                orders = [order for order in all_orders if order.status == OrderStatus.PAID.value]
-            elif self.current_filter is None:
-                # Para "Todos" mostrar solo pedidos activos (excluyendo pagados)
-                orders = self.order_controller.get_active_orders()
-            else:
-                # Para otros filtros específicos, usar pedidos activos
-                all_orders = self.order_controller.get_active_orders()
-                # Aplicar filtro
-                orders = [order for order in all_orders if order.status == self.current_filter.value]
+            for order_id in changes['removed_ids']:
+                self.kitchen_orders.pop(order_id, None)
             
-            # Actualizar estadísticas (usar todos los pedidos para estadísticas completas)
-            stats_orders = self.order_controller.get_all_orders_for_kitchen()
-            self.update_statistics(stats_orders)
+            # Pedidos pagados que salieron de la ventana de días no generan cambios
+            window_start = self.order_controller.get_kitchen_window_start()
+            for order_id, order in list(self.kitchen_orders.items()):
+                if not self.order_controller.is_kitchen_visible(order, window_start):
+                    del self.kitchen_orders[order_id]
             
-            # Actualizar tiempo
-            current_time = datetime.now().strftime("%H:%M:%S")
+            # Pagos registrados que ya se ven aplicados (o que esperan demasiado)
+            now = time.monotonic()
+            for order_id, submitted_at in list(self.pending_payments.items()):
+                order = self.kitchen_orders.get(order_id)
+                if (order is None or order.status == OrderStatus.PAID.value
+                        or now - submitted_at > PAYMENT_PENDING_SECONDS):
+                    del self.pending_payments[order_id]
             
-            if not orders:
-                # Mostrar mensaje según filtro
-                if self.current_filter is not None:
-                    filter_names = {
-                        OrderStatus.PENDING: "pendientes",
-                        OrderStatus.PREPARING: "en preparación", 
-                        OrderStatus.READY: "listos",
-                        OrderStatus.DELIVERED: "entregados",
-                        OrderStatus.PAID: "pagados"
-                    }
-                    message = f"🔍 No hay pedidos {filter_names.get(self.current_filter, '')}"
-                else:
-                    message = "🎉 ¡No hay pedidos pendientes!"
-                
-                no_orders_label = QLabel(message)
-                no_orders_label.setAlignment(Qt.AlignCenter)
-                no_orders_label.setStyleSheet(f"""
-                    font-size: 18px;
-                    color: {ColorPalette.SUCCESS};
-                    font-weight: bold;
-                    padding: 20px;
-                """)
-                
-                self.orders_layout.addWidget(no_orders_label, 0, 0, 1, self.columns)  # Span across all columns
-                self.footer_info.setText(f"🏪 Sistema POS - Sin pedidos activos ({current_time})")
-            else:
-                # Mostrar pedidos en grid layout aprovechando el espacio horizontal
-                # Ordenar por prioridad
-                def get_priority(order):
-                    elapsed_minutes = (datetime.now() - order.created_at).total_seconds() / 60
-                    status_priority = {
-                        OrderStatus.DELIVERED: 1,
-                        OrderStatus.READY: 2,
-                        OrderStatus.PREPARING: 3,
-                        OrderStatus.PENDING: 4,
-                        OrderStatus.PAID: 5
-                    }.get(order.status, 6)
-                    
-                    # Solo aplicar factor de urgencia para estados activos de cocina
-                    if order.status in [OrderStatus.PENDING.value, OrderStatus.PREPARING.value, OrderStatus.READY.value]:
-                        urgency_factor = max(0, elapsed_minutes - 10) * 0.1
-                    else:
-                        # Para entregados y pagados, no aplicar urgencia
-                        urgency_factor = 0
-                    
-                    return (status_priority - urgency_factor, elapsed_minutes)
-                
-                sorted_orders = sorted(orders, key=get_priority)
-                
-                # Agregar tarjetas en grid layout
-                row, col = 0, 0
-                for order in sorted_orders:
-                    card = OrderCard(order)
-                    
-                    # Solo conectar señales si la tarjeta es interactiva (no pagada)
-                    if card.is_interactive:
-                        card.status_changed.connect(self.update_order_status)
-                        card.payment_requested.connect(self.handle_payment_request)
-                    
-                    self.orders_layout.addWidget(card, row, col)
-                    
-                    # Avanzar a la siguiente posición
-                    col += 1
-                    if col >= self.columns:
-                        col = 0
-                        row += 1
-                
-                self.footer_info.setText(f"🏪 Sistema POS - {len(orders)} pedidos mostrados ({current_time})")
-                
-        except Exception as e:
-            # Mostrar error
-            error_label = QLabel(f"❌ Error al cargar pedidos: {str(e)}")
-            error_label.setAlignment(Qt.AlignCenter)
-            error_label.setStyleSheet(f"""
-                font-size: 16px;
-                color: {ColorPalette.ERROR};
-                font-weight: bold;
-            """)
+            self.change_cursor = changes['cursor']
+            self.render_orders()
             
-            self.orders_layout.addWidget(error_label)
+        except Exception as e:
+            # Forzar instantánea completa en el siguiente intento
+            self.change_cursor = None
+            self.show_message(f"❌ Error al cargar pedidos: {str(e)}", ColorPalette.ERROR, 16)
             self.connection_status.setText("🔴 Error de conexión")
             self.connection_status.setStyleSheet(f"""
                 font-size: 10px;
@@ -882,6 +915,174 @@ class KitchenOrdersView(QWidget):
                 font-weight: bold;
             """)
     
+    def get_filtered_orders(self):
+        """Pedidos del estado local que corresponden al filtro actual"""
+        if self.current_filter == OrderStatus.PAID:
+            # Pedidos pagados recientes
+            return [order for order in self.kitchen_orders.values() if order.status == OrderStatus.PAID.value]
+        elif self.current_filter is None:
+            # Para "Todos" mostrar solo pedidos activos (excluyendo pagados)
+            return [order for order in self.kitchen_orders.values() if order.status != OrderStatus.PAID.value]
+        else:
+            return [order for order in self.kitchen_orders.values() if order.status == self.current_filter.value]
+    
+    def get_statistics_orders(self):
+        """Pedidos usados para estadísticas (mismo criterio que get_all_orders_for_kitchen)"""
+        window_start = self.order_controller.get_kitchen_window_start()
+        return [order for order in self.kitchen_orders.values() if order.created_at >= window_start]
+    
+    def show_message(self, message, color, font_size=18):
+        """Mostrar mensaje a lo ancho del grid en lugar de tarjetas"""
+        self.message_label.setText(message)
+        self.message_label.setStyleSheet(f"""
+            font-size: {font_size}px;
+            color: {color};
+            font-weight: bold;
+            padding: 20px;
+        """)
+        self.orders_layout.removeWidget(self.message_label)
+        self.orders_layout.addWidget(self.message_label, 0, 0, 1, max(1, self.columns))  # Span across all columns
+        self.message_label.show()
+    
+    def take_card(self, order_id):
+        """Sacar una tarjeta del grid sin destruirla"""
+        card = self.order_cards.get(order_id)
+        if card and self.card_positions.pop(order_id, None) is not None:
+            self.orders_layout.removeWidget(card)
+            card.hide()
+        return card
+    
+    def release_card(self, order_id):
+        """Devolver la tarjeta de un pedido al pool (o destruirla si está lleno)"""
+        card = self.take_card(order_id)
+        self.order_cards.pop(order_id, None)
+        if card is None:
+            return
+        if len(self.card_pool) < MAX_CARD_POOL:
+            self.card_pool.append(card)
+        else:
+            card.setParent(None)
+            card.deleteLater()
+    
+    def acquire_card(self, order):
+        """Obtener una tarjeta para un pedido, reutilizando una del pool si existe"""
+        if self.card_pool:
+            card = self.card_pool.pop()
+            card.set_order(order)
+        else:
+            card = OrderCard(order)
+            # Las tarjetas ignoran clics cuando no son interactivas (pagadas)
+            card.status_changed.connect(self.update_order_status)
+            card.payment_requested.connect(self.handle_payment_request)
+        self.order_cards[order.id] = card
+        return card
+    
+    def render_orders(self):
+        """Reconciliar las tarjetas del grid con el estado local de pedidos"""
+        # Recalcular número de columnas según el ancho actual de la ventana
+        self.columns = self.calculate_columns()
+        
+        # Liberar tarjetas de pedidos que ya no existen en el estado local
+        for order_id in list(self.order_cards):
+            if order_id not in self.kitchen_orders:
+                self.release_card(order_id)
+        
+        # Actualizar en sitio las tarjetas de pedidos que cambiaron
+        for order_id in self.changed_order_ids:
+            card = self.order_cards.get(order_id)
+            if card and order_id in self.kitchen_orders:
+                card.set_order(self.kitchen_orders[order_id])
+        self.changed_order_ids.clear()
+        
+        for order_id, card in self.order_cards.items():
+            card.set_payment_pending(order_id in self.pending_payments)
+        
+        orders = self.get_filtered_orders()
+        
+        # Actualizar estadísticas (usar todos los pedidos para estadísticas completas)
+        self.update_statistics(self.get_statistics_orders())
+        
+        # Actualizar tiempo
+        current_time = datetime.now().strftime("%H:%M:%S")
+        
+        # Sacar del grid las tarjetas que el filtro actual oculta
+        visible_ids = {order.id for order in orders}
+        for order_id in list(self.card_positions):
+            if order_id not in visible_ids:
+                self.take_card(order_id)
+        
+        if not orders:
+            # Mostrar mensaje según filtro
+            if self.current_filter is not None:
+                filter_names = {
+                    OrderStatus.PENDING: "pendientes",
+                    OrderStatus.PREPARING: "en preparación", 
+                    OrderStatus.READY: "listos",
+                    OrderStatus.DELIVERED: "entregados",
+                    OrderStatus.PAID: "pagados"
+                }
+                message = f"🔍 No hay pedidos {filter_names.get(self.current_filter, '')}"
+            else:
+                message = "🎉 ¡No hay pedidos pendientes!"
+            
+            self.show_message(message, ColorPalette.SUCCESS)
+            self.footer_info.setText(f"🏪 Sistema POS - Sin pedidos activos ({current_time})")
+            return
+        
+        self.orders_layout.removeWidget(self.message_label)
+        self.message_label.hide()
+        
+        # Mostrar pedidos en grid layout aprovechando el espacio horizontal
+        # Ordenar por prioridad
+        def get_priority(order):
+            elapsed_minutes = (datetime.now() - order.created_at).total_seconds() / 60
+            status_priority = {
+                OrderStatus.DELIVERED: 1,
+                OrderStatus.READY: 2,
+                OrderStatus.PREPARING: 3,
+                OrderStatus.PENDING: 4,
+                OrderStatus.PAID: 5
+            }.get(order.status, 6)
+            
+            # Solo aplicar factor de urgencia para estados activos de cocina
+            if order.status in [OrderStatus.PENDING.value, OrderStatus.PREPARING.value, OrderStatus.READY.value]:
+                urgency_factor = max(0, elapsed_minutes - 10) * 0.1
+            else:
+                # Para entregados y pagados, no aplicar urgencia
+                urgency_factor = 0
+            
+            return (status_priority - urgency_factor, elapsed_minutes)
+        
+        sorted_orders = sorted(orders, key=get_priority)
+        
+        # Calcular la posición de cada tarjeta en el grid
+        target_positions = {}
+        for index, order in enumerate(sorted_orders):
+            target_positions[order.id] = divmod(index, self.columns)
+        
+        # Sacar primero las tarjetas que cambian de posición para liberar celdas
+        for order_id, position in target_positions.items():
+            current = self.card_positions.get(order_id)
+            if current is not None and current != position:
+                self.orders_layout.removeWidget(self.order_cards[order_id])
+                del self.card_positions[order_id]
+        
+        # Ubicar tarjetas movidas o nuevas; las que no cambian quedan intactas
+        for order in sorted_orders:
+            card = self.order_cards.get(order.id)
+            if card is None:
+                card = self.acquire_card(order)
+            else:
+                card.update_elapsed_time()
+            
+            if order.id not in self.card_positions:
+                row, col = target_positions[order.id]
+                self.orders_layout.addWidget(card, row, col)
+                self.card_positions[order.id] = (row, col)
+                card.show()
+        
+        self.footer_info.setText(f"🏪 Sistema POS - {len(orders)} pedidos mostrados ({current_time})")
+    
     def update_order_status(self, order_id, new_status):
         """Actualizar estado de un pedido con feedback visual discreto"""
         try:
@@ -894,7 +1095,7 @@ class KitchenOrdersView(QWidget):
             """)
             
             self.order_controller.update_order_status(order_id, new_status)
-            self.load_orders()  # Recargar vista
+            self.refresh_orders()  # Aplicar cambios a la vista
             
             # Feedback de éxito discreto
             self.connection_status.setText("🟢 Conectado")
@@ -959,6 +1160,8 @@ class KitchenOrdersView(QWidget):
     
     def handle_payment_request(self, order_id):
         """Manejar solicitud de pago para una orden"""
+        if order_id in self.pending_payments:
+            return  # Ya hay un pago registrado esperando aplicarse
         try:
             # Obtener detalles de la orden
             order = self.order_controller.get_order_details(order_id)
@@ -981,15 +1184,19 @@ class KitchenOrdersView(QWidget):
             if dialog.exec_() == QDialog.Accepted:
                 customer_info = dialog.get_customer_info()
                 
-                # Procesar el pago
-                self.order_controller.complete_payment(order_id, customer_info['payment_method'])
+                # Procesar el pago; con el diario de escrituras se aplica en segundo plano
+                self.order_controller.submit_payment(order_id, customer_info['payment_method'])
+                self.pending_payments[order_id] = time.monotonic()
+                card = self.order_cards.get(order_id)
+                if card:
+                    card.set_payment_pending(True)
                 
                 # Intentar imprimir recibo térmico automáticamente
                 try:
                     printer = ThermalPrinter()
                     if printer.is_configured():
                         # Obtener orden actualizada con todos los items
-                        updated_order = self.order_controller.get_order_details(order_id)
+                        updated_order = self.order_controller.get_order_details(order_id, eager_items=True)
                         if updated_order and updated_order.items:
                             print_success = printer.print_receipt(updated_order, customer_info['payment_method'])
                             
@@ -1006,7 +1213,7 @@ class KitchenOrdersView(QWidget):
                     # Continuar sin interrumpir el flujo de pago
                 
                 # Actualizar la vista
-                self.load_orders()
+                self.refresh_orders()
                 
                 # Feedback discreto de pago exitoso
                 payment_methods = {
@@ -1035,7 +1242,7 @@ class KitchenOrdersView(QWidget):
             if not hasattr(self, 'resize_timer'):
                 self.resize_timer = QTimer()
                 self.resize_timer.setSingleShot(True)
-                self.resize_timer.timeout.connect(self.load_orders)
+                self.resize_timer.timeout.connect(self.render_orders)
             
             self.resize_timer.stop()
             self.resize_timer.start(500)  # Esperar 500ms después del último redimensionamiento
@@ -1046,8 +1253,6 @@ class KitchenOrdersView(QWidget):
         # Refrescar datos cada vez que se muestra la vista
         # Solo si ya se ha inicializado completamente
         if hasattr(self, 'order_controller'):
-            # Refrescar controlador para obtener datos más recientes
-            self.order_controller = OrderController()
-            # Recargar los pedidos con el filtro actual
-            self.load_orders()
+            # Aplicar cambios ocurridos mientras la vista estaba oculta
+            self.refresh_orders()
 
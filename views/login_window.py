@@ -15,10 +15,14 @@ class LoginWindow(QMainWindow):
     # Señales para comunicación
     login_successful = pyqtSignal(object)  # Emite el objeto usuario
     
-    def __init__(self):
+    def __init__(self, locked_user=None):
         super().__init__()
+        # Usuario de la sesión bloqueada (modo "bloquear y cambiar de usuario")
+        self.locked_user = locked_user
         self.auth_controller = AuthController()
         self.init_ui()
+        if locked_user is not None:
+            self.set_locked_mode(locked_user)
         
     def init_ui(self):
         """Configurar interfaz de usuario simplificada"""
@@ -54,6 +58,21 @@ class LoginWindow(QMainWindow):
         """)
         main_layout.addWidget(title_label)
         
+        # Aviso de sesión bloqueada (solo en modo cambio de usuario)
+        self.lock_label = QLabel()
+        self.lock_label.setAlignment(Qt.AlignCenter)
+        self.lock_label.setStyleSheet("""
+            QLabel {
+                font-size: 13px;
+                color: #1b263b;
+                background-color: #e0e1dd;
+                border-radius: 8px;
+                padding: 6px;
+            }
+        """)
+        self.lock_label.hide()
+        main_layout.addWidget(self.lock_label)
+        
         # Formulario compacto
         form_layout = QVBoxLayout()
         form_layout.setSpacing(15)  # Espaciado reducido
@@ -203,6 +222,16 @@ class LoginWindow(QMainWindow):
             }
         """)
     
+    def set_locked_mode(self, user):
+        """Mostrar la sesión bloqueada: el mismo usuario desbloquea u otro cambia de turno"""
+        self.setWindowTitle("Sesión Bloqueada")
+        self.setFixedSize(440, 480)
+        self.lock_label.setText(f"🔒 Sesión de {user.full_name} bloqueada\nIngresa para continuar o cambiar de usuario")
+        self.lock_label.show()
+        self.username_input.setText(user.username)
+        self.password_input.clear()
+        self.password_input.setFocus()
+    
     def center_window(self):
         """Centrar ventana en la pantalla"""
         screen = QApplication.desktop().screenGeometry()
@@ -224,13 +253,15 @@ class LoginWindow(QMainWindow):
         self.login_btn.setEnabled(False)
         self.login_btn.setText("🔄 Verificando...")
         
-        # Procesar login directamente
-        self.process_login(username, password)
+        # Verificar en un hilo de trabajo: PBKDF2 no debe congelar la ventana
+        self.auth_controller.login_async(
+            username, password,
+            on_result=self.process_login,
+            on_progress=self.login_btn.setText
+        )
     
-    def process_login(self, username, password):
-        """Procesar login con el controlador"""
-        success, user, message = self.auth_controller.login(username, password)
-        
+    def process_login(self, success, user, message):
+        """Procesar el resultado del login"""
         if success:
             # No mostrar mensaje, solo emitir señal directamente
             self.login_successful.emit(user)
@@ -4,6 +4,7 @@ from models.product import Product
 from models.category import Category
 from controllers.menu_controller import MenuController
 from utils.colors import ColorPalette, CommonStyles
+from utils.background_loader import BackgroundLoader
 from PyQt5.QtGui import QFont, QIcon, QPixmap, QColor
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from models.product import Product
@@ -294,6 +295,7 @@ class ProductFormDialog(QDialog):
         self.product = product
         self.is_edit = is_edit
         self.menu_ctrl = MenuController()
+        self.image_source = None  # Foto elegida para importar al guardar
         self.init_ui()
     
     def init_ui(self):
@@ -394,12 +396,19 @@ class ProductFormDialog(QDialog):
             """)
             return lbl
         
-        # Nombre (fila 0)
-        grid.addWidget(make_label("🍽️ Nombre del Producto"), 0, 0, 1, 4)
+        # Nombre y código SKU/PLU (fila 0)
+        grid.addWidget(make_label("🍽️ Nombre del Producto"), 0, 0, 1, 3)
+        grid.addWidget(make_label("🔖 Código / PLU"), 0, 3)
         self.name_input = QLineEdit()
         self.name_input.setPlaceholderText("E.g., Lomo Saltado, Torta de Chocolate...")
         self.style_input(self.name_input)
-        grid.addWidget(self.name_input, 1, 0, 1, 4)
+        grid.addWidget(self.name_input, 1, 0, 1, 3)
+        
+        self.sku_input = QLineEdit()
+        self.sku_input.setPlaceholderText("Opcional")
+        self.sku_input.setMaxLength(50)
+        self.style_input(self.sku_input)
+        grid.addWidget(self.sku_input, 1, 3)
         
         # Categoría y Tiempo de preparación (fila 2)
         grid.addWidget(make_label("📁 Categoría"), 2, 0, 1, 2)
@@ -458,6 +467,37 @@ class ProductFormDialog(QDialog):
         self.style_text_edit(self.description_input)
         grid.addWidget(self.description_input, 7, 0, 1, 4)
         
+        # Imagen (fila 8): la miniatura se genera al guardar
+        grid.addWidget(make_label("🖼️ Imagen"), 8, 0, 1, 4)
+        self.image_preview = QLabel("Sin imagen")
+        self.image_preview.setAlignment(Qt.AlignCenter)
+        self.image_preview.setFixedSize(72, 72)
+        self.image_preview.setStyleSheet(f"""
+            QLabel {{
+                font-size: 10px;
+                color: {ColorPalette.SILVER_LAKE_BLUE};
+                border: 1px dashed {ColorPalette.SILVER_LAKE_BLUE};
+                border-radius: 8px;
+            }}
+        """)
+        grid.addWidget(self.image_preview, 9, 0)
+        image_btn = QPushButton("📂 Elegir imagen...")
+        image_btn.setStyleSheet(f"""
+            QPushButton {{
+                padding: 5px 7px;
+                border: 2px solid {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.3)};
+                border-radius: 8px;
+                font-size: 12px;
+                background-color: {ColorPalette.PLATINUM};
+                color: {ColorPalette.RICH_BLACK};
+            }}
+            QPushButton:hover {{
+                border-color: {ColorPalette.YINMN_BLUE};
+            }}
+        """)
+        image_btn.clicked.connect(self.choose_image)
+        grid.addWidget(image_btn, 9, 1, 1, 3)
+        
         # Ajustes de columnas para mejor proporción
         grid.setColumnStretch(0, 2) # Precio
         grid.setColumnStretch(1, 2) # Costo
@@ -628,6 +668,7 @@ class ProductFormDialog(QDialog):
     def load_product_data(self):
         """Cargar datos del producto para edición"""
         self.name_input.setText(self.product.name)
+        self.sku_input.setText(self.product.sku or "")
         self.description_input.setPlainText(self.product.description or "")
         self.price_input.setValue(float(self.product.price))
         self.cost_input.setValue(float(self.product.cost) if self.product.cost else 0.0)
@@ -643,6 +684,34 @@ class ProductFormDialog(QDialog):
         # Solo cargar estado activo si estamos editando
         if hasattr(self, 'active_checkbox'):
             self.active_checkbox.setChecked(self.product.is_active)
+        
+        if self.product.image_path:
+            from utils.image_cache import get_pixmap_cache
+            get_pixmap_cache().request(self.product.image_path, self.show_image_preview)
+    
+    def choose_image(self):
+        """Elegir una foto del producto"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Elegir imagen", "", "Imágenes (*.png *.jpg *.jpeg *.bmp *.webp)"
+        )
+        if not path:
+            return
+        self.image_source = path
+        # Vista previa reducida al decodificar, sin cargar la foto completa
+        from utils.image_cache import decode_scaled
+        try:
+            self.show_image_preview(QPixmap.fromImage(decode_scaled(path, self.image_preview.width())))
+        except Exception as e:
+            self.image_source = None
+            QMessageBox.warning(self, "Error", f"No se pudo leer la imagen:\n{str(e)}")
+    
+    def show_image_preview(self, pixmap):
+        """Mostrar la miniatura en el formulario"""
+        if pixmap is None:
+            return
+        self.image_preview.setPixmap(pixmap.scaled(
+            self.image_preview.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
+        ))
     
     def save_product(self):
         """Guardar producto"""
@@ -652,6 +721,7 @@ class ProductFormDialog(QDialog):
         cost = self.cost_input.value() if self.cost_input.value() > 0 else None
         prep_time = self.prep_time_input.value() if self.prep_time_input.value() > 0 else None
         stock = self.stock_input.value()
+        sku = self.sku_input.text().strip()
         category_id = self.category_combo.currentData()
         
         if not name:
@@ -678,7 +748,9 @@ class ProductFormDialog(QDialog):
                     category_id=category_id,
                     preparation_time=prep_time,
                     stock=stock,
-                    is_active=is_active
+                    is_active=is_active,
+                    image_source=self.image_source,
+                    sku=sku
                     # Removido is_featured - se maneja automáticamente por el sistema
                 )
             else:
@@ -690,7 +762,9 @@ class ProductFormDialog(QDialog):
                     description=description or None,
                     cost=cost,
                     preparation_time=prep_time,
-                    stock=stock
+                    stock=stock,
+                    image_source=self.image_source,
+                    sku=sku or None
                     # Removido is_featured - el algoritmo decidirá después
                 )
             
@@ -713,6 +787,8 @@ class MenuManagementWidget(QWidget):
         super().__init__()
         self.current_user = user
         self.menu_ctrl = MenuController()
+        # Estadísticas en segundo plano: el dashboard conserva los valores anteriores
+        self.loader = BackgroundLoader(self)
         
         # Referencias a las vistas para poder actualizarlas
         self.categories_view = None
@@ -1077,15 +1153,33 @@ class MenuManagementWidget(QWidget):
         return widget
     
     def load_data(self):
-        """Cargar todos los datos"""
-        self.load_stats()
-        self.load_best_selling()
+        """Cargar todos los datos (en segundo plano)"""
+        self.loader.submit(
+            "dashboard",
+            self.fetch_dashboard_data,
+            on_result=self.show_dashboard_data,
+            on_error=lambda error: print(f"Error cargando datos del menú: {error}")
+        )
     
-    def load_stats(self):
-        """Cargar estadísticas del menú"""
+    def fetch_dashboard_data(self):
+        """Consultar estadísticas y más vendidos (se ejecuta en el pool)"""
         try:
             stats = self.menu_ctrl.get_menu_statistics()
-            
+            best_selling = self.menu_ctrl.get_best_selling_products(limit=2)  # Solo los 2 primeros
+            return stats, best_selling
+        finally:
+            # Cerrar la sesión del hilo del pool para ver datos frescos en la próxima carga
+            self.menu_ctrl.reset_session()
+    
+    def show_dashboard_data(self, data):
+        """Mostrar los datos recibidos del pool"""
+        stats, best_selling = data
+        self.show_stats(stats)
+        self.show_best_selling(best_selling)
+    
+    def show_stats(self, stats):
+        """Mostrar estadísticas del menú"""
+        try:
             # Limpiar grid anterior
             for i in reversed(range(self.stats_grid.count())):
                 self.stats_grid.itemAt(i).widget().setParent(None)
@@ -1104,11 +1198,9 @@ class MenuManagementWidget(QWidget):
         except Exception as e:
             print(f"Error cargando estadísticas: {e}")
     
-    def load_best_selling(self):
-        """Cargar productos más vendidos"""
+    def show_best_selling(self, best_selling):
+        """Mostrar productos más vendidos"""
         try:
-            best_selling = self.menu_ctrl.get_best_selling_products(limit=2)  # Solo los 2 primeros
-            
             # Limpiar contenedor anterior
             for i in reversed(range(self.products_container.count())):
                 child = self.products_container.itemAt(i).widget()
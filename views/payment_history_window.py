@@ -10,6 +10,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt5.QtCore import Qt, pyqtSignal, QDate, QThread, pyqtSlot
 from PyQt5.QtGui import QFont, QIcon, QColor
 from controllers.payment_controller import PaymentController
+from utils.background_loader import BackgroundLoader
 from models.order import OrderStatus
 from utils.colors import ColorPalette, CommonStyles
 
@@ -406,6 +407,8 @@ class PaymentHistoryView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.payment_controller = PaymentController()
+        # Consultas en segundo plano: la tabla conserva la página anterior hasta recibir la nueva
+        self.loader = BackgroundLoader(self)
         self.current_page = 1
         self.page_size = 15  # Reducido para mejor rendimiento visual
         self.current_orders = []
@@ -415,8 +418,8 @@ class PaymentHistoryView(QWidget):
     
     def refresh_data(self):
         """Refrescar datos del historial - método público para llamar desde fuera"""
-        # Refrescar controlador para obtener datos más recientes de la BD
-        self.payment_controller = PaymentController()
+        # Nueva sesión para obtener datos más recientes de la BD
+        self.payment_controller.reset_session()
         self.current_page = 1  # Resetear a primera página
         self.load_payment_history()
     
@@ -430,9 +433,7 @@ class PaymentHistoryView(QWidget):
         # Refrescar datos cada vez que se muestra la vista
         # Solo si ya se ha inicializado completamente
         if hasattr(self, 'payment_controller'):
-            # Refrescar controlador para obtener datos más recientes
-            self.payment_controller = PaymentController()
-            # Resetear a primera página y refrescar
+            # Resetear a primera página y refrescar con una sesión nueva
             self.current_page = 1
             self.refresh_data()
     
@@ -1137,16 +1138,33 @@ class PaymentHistoryView(QWidget):
         end_date = self.end_date.date().toPyDate()
         search_term = self.search_input.text().strip() or None
         
+        # Una búsqueda o página nueva reemplaza a la consulta pendiente
+        self.loader.submit(
+            "payment_history",
+            self.fetch_payment_history, start_date, end_date, search_term, self.current_page,
+            on_result=self.show_payment_history,
+            on_error=self.show_load_error
+        )
+    
+    def fetch_payment_history(self, start_date, end_date, search_term, page):
+        """Consultar una página del historial (se ejecuta en el pool)"""
         try:
-            # Obtener datos
-            result = self.payment_controller.get_payment_history(
+            return self.payment_controller.get_payment_history(
                 start_date=start_date,
                 end_date=end_date,
                 search_term=search_term,
-                page=self.current_page,
-                page_size=self.page_size
+                page=page,
+                page_size=self.page_size,
+                eager_items=True  # Detalle y exportación sin consultas por item
             )
-            
+        finally:
+            # Cerrar la sesión del hilo del pool: la próxima consulta ve los datos más recientes
+            # y las órdenes (con items ya cargados) quedan desconectadas para la UI
+            self.payment_controller.reset_session()
+    
+    def show_payment_history(self, result):
+        """Mostrar la página recibida del pool"""
+        try:
             self.current_orders = result['orders']
             
             # Actualizar tabla
@@ -1168,19 +1186,23 @@ class PaymentHistoryView(QWidget):
             """)
             
         except Exception as e:
-            # Mostrar estado de error compacto
-            self.table_status.setText("❌")
-            self.table_status.setStyleSheet(f"""
-                color: {ColorPalette.ERROR};
-                font-size: 13px;  # Aumentado +4 según nueva petición
-                font-weight: bold;
-                padding: 2px 4px;
-                background-color: {ColorPalette.with_alpha(ColorPalette.ERROR, 0.1)};
-                border-radius: 3px;
-                border: 1px solid {ColorPalette.with_alpha(ColorPalette.ERROR, 0.3)};
-            """)
-            self.pagination_info.setText(f"Error: {str(e)}")
-            print(f"Error cargando historial: {e}")
+            self.show_load_error(str(e))
+    
+    def show_load_error(self, error):
+        """Mostrar estado de error; la tabla conserva los datos anteriores"""
+        # Mostrar estado de error compacto
+        self.table_status.setText("❌")
+        self.table_status.setStyleSheet(f"""
+            color: {ColorPalette.ERROR};
+            font-size: 13px;  # Aumentado +4 según nueva petición
+            font-weight: bold;
+            padding: 2px 4px;
+            background-color: {ColorPalette.with_alpha(ColorPalette.ERROR, 0.1)};
+            border-radius: 3px;
+            border: 1px solid {ColorPalette.with_alpha(ColorPalette.ERROR, 0.3)};
+        """)
+        self.pagination_info.setText(f"Error: {error}")
+        print(f"Error cargando historial: {error}")
     
     def update_table(self, orders):
         """Actualizar contenido de la tabla con diseño optimizado para laptop sin solapamiento"""
@@ -1280,8 +1302,8 @@ class PaymentHistoryView(QWidget):
     
     def search_payments(self):
         """Buscar pagos con filtros actuales"""
-        # Refrescar controlador para obtener datos más recientes
-        self.payment_controller = PaymentController()
+        # Nueva sesión para obtener datos más recientes
+        self.payment_controller.reset_session()
         self.current_page = 1  # Resetear a primera página
         self.load_payment_history()
     
@@ -1,15 +1,20 @@
 # views/pos_window.py
 import sys
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
-                             QLabel, QPushButton, QFrame, QGridLayout, QScrollArea,
+                             QLabel, QPushButton, QFrame, QScrollArea,
                              QComboBox, QApplication, QDialog, QFormLayout, QLineEdit,
                              QSpinBox, QStackedWidget, QMessageBox, QSizePolicy)
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from controllers.product_controller import ProductController
+from controllers.catalog_cache import catalog_cache
+from views.product_grid import ProductGrid
+from views.cart_model import CartModel
 from controllers.order_controller import OrderController
 from utils.printer import ReceiptPrinter
+from utils.write_journal import get_write_journal
 from utils.colors import ColorPalette, CommonStyles
+from utils import sql_trace
 
 class ModernButton(QPushButton):
     """Botón personalizado con efectos hover"""
@@ -38,10 +43,11 @@ class CartItemWidget(QWidget):
     quantity_changed = pyqtSignal(int, int)  # product_id, new_quantity
     item_removed = pyqtSignal(int)  # product_id
     
-    def __init__(self, product, quantity):
+    def __init__(self, product, quantity, subtotal):
         super().__init__()
         self.product = product
         self.quantity = quantity
+        self.subtotal = subtotal
         self.init_ui()
     
     def init_ui(self):
@@ -109,7 +115,7 @@ class CartItemWidget(QWidget):
         controls_layout.addStretch()
         
         # Precio
-        self.price_label = QLabel(f"$ {self.product.price * self.quantity:,.0f}")
+        self.price_label = QLabel(f"$ {self.subtotal:,.0f}")
         self.price_label.setStyleSheet(f"font-weight: bold; color: {ColorPalette.SUCCESS}; font-size: 11px;")
         self.price_label.setFixedWidth(55)
         self.price_label.setAlignment(Qt.AlignCenter)
@@ -153,18 +159,18 @@ class CartItemWidget(QWidget):
             }}
         """)
     
+    def set_quantity(self, quantity, subtotal):
+        """Actualizar cantidad y subtotal mostrados (los cambia el modelo del carrito)"""
+        self.quantity = quantity
+        self.qty_label.setText(str(quantity))
+        self.price_label.setText(f"$ {subtotal:,.0f}")
+    
     def increase_quantity(self):
-        self.quantity += 1
-        self.qty_label.setText(str(self.quantity))
-        self.price_label.setText(f"$ {self.product.price * self.quantity:,.0f}")
-        self.quantity_changed.emit(self.product.id, self.quantity)
+        self.quantity_changed.emit(self.product.id, self.quantity + 1)
     
     def decrease_quantity(self):
         if self.quantity > 1:
-            self.quantity -= 1
-            self.qty_label.setText(str(self.quantity))
-            self.price_label.setText(f"$ {self.product.price * self.quantity:,.0f}")
-            self.quantity_changed.emit(self.product.id, self.quantity)
+            self.quantity_changed.emit(self.product.id, self.quantity - 1)
 
 class CustomerInfoDialog(QDialog):
     """Dialog para capturar información del cliente y método de pago"""
@@ -425,13 +431,17 @@ class POSWindow(QMainWindow):
     
     # Señales para comunicación con el controlador principal
     logout_requested = pyqtSignal()
+    lock_requested = pyqtSignal()
     
     def __init__(self):
         super().__init__()
+        self.current_user = None
         self.product_controller = ProductController()
         self.order_controller = OrderController()
         self.printer = ReceiptPrinter()
-        self.cart_items = {}  # Cambiar a dict para mejor manejo
+        # Modelo del carrito: la vista solo toca la fila afectada por cada cambio
+        self.cart = CartModel(self)
+        self.cart_rows = {}  # product_id -> CartItemWidget
         
         # Stack widget para manejar las vistas
         self.stack_widget = QStackedWidget()
@@ -448,6 +458,14 @@ class POSWindow(QMainWindow):
         # Agregar vista POS al stack
         self.stack_widget.addWidget(self.pos_view)
         
+        # Redibujar cuando cambie el catálogo (en esta terminal o, vía catalog_version, en otra)
+        catalog_cache.subscribe(self.on_catalog_changed)
+        self.catalog_timer = QTimer(self)
+        self.catalog_timer.timeout.connect(catalog_cache.ensure_fresh)
+        # Avisar en la UI de órdenes o pagos del diario de escrituras que no se pudieron aplicar
+        self.catalog_timer.timeout.connect(self.check_write_journal_failures)
+        self.catalog_timer.start(int(catalog_cache.check_interval * 1000) or 5000)
+        
     def init_ui(self):
         self.setWindowTitle("🍔 POS - Restaurante FastFood")
         
@@ -545,7 +563,27 @@ class POSWindow(QMainWindow):
         
         header_layout.addWidget(title_container)
         
-        header_layout.addStretch()
+        # Búsqueda por nombre, descripción o código (también recibe el lector de códigos de barras)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Buscar producto o escanear código...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setMinimumHeight(32)
+        self.search_input.setStyleSheet(f"""
+            QLineEdit {{
+                padding: 4px 10px;
+                border: 2px solid {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.4)};
+                border-radius: 8px;
+                font-size: 13px;
+                background-color: #ffffff;
+                color: {ColorPalette.RICH_BLACK};
+            }}
+            QLineEdit:focus {{
+                border-color: {ColorPalette.YINMN_BLUE};
+            }}
+        """)
+        self.search_input.textChanged.connect(lambda _text: self.load_products())
+        self.search_input.returnPressed.connect(self.on_search_submitted)
+        header_layout.addWidget(self.search_input, 1)
         
         # Botón abrir cocina (estilo unificado)
         kitchen_btn = QPushButton("👨‍🍳 Cocina")
@@ -607,6 +645,26 @@ class POSWindow(QMainWindow):
             }}
         """)
         logout_btn.clicked.connect(self.handle_logout)
+        
+        # Botón bloquear / cambiar de usuario (conserva la ventana y sus datos)
+        lock_btn = QPushButton("🔒 Bloquear")
+        lock_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {ColorPalette.SILVER_LAKE_BLUE};
+                color: #ffffff;
+                border: none;
+                padding: 6px 9px;
+                border-radius: 8px;
+                font-weight: bold;
+                font-size: 12px;
+                min-height: 25px;
+            }}
+            QPushButton:hover {{
+                background-color: {ColorPalette.YINMN_BLUE};
+            }}
+        """)
+        lock_btn.clicked.connect(self.lock_requested.emit)
+        header_layout.addWidget(lock_btn)
         header_layout.addWidget(logout_btn)
         
         layout.addLayout(header_layout)
@@ -693,12 +751,19 @@ class POSWindow(QMainWindow):
         categories_scroll.setWidget(categories_frame)
         layout.addWidget(categories_scroll)
         
-        # Área de productos con scroll mejorado
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        scroll.setStyleSheet(f"""
+        # Área de productos: grilla virtualizada (solo construye los botones visibles)
+        # Espaciado optimizado para 1366x768
+        if self.screen_width <= 1366:
+            spacing = 10  # Espaciado óptimo para 4 columnas
+            margin = 10   # Márgenes ajustados
+        else:
+            spacing = 12  # Espaciado estándar para pantallas más grandes
+            margin = 15
+        
+        self.product_grid = ProductGrid(spacing=spacing, margin=margin, compact=self.is_small_screen)
+        self.product_grid.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.product_grid.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.product_grid.setStyleSheet(f"""
             QScrollArea {{
                 border: none;
                 background-color: transparent;
@@ -718,24 +783,8 @@ class POSWindow(QMainWindow):
                 background-color: {ColorPalette.OXFORD_BLUE};
             }}
         """)
-        
-        self.products_widget = QWidget()
-        self.products_layout = QGridLayout(self.products_widget)
-        
-        # Espaciado optimizado para 1366x768
-        if self.screen_width <= 1366:
-            spacing = 10  # Espaciado óptimo para 4 columnas
-            margin = 10   # Márgenes ajustados
-        else:
-            spacing = 12  # Espaciado estándar para pantallas más grandes
-            margin = 15
-        
-        self.products_layout.setSpacing(spacing)
-        self.products_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.products_layout.setContentsMargins(margin, margin, margin, margin)
-        
-        scroll.setWidget(self.products_widget)
-        layout.addWidget(scroll)
+        self.product_grid.product_clicked.connect(self.add_to_cart)
+        layout.addWidget(self.product_grid)
         
         return panel
     
@@ -823,6 +872,23 @@ class POSWindow(QMainWindow):
         self.cart_layout.setSpacing(4)  # Espaciado reducido
         self.cart_layout.setContentsMargins(3, 3, 3, 3)  # Márgenes reducidos
         
+        # Mensaje de carrito vacío (se oculta mientras haya líneas)
+        self.cart_empty_label = QLabel("🛒 Carrito vacío\nAgrega productos del menú")
+        self.cart_empty_label.setAlignment(Qt.AlignCenter)
+        self.cart_empty_label.setStyleSheet(f"""
+            color: {ColorPalette.SILVER_LAKE_BLUE};
+            font-size: 16px;
+            font-weight: bold;
+            padding: 40px;
+        """)
+        self.cart_layout.addWidget(self.cart_empty_label)
+        
+        self.cart.line_inserted.connect(self.on_cart_line_inserted)
+        self.cart.line_updated.connect(self.on_cart_line_updated)
+        self.cart.line_removed.connect(self.on_cart_line_removed)
+        self.cart.cleared.connect(self.update_cart_display)
+        self.cart.totals_changed.connect(self.on_cart_totals_changed)
+        
         cart_scroll.setWidget(self.cart_container)
         layout.addWidget(cart_scroll)
         
@@ -898,7 +964,7 @@ class POSWindow(QMainWindow):
     
     def load_categories(self):
         """Cargar categorías como botones"""
-        categories = self.product_controller.get_all_categories()
+        categories = catalog_cache.get_categories()
         
         category_icons = {
             "Hamburguesas": "🍔",
@@ -923,6 +989,12 @@ class POSWindow(QMainWindow):
             
         categories_layout = categories_frame.layout()
         
+        # Quitar botones de una carga anterior (se conserva "Todas")
+        for btn in self.category_buttons[1:]:
+            categories_layout.removeWidget(btn)
+            btn.deleteLater()
+        del self.category_buttons[1:]
+        
         # Estilo para botones de categorías con tamaño responsivo y fijo
         padding = "8px 12px" if self.is_small_screen else "10px 16px"
         font_size = 12 if self.is_small_screen else 13
@@ -967,6 +1039,7 @@ class POSWindow(QMainWindow):
             
             btn = QPushButton(btn_text)
             btn.setCheckable(True)
+            btn.setChecked(category.id == self.selected_category_id)
             btn.setStyleSheet(category_button_style)
             btn.setMinimumWidth(min_width)
             btn.setFixedHeight(40)
@@ -981,6 +1054,36 @@ class POSWindow(QMainWindow):
         # Cargar todos los productos por defecto
         self.load_products()
     
+    def on_catalog_changed(self):
+        """Reconstruir categorías y productos con el catálogo actualizado"""
+        # La categoría seleccionada pudo desactivarse o eliminarse
+        if self.selected_category_id is not None and not any(
+            category.id == self.selected_category_id for category in catalog_cache.get_categories()
+        ):
+            self.selected_category_id = None
+        self.category_buttons[0].setChecked(self.selected_category_id is None)
+        self.load_categories()
+    
+    def check_write_journal_failures(self):
+        """Mostrar las intenciones del diario de escrituras que fallaron al aplicarse"""
+        journal = get_write_journal()
+        if journal is None:
+            return
+        failures = journal.take_failures()
+        if not failures:
+            return
+        names = {'create_order': "Orden", 'complete_payment': "Pago"}
+        lines = [f"• {names.get(entry.kind, entry.kind)} de las {entry.recorded_at:%H:%M}: {error[:120]}"
+                 for entry, error in failures[:5]]
+        if len(failures) > 5:
+            lines.append(f"• ... y {len(failures) - 5} más")
+        QMessageBox.warning(
+            self, "Escrituras no aplicadas",
+            f"{len(failures)} registro(s) no se pudieron guardar en la base de datos:\n\n"
+            + "\n".join(lines)
+            + f"\n\nQuedaron en {journal.path}.failed para revisión."
+        )
+    
     def select_category(self, category_id, button):
         """Seleccionar una categoría y actualizar productos"""
         # Desmarcar todos los botones
@@ -991,130 +1094,55 @@ class POSWindow(QMainWindow):
         button.setChecked(True)
         self.selected_category_id = category_id
         
+        # Elegir categoría termina la búsqueda en curso
+        if self.search_input.text():
+            self.search_input.blockSignals(True)
+            self.search_input.clear()
+            self.search_input.blockSignals(False)
+        
         # Cargar productos de la categoría
         self.load_products()
     
+    @sql_trace.traced_refresh("POSWindow.load_products")
     def load_products(self):
-        """Cargar productos según la categoría seleccionada con grid responsivo"""
-        # Limpiar productos actuales
-        for i in reversed(range(self.products_layout.count())):
-            child = self.products_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        # Obtener productos
-        if self.selected_category_id is None:
-            products = self.product_controller.get_all_products()
+        """Mostrar los resultados de la búsqueda o los productos de la categoría seleccionada"""
+        query = self.search_input.text().strip()
+        if query:
+            # Índice en memoria: sin consultas a la base de datos por tecla
+            products = catalog_cache.search(query)
         else:
-            products = self.product_controller.get_products_by_category(self.selected_category_id)
-        
-        # Usar la función optimizada para calcular columnas
-        columns = self.get_optimal_columns()
-        
-        # Mostrar productos en grid responsivo
-        row, col = 0, 0
-        
-        for product in products:
-            btn = self.create_product_button(product)
-            self.products_layout.addWidget(btn, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+            products = catalog_cache.get_products(self.selected_category_id)
+        self.product_grid.set_products(products)
     
-    def create_product_button(self, product):
-        """Crear botón de producto con diseño responsivo optimizado"""
-        container = QFrame()
-        
-        # Calcular tamaño de botón basado en el ancho disponible actual
-        current_width = self.width()
-        available_width = int(current_width * 0.75) - 40  # 75% menos márgenes
-        columns = self.get_optimal_columns()
-        
-        # Calcular ancho óptimo por botón
-        spacing = 10 if self.is_small_screen else 12
-        button_width = max(200, (available_width - (spacing * (columns - 1))) // columns)
-        
-        # Ajustar altura proporcionalmente
-        if self.is_small_screen:
-            button_height = min(150, int(button_width * 0.5))  # Relación 2:1
-            font_size_name = 12
-            font_size_price = 15
-            padding_container = 8
-            padding_name = 5
-        else:
-            button_height = min(160, int(button_width * 0.55))  # Relación 1.8:1
-            font_size_name = 14
-            font_size_price = 16
-            padding_container = 10
-            padding_name = 6
-        
-        container.setFixedSize(button_width, button_height)
-        container.setStyleSheet(f"""
-            QFrame {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                           stop:0 {ColorPalette.PLATINUM},
-                           stop:1 {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.1)});
-                border: 2px solid {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.3)};
-                border-radius: 12px;
-                padding: {padding_container}px;
-            }}
-            QFrame:hover {{
-                border: 2px solid {ColorPalette.YINMN_BLUE};
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                           stop:0 {ColorPalette.with_alpha(ColorPalette.YINMN_BLUE, 0.1)},
-                           stop:1 {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.2)});
-            }}
-        """)
-        
-        layout = QVBoxLayout(container)
-        layout.setSpacing(4)
-        layout.setContentsMargins(padding_container, padding_container, padding_container, padding_container)
-        
-        
-        # Nombre del producto
-        name_label = QLabel(product.name)
-        name_label.setAlignment(Qt.AlignCenter)
-        name_label.setWordWrap(True)
-        name_label.setStyleSheet(f"""
-            font-size: {font_size_name}px;
-            font-weight: bold;
-            color: {ColorPalette.RICH_BLACK};
-            padding: {padding_name}px;
-            background: transparent;
-        """)
-        layout.addWidget(name_label)
-        
-        # Precio
-        price_label = QLabel(f"$ {product.price:,.0f}")
-        price_label.setAlignment(Qt.AlignCenter)
-        price_label.setStyleSheet(f"""
-            font-size: {font_size_price}px;
-            font-weight: bold;
-            color: {ColorPalette.SUCCESS};
-            background: {ColorPalette.with_alpha(ColorPalette.SUCCESS, 0.1)};
-            border-radius: 8px;
-            padding: 6px;
-        """)
-        layout.addWidget(price_label)
-        
-        # Hacer clickeable todo el contenedor
-        container.mousePressEvent = lambda event: self.add_to_cart(product)
-        container.setCursor(Qt.PointingHandCursor)
-        
-        return container
+    def on_search_submitted(self):
+        """Enter en la búsqueda: código exacto (lector de códigos de barras) o resultado único"""
+        query = self.search_input.text().strip()
+        if not query:
+            return
+        product = catalog_cache.get_product_by_code(query)
+        if product is None:
+            results = catalog_cache.search(query, limit=2)
+            product = results[0] if len(results) == 1 else None
+        if product is None:
+            QApplication.beep()
+            self.search_input.selectAll()
+            return
+        self.add_to_cart(product)
+        self.search_input.clear()
+    
+    def keyPressEvent(self, event):
+        """Redirigir a la búsqueda el texto que no tomó otro widget (lector de códigos de barras)"""
+        text = event.text()
+        if text and text.isprintable() and not self.search_input.hasFocus() \
+                and self.stack_widget.currentWidget() is self.pos_view:
+            self.search_input.setFocus()
+            self.search_input.insert(text)
+            return
+        super().keyPressEvent(event)
     
     def add_to_cart(self, product):
         """Agregar producto al carrito"""
-        if product.id in self.cart_items:
-            self.cart_items[product.id]['quantity'] += 1
-        else:
-            self.cart_items[product.id] = {
-                'product': product,
-                'quantity': 1
-            }
-        
-        self.update_cart_display()
+        self.cart.add(product)
         
         # Animación visual del botón
         self.animate_add_to_cart()
@@ -1124,65 +1152,61 @@ class POSWindow(QMainWindow):
         # Aquí podrías agregar una animación más elaborada
         pass
     
-    def update_cart_display(self):
-        """Actualizar la visualización del carrito"""
-        # Limpiar items actuales
-        for i in reversed(range(self.cart_layout.count())):
-            child = self.cart_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        total = 0
-        total_items = 0
-        
-        # Agregar items del carrito
-        for item_data in self.cart_items.values():
-            product = item_data['product']
-            quantity = item_data['quantity']
-            
-            # Crear widget del item
-            item_widget = CartItemWidget(product, quantity)
-            item_widget.quantity_changed.connect(self.update_item_quantity)
-            item_widget.item_removed.connect(self.remove_item)
-            
-            self.cart_layout.addWidget(item_widget)
-            
-            # Calcular totales
-            subtotal = product.price * quantity
-            total += subtotal
-            total_items += quantity
-        
-        # Actualizar labels de totales
+    def create_cart_row(self, line):
+        """Crear el widget de una línea del carrito"""
+        item_widget = CartItemWidget(line.product, line.quantity, line.subtotal)
+        item_widget.quantity_changed.connect(self.update_item_quantity)
+        item_widget.item_removed.connect(self.remove_item)
+        self.cart_rows[line.product.id] = item_widget
+        return item_widget
+    
+    def on_cart_line_inserted(self, product_id, row):
+        """Agregar solo la fila nueva"""
+        self.cart_empty_label.hide()
+        self.cart_layout.insertWidget(row, self.create_cart_row(self.cart.line(product_id)))
+    
+    def on_cart_line_updated(self, product_id):
+        """Actualizar cantidad y subtotal de una fila"""
+        line = self.cart.line(product_id)
+        self.cart_rows[product_id].set_quantity(line.quantity, line.subtotal)
+    
+    def on_cart_line_removed(self, product_id):
+        """Quitar solo la fila eliminada"""
+        item_widget = self.cart_rows.pop(product_id, None)
+        if item_widget is not None:
+            self.cart_layout.removeWidget(item_widget)
+            item_widget.deleteLater()
+        self.cart_empty_label.setVisible(not self.cart)
+    
+    def on_cart_totals_changed(self, total, total_items):
+        """Actualizar labels de totales"""
         self.items_count_label.setText(f"{total_items} producto{'s' if total_items != 1 else ''}")
         self.total_label.setText(f"Total: ${total:,.0f}")
+    
+    def update_cart_display(self):
+        """Reconstruir todas las filas del carrito desde el modelo"""
+        for item_widget in self.cart_rows.values():
+            self.cart_layout.removeWidget(item_widget)
+            item_widget.deleteLater()
+        self.cart_rows.clear()
         
-        # Mostrar mensaje si carrito vacío
-        if not self.cart_items:
-            empty_label = QLabel("🛒 Carrito vacío\nAgrega productos del menú")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet(f"""
-                color: {ColorPalette.SILVER_LAKE_BLUE};
-                font-size: 16px;
-                font-weight: bold;
-                padding: 40px;
-            """)
-            self.cart_layout.addWidget(empty_label)
+        for row, line in enumerate(self.cart):
+            self.cart_layout.insertWidget(row, self.create_cart_row(line))
+        
+        self.cart_empty_label.setVisible(not self.cart)
+        self.on_cart_totals_changed(self.cart.total, self.cart.item_count)
     
     def update_item_quantity(self, product_id, new_quantity):
         """Actualizar cantidad de un item"""
-        if product_id in self.cart_items:
-            self.cart_items[product_id]['quantity'] = new_quantity
-            self.update_cart_display()
+        self.cart.set_quantity(product_id, new_quantity)
     
     def remove_item(self, product_id):
         """Remover item del carrito"""
-        if product_id in self.cart_items:
-            del self.cart_items[product_id]
-            self.update_cart_display()
+        self.cart.remove(product_id)
     
     def clear_cart(self):
         """Limpiar carrito completo"""
-        if self.cart_items:
+        if self.cart:
             reply = QMessageBox.question(
                 self, 'Confirmar', 
                 '¿Estás seguro de que quieres limpiar el carrito?',
@@ -1191,17 +1215,16 @@ class POSWindow(QMainWindow):
             )
             
             if reply == QMessageBox.Yes:
-                self.cart_items.clear()
-                self.update_cart_display()
+                self.cart.clear()
     
     def create_order(self):
         """Crear orden pendiente (sin pago)"""
-        if not self.cart_items:
+        if not self.cart:
             QMessageBox.warning(self, "Carrito Vacío", "Agrega productos antes de crear la orden")
             return
         
-        # Calcular total
-        total = sum(item_data['product'].price * item_data['quantity'] for item_data in self.cart_items.values())
+        # Total acumulado por el modelo del carrito
+        total = self.cart.total
         
         # Dialog para información del cliente (sin método de pago)
         dialog = CustomerInfoDialog(total, self, payment_required=False)
@@ -1209,24 +1232,15 @@ class POSWindow(QMainWindow):
             customer_info = dialog.get_customer_info()
             
             try:
-                # Convertir carrito a formato para el controlador
-                order_items = []
-                for item_data in self.cart_items.values():
-                    order_items.append({
-                        'product_id': item_data['product'].id,
-                        'quantity': item_data['quantity']
-                    })
-                
-                # Crear orden (estado PENDING por defecto)
-                order = self.order_controller.create_order(
-                    order_items, 
+                # Crear orden (estado PENDING por defecto); con el diario de escrituras se aplica en segundo plano
+                self.order_controller.submit_order(
+                    self.cart.order_items(), 
                     customer_info['name'],
                     customer_info['table']
                 )
                 
                 # Limpiar carrito
-                self.cart_items.clear()
-                self.update_cart_display()
+                self.cart.clear()
                 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al crear la orden:\n{str(e)}")
@@ -1241,8 +1255,8 @@ class POSWindow(QMainWindow):
             self.kitchen_view.open_history.connect(self.open_payment_history)
             self.stack_widget.addWidget(self.kitchen_view)
         else:
-            # Actualizar órdenes al abrir la vista de cocina
-            self.kitchen_view.load_orders()
+            # Aplicar cambios de órdenes al abrir la vista de cocina
+            self.kitchen_view.refresh_orders()
         
         self.stack_widget.setCurrentWidget(self.kitchen_view)
     
@@ -1274,31 +1288,28 @@ class POSWindow(QMainWindow):
         
         print(f"🔄 Redimensionando ventana: {new_width}x{new_height}")
         
-        # Si el cambio de tamaño es significativo, recalcular el grid
         if hasattr(self, 'screen_width'):
-            width_diff = abs(new_width - self.width() if hasattr(self, '_last_width') else 0)
-            
             # Actualizar dimensiones
-            self._last_width = new_width
             self.screen_width = new_width
             self.screen_height = new_height
             
-            # Recalcular si es pantalla pequeña
+            # Recalcular si es pantalla pequeña; la grilla se redistribuye sola al cambiar su ancho
             old_is_small = self.is_small_screen
             self.is_small_screen = new_width <= 1366
-            
-            # Recargar productos si hay cambio significativo o cambió la categoría de tamaño
-            if width_diff > 50 or old_is_small != self.is_small_screen:
-                print(f"🔄 Recalculando grid por cambio significativo: diff={width_diff}, pequeña={self.is_small_screen}")
-                # Usar QTimer para evitar múltiples recálculos rápidos
-                if hasattr(self, '_resize_timer'):
-                    self._resize_timer.stop()
-                
-                from PyQt5.QtCore import QTimer
-                self._resize_timer = QTimer()
-                self._resize_timer.setSingleShot(True)
-                self._resize_timer.timeout.connect(self.load_products)
-                self._resize_timer.start(100)  # Esperar 100ms antes de recalcular
+            if old_is_small != self.is_small_screen:
+                print(f"🔄 Cambio de modo de pantalla: pequeña={self.is_small_screen}")
+                self.product_grid.set_compact(self.is_small_screen)
+    
+    def set_user(self, user):
+        """Cambiar el usuario de la ventana sin reconstruirla (cambio de cajero)"""
+        previous_user = self.current_user
+        self.current_user = user
+        self.setWindowTitle(f"🍔 POS - Restaurante FastFood - {user.full_name}")
+        
+        # El carrito en curso pertenece al cajero anterior
+        if previous_user is not None and previous_user.id != user.id and self.cart:
+            print(f"🧹 Descartando carrito de {previous_user.username} ({len(self.cart)} productos)")
+            self.cart.clear()
     
     def handle_logout(self):
         """Manejar solicitud de logout"""
@@ -1310,34 +1321,6 @@ class POSWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             self.logout_requested.emit()
     
-    def get_optimal_columns(self):
-        """Calcular número óptimo de columnas según el ancho actual real de la ventana"""
-        # Obtener el ancho real actual de la ventana
-        current_width = self.width()
-        
-        # Calcular ancho disponible para productos (75% del total menos márgenes)
-        available_width = int(current_width * 0.75) - 40  # Restar márgenes y espaciado
-        
-        # Ancho mínimo por botón según el tipo de pantalla
-        if self.is_small_screen:
-            button_width = 300  # Botones más grandes para pantallas pequeñas
-            min_spacing = 10
-        else:
-            button_width = 220  # Botones estándar para pantallas grandes
-            min_spacing = 12
-        
-        # Calcular número de columnas que caben
-        columns = max(1, available_width // (button_width + min_spacing))
-        
-        # Limitar máximo de columnas según resolución
-        if self.is_small_screen:
-            columns = min(columns, 4)  # Máximo 4 columnas en pantallas pequeñas
-        else:
-            columns = min(columns, 6)  # Máximo 6 columnas en pantallas grandes
-        
-        print(f"📐 Cálculo de columnas: ancho_ventana={current_width}, ancho_productos={available_width}, columnas={columns}")
-        return int(columns)
-
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = POSWindow()
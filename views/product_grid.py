@@ -0,0 +1,247 @@
+# views/product_grid.py
+"""
+Grilla virtualizada de productos del POS.
+
+Solo existen los botones (ProductTile) de las filas visibles más un margen;
+al desplazarse, cambiar de categoría o redimensionar se reasignan y
+reposicionan los mismos botones en lugar de destruirlos y crearlos de nuevo.
+El botón del índice i es siempre tiles[i % len(tiles)]: al bajar una fila solo
+se reasignan los botones de la fila que entra.
+"""
+from PyQt5.QtWidgets import QFrame, QLabel, QScrollArea, QVBoxLayout, QWidget
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5 import sip
+from utils.colors import ColorPalette
+from utils.image_cache import get_pixmap_cache
+
+# Filas extra construidas arriba y abajo de las visibles (desplazamiento sin huecos)
+BUFFER_ROWS = 1
+
+class ProductTile(QFrame):
+    """Botón de producto reutilizable: se le asigna un producto con set_product()"""
+
+    clicked = pyqtSignal(object)  # Emite el producto asignado
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.product = None
+        self.compact = None
+        self.image_size = 0
+        self.setCursor(Qt.PointingHandCursor)
+
+        self.tile_layout = QVBoxLayout(self)
+        self.tile_layout.setSpacing(4)
+
+        # Miniatura (desde la caché de imágenes; se decodifica en segundo plano la primera vez)
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setStyleSheet("background: transparent; border: none;")
+        self.image_label.hide()
+        self.tile_layout.addWidget(self.image_label)
+
+        # Nombre del producto
+        self.name_label = QLabel()
+        self.name_label.setAlignment(Qt.AlignCenter)
+        self.name_label.setWordWrap(True)
+        self.tile_layout.addWidget(self.name_label)
+
+        # Precio
+        self.price_label = QLabel()
+        self.price_label.setAlignment(Qt.AlignCenter)
+        self.tile_layout.addWidget(self.price_label)
+
+    def apply_metrics(self, width, height, compact):
+        """Ajustar tamaño y estilo (los estilos solo se recalculan si cambia el modo compacto)"""
+        if (self.width(), self.height()) != (width, height):
+            self.setFixedSize(width, height)
+            self.image_size = max(32, min(56, height // 3))
+            self.image_label.setFixedHeight(self.image_size)
+
+        if compact == self.compact:
+            return
+        self.compact = compact
+
+        if compact:
+            font_size_name = 12
+            font_size_price = 15
+            padding_container = 8
+            padding_name = 5
+        else:
+            font_size_name = 14
+            font_size_price = 16
+            padding_container = 10
+            padding_name = 6
+
+        self.setStyleSheet(f"""
+            QFrame {{
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                           stop:0 {ColorPalette.PLATINUM},
+                           stop:1 {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.1)});
+                border: 2px solid {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.3)};
+                border-radius: 12px;
+                padding: {padding_container}px;
+            }}
+            QFrame:hover {{
+                border: 2px solid {ColorPalette.YINMN_BLUE};
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                           stop:0 {ColorPalette.with_alpha(ColorPalette.YINMN_BLUE, 0.1)},
+                           stop:1 {ColorPalette.with_alpha(ColorPalette.SILVER_LAKE_BLUE, 0.2)});
+            }}
+        """)
+        self.tile_layout.setContentsMargins(padding_container, padding_container, padding_container, padding_container)
+        self.name_label.setStyleSheet(f"""
+            font-size: {font_size_name}px;
+            font-weight: bold;
+            color: {ColorPalette.RICH_BLACK};
+            padding: {padding_name}px;
+            background: transparent;
+        """)
+        self.price_label.setStyleSheet(f"""
+            font-size: {font_size_price}px;
+            font-weight: bold;
+            color: {ColorPalette.SUCCESS};
+            background: {ColorPalette.with_alpha(ColorPalette.SUCCESS, 0.1)};
+            border-radius: 8px;
+            padding: 6px;
+        """)
+
+    def set_product(self, product):
+        """Mostrar un producto en este botón"""
+        if product is self.product:
+            return
+        self.product = product
+        self.name_label.setText(product.name)
+        self.price_label.setText(f"$ {product.price:,.0f}")
+
+        self.image_label.clear()
+        if product.image_path:
+            self.image_label.show()
+            get_pixmap_cache().request(product.image_path, lambda pixmap: self.show_thumbnail(product, pixmap))
+        else:
+            self.image_label.hide()
+
+    def show_thumbnail(self, product, pixmap):
+        """Colocar la miniatura si el botón sigue mostrando el mismo producto"""
+        # El botón pudo reasignarse (o destruirse) antes de que terminara la decodificación
+        if pixmap is None or sip.isdeleted(self) or self.product is not product:
+            return
+        self.image_label.setPixmap(pixmap.scaled(self.image_size, self.image_size,
+                                                 Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+    def mousePressEvent(self, event):
+        """Hacer clickeable todo el botón"""
+        if self.product is not None:
+            self.clicked.emit(self.product)
+
+class ProductGrid(QScrollArea):
+    """Grilla de productos con desplazamiento vertical que solo construye los botones visibles"""
+
+    product_clicked = pyqtSignal(object)
+
+    def __init__(self, spacing=12, margin=15, compact=False, parent=None):
+        super().__init__(parent)
+        self.spacing = spacing
+        self.margin = margin
+        self.compact = compact
+        self.products = ()
+        self.tiles = []
+        self.columns = 1
+        self.tile_width = 200
+        self.tile_height = 100
+        self.visible_range = range(0)
+
+        # Contenido de alto fijo (todas las filas); los botones se posicionan a mano
+        self.setWidgetResizable(False)
+        self.content = QWidget()
+        self.content.setObjectName("productGridContent")
+        self.content.setStyleSheet("QWidget#productGridContent { background: transparent; }")
+        self.setWidget(self.content)
+        self.verticalScrollBar().valueChanged.connect(self.update_visible_tiles)
+
+    def set_products(self, products):
+        """Mostrar otra lista de productos (cambio de categoría o de catálogo)"""
+        self.products = tuple(products)
+        self.verticalScrollBar().setValue(0)
+        self.relayout()
+
+    def set_compact(self, compact):
+        """Cambiar entre botones de pantalla pequeña y estándar"""
+        if compact != self.compact:
+            self.compact = compact
+            self.relayout()
+
+    def resizeEvent(self, event):
+        """Redistribuir los mismos botones con el nuevo ancho"""
+        super().resizeEvent(event)
+        self.relayout()
+
+    def compute_metrics(self, available_width):
+        """Columnas y tamaño de botón para el ancho disponible"""
+        # Ancho mínimo por botón según el tipo de pantalla
+        min_width, max_columns = (300, 4) if self.compact else (220, 6)
+        columns = max(1, min(max_columns, available_width // (min_width + self.spacing)))
+
+        tile_width = max(200, (available_width - self.spacing * (columns - 1)) // columns)
+        if self.compact:
+            tile_height = min(150, int(tile_width * 0.5))  # Relación 2:1
+        else:
+            tile_height = min(160, int(tile_width * 0.55))  # Relación 1.8:1
+        return columns, tile_width, tile_height
+
+    def relayout(self):
+        """Recalcular la geometría y reposicionar los botones visibles"""
+        viewport_width = self.viewport().width()
+        self.columns, self.tile_width, self.tile_height = self.compute_metrics(viewport_width - 2 * self.margin)
+
+        rows = -(-len(self.products) // self.columns)
+        row_height = self.tile_height + self.spacing
+        content_height = 2 * self.margin + max(0, rows * row_height - self.spacing)
+        self.content.resize(viewport_width, content_height)
+
+        # Botones suficientes para las filas visibles más el margen
+        visible_rows = self.viewport().height() // row_height + 1 + 2 * BUFFER_ROWS
+        pool_size = visible_rows * self.columns
+        while len(self.tiles) < pool_size:
+            tile = ProductTile(self.content)
+            tile.clicked.connect(self.product_clicked)
+            tile.hide()
+            self.tiles.append(tile)
+        for tile in self.tiles:
+            tile.apply_metrics(self.tile_width, self.tile_height, self.compact)
+            tile.product = None
+
+        self.visible_range = range(0)
+        self.update_visible_tiles()
+
+    def update_visible_tiles(self):
+        """Asignar y posicionar los botones de las filas visibles"""
+        if not self.tiles:
+            return
+        row_height = self.tile_height + self.spacing
+        top = self.verticalScrollBar().value() - self.margin
+        bottom = top + self.viewport().height()
+        pool_rows = len(self.tiles) // self.columns
+
+        first_row = max(0, top // row_height - BUFFER_ROWS)
+        last_row = min(bottom // row_height + BUFFER_ROWS, first_row + pool_rows - 1)
+        visible = range(first_row * self.columns,
+                        min(len(self.products), (last_row + 1) * self.columns))
+        if visible == self.visible_range:
+            return
+
+        # Ocultar los botones cuyo índice salió de la ventana visible
+        used = {index % len(self.tiles) for index in visible}
+        for position, tile in enumerate(self.tiles):
+            if position not in used and tile.isVisible():
+                tile.hide()
+                tile.product = None
+
+        for index in visible:
+            tile = self.tiles[index % len(self.tiles)]
+            row, col = divmod(index, self.columns)
+            tile.move(self.margin + col * (self.tile_width + self.spacing),
+                      self.margin + row * row_height)
+            tile.set_product(self.products[index])
+            if not tile.isVisible():
+                tile.show()
+        self.visible_range = visible
@@ -10,6 +10,7 @@ from utils.colors import ColorPalette
 from controllers.menu_controller import MenuController
 from controllers.order_controller import OrderController
 from controllers.reports_controller import ReportsController
+from utils.background_loader import BackgroundLoader
 from datetime import datetime, timedelta
 import csv
 import traceback
@@ -26,6 +27,9 @@ class ReportsView(QWidget):
         self.order_ctrl = OrderController()
         self.reports_ctrl = ReportsController()
         
+        # Consultas en segundo plano: la UI muestra los datos anteriores hasta recibir los nuevos
+        self.loader = BackgroundLoader(self)
+        
         # Variables de estado
         self.current_mode = "main"
         self.refresh_timer = QTimer()
@@ -536,6 +540,33 @@ class ReportsView(QWidget):
         except Exception as e:
             print(f"❌ Error cargando resumen por período: {e}")
 
+    def load_bucketed_summary(self, start_date, end_date, granularity):
+        """Cargar la tabla de períodos con una sola consulta agrupada (en segundo plano)"""
+        self.loader.submit(
+            "period_summary",
+            self.reports_ctrl.get_bucketed_metrics, start_date, end_date, granularity,
+            on_result=self.show_bucketed_summary,
+            on_error=lambda error: print(f"❌ Error cargando resumen por período: {error}")
+        )
+
+    def show_bucketed_summary(self, buckets):
+        """Mostrar los períodos recibidos en la tabla"""
+        if self.current_mode != "main":
+            return
+        
+        # Mostrar solo los períodos con ventas
+        period_data = [
+            {
+                'date': bucket['label'],
+                'sales': bucket['total_sales'],
+                'orders': bucket['total_orders'],
+                'avg_ticket': bucket['avg_ticket']
+            }
+            for bucket in buckets if bucket['total_orders'] > 0
+        ]
+        
+        self.populate_period_table(period_data)
+
     def load_daily_summary(self, start_date, end_date):
         """Cargar resumen diario"""
         self.period_summary_table.setColumnCount(4)
@@ -549,22 +580,7 @@ class ReportsView(QWidget):
         self.period_summary_table.setColumnWidth(2, 60)
         self.period_summary_table.setColumnWidth(3, 80)
         
-        # Obtener datos por día
-        current_date = start_date
-        daily_data = []
-        
-        while current_date <= end_date:
-            period_data = self.reports_ctrl.get_period_metrics(current_date, current_date)
-            if period_data and period_data.get('total_orders', 0) > 0:
-                daily_data.append({
-                    'date': current_date.strftime("%d/%m"),
-                    'sales': period_data.get('total_sales', 0.0),
-                    'orders': period_data.get('total_orders', 0),
-                    'avg_ticket': period_data.get('avg_ticket', 0.0)
-                })
-            current_date += timedelta(days=1)
-        
-        self.populate_period_table(daily_data)
+        self.load_bucketed_summary(start_date, end_date, "day")
 
     def load_weekly_summary(self, start_date, end_date):
         """Cargar resumen semanal"""
@@ -579,26 +595,7 @@ class ReportsView(QWidget):
         self.period_summary_table.setColumnWidth(2, 60)
         self.period_summary_table.setColumnWidth(3, 80)
         
-        weekly_data = []
-        current_date = start_date
-        week_num = 1
-        
-        while current_date <= end_date:
-            week_end = min(current_date + timedelta(days=6), end_date)
-            period_data = self.reports_ctrl.get_period_metrics(current_date, week_end)
-            
-            if period_data and period_data.get('total_orders', 0) > 0:
-                weekly_data.append({
-                    'date': f"Sem {week_num}",
-                    'sales': period_data.get('total_sales', 0.0),
-                    'orders': period_data.get('total_orders', 0),
-                    'avg_ticket': period_data.get('avg_ticket', 0.0)
-                })
-            
-            current_date = week_end + timedelta(days=1)
-            week_num += 1
-        
-        self.populate_period_table(weekly_data)
+        self.load_bucketed_summary(start_date, end_date, "week")
 
     def load_monthly_summary(self, start_date, end_date):
         """Cargar resumen mensual"""
@@ -613,30 +610,7 @@ class ReportsView(QWidget):
         self.period_summary_table.setColumnWidth(2, 60)
         self.period_summary_table.setColumnWidth(3, 80)
         
-        monthly_data = []
-        current_date = start_date.replace(day=1)
-        
-        while current_date <= end_date:
-            # Último día del mes
-            if current_date.month == 12:
-                next_month = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                next_month = current_date.replace(month=current_date.month + 1)
-            
-            month_end = min((next_month - timedelta(days=1)), end_date)
-            period_data = self.reports_ctrl.get_period_metrics(current_date, month_end)
-            
-            if period_data and period_data.get('total_orders', 0) > 0:
-                monthly_data.append({
-                    'date': current_date.strftime("%m/%Y"),
-                    'sales': period_data.get('total_sales', 0.0),
-                    'orders': period_data.get('total_orders', 0),
-                    'avg_ticket': period_data.get('avg_ticket', 0.0)
-                })
-            
-            current_date = next_month
-        
-        self.populate_period_table(monthly_data)
+        self.load_bucketed_summary(start_date, end_date, "month")
 
     def populate_period_table(self, data):
         """Poblar la tabla de períodos con datos"""
@@ -665,13 +639,23 @@ class ReportsView(QWidget):
             self.period_summary_table.setItem(0, 3, QTableWidgetItem("-"))
 
     def load_top_products_data(self):
-        """Cargar datos de productos más vendidos"""
+        """Cargar datos de productos más vendidos (en segundo plano)"""
+        start_date = self.start_date.date().toPyDate()
+        end_date = self.end_date.date().toPyDate()
+        
+        self.loader.submit(
+            "top_products",
+            self.reports_ctrl.get_detailed_products_report, start_date, end_date,
+            on_result=self.show_top_products_data,
+            on_error=lambda error: print(f"❌ Error cargando top productos: {error}")
+        )
+
+    def show_top_products_data(self, products_data):
+        """Mostrar productos más vendidos en la tabla"""
+        if self.current_mode != "main":
+            return
+        
         try:
-            start_date = self.start_date.date().toPyDate()
-            end_date = self.end_date.date().toPyDate()
-            
-            products_data = self.reports_ctrl.get_detailed_products_report(start_date, end_date)
-            
             if products_data and len(products_data) > 0:
                 # Limitar a top 10
                 top_products = products_data[:10]
@@ -708,16 +692,33 @@ class ReportsView(QWidget):
             print(f"❌ Error cargando top productos: {e}")
 
     def load_monthly_analysis_data(self):
-        """Cargar análisis mensual"""
+        """Cargar análisis mensual (en segundo plano)"""
+        from datetime import date
+        current_date = datetime.now()
+        
+        # Últimos 6 meses (incluido el actual) en una sola consulta agrupada
+        first_month = current_date.month - 5
+        first_year = current_date.year
+        if first_month <= 0:
+            first_month += 12
+            first_year -= 1
+        
+        self.loader.submit(
+            "monthly_analysis",
+            self.reports_ctrl.get_bucketed_metrics,
+            date(first_year, first_month, 1), date.today(), "month",
+            on_result=self.show_monthly_analysis_data,
+            on_error=lambda error: print(f"❌ Error cargando análisis mensual: {error}")
+        )
+
+    def show_monthly_analysis_data(self, months):
+        """Mostrar métricas del mes actual y comparación de los últimos meses"""
+        if self.current_mode != "main":
+            return
+        
         try:
-            from datetime import datetime, date
-            current_date = datetime.now()
-            
             # Métricas del mes actual
-            month_start = date(current_date.year, current_date.month, 1)
-            month_end = date.today()
-            
-            month_data = self.reports_ctrl.get_period_metrics(month_start, month_end)
+            month_data = months[-1] if months else None
             
             if month_data:
                 # Limpiar layout anterior
@@ -745,33 +746,15 @@ class ReportsView(QWidget):
                     self.monthly_metrics_layout.addWidget(value, i // 2, (i % 2) * 2 + 1)
             
             # Comparación de últimos meses
-            monthly_comparison = []
-            for i in range(6):  # Últimos 6 meses
-                if current_date.month - i <= 0:
-                    month = current_date.month - i + 12
-                    year = current_date.year - 1
-                else:
-                    month = current_date.month - i
-                    year = current_date.year
-                
-                period_start = date(year, month, 1)
-                if month == 12:
-                    period_end = date(year + 1, 1, 1) - timedelta(days=1)
-                else:
-                    period_end = date(year, month + 1, 1) - timedelta(days=1)
-                
-                if period_end > date.today():
-                    period_end = date.today()
-                
-                period_data = self.reports_ctrl.get_period_metrics(period_start, period_end)
-                
-                if period_data and period_data.get('total_orders', 0) > 0:
-                    monthly_comparison.append({
-                        'month': period_start.strftime("%m/%Y"),
-                        'sales': period_data.get('total_sales', 0.0),
-                        'orders': period_data.get('total_orders', 0),
-                        'avg_ticket': period_data.get('avg_ticket', 0.0)
-                    })
+            monthly_comparison = [
+                {
+                    'month': month['label'],
+                    'sales': month['total_sales'],
+                    'orders': month['total_orders'],
+                    'avg_ticket': month['avg_ticket']
+                }
+                for month in months if month['total_orders'] > 0
+            ]
             
             # Poblar tabla de comparación
             if monthly_comparison:
@@ -1001,19 +984,19 @@ class ReportsView(QWidget):
             start_date = self.start_date.date().toPyDate()
             end_date = self.end_date.date().toPyDate()
             
-            # Obtener datos por día
+            # Obtener datos por día desde el resumen diario (días sin ventas en cero)
+            rollup = {day['date']: day for day in self.reports_ctrl.get_daily_rollup(start_date, end_date)}
             current_date = start_date
             periods_data = []
             
             while current_date <= end_date:
-                period_data = self.reports_ctrl.get_period_metrics(current_date, current_date)
-                if period_data:
-                    periods_data.append({
-                        'date': current_date,
-                        'orders': period_data.get('total_orders', 0),
-                        'sales': period_data.get('total_sales', 0.0),
-                        'avg_ticket': period_data.get('avg_ticket', 0.0)
-                    })
+                day = rollup.get(current_date, {})
+                periods_data.append({
+                    'date': current_date,
+                    'orders': day.get('order_count', 0),
+                    'sales': day.get('total_sales', 0.0),
+                    'avg_ticket': day.get('avg_ticket', 0.0)
+                })
                 current_date += timedelta(days=1)
             
             if periods_data:
@@ -1106,7 +1089,11 @@ class ReportsView(QWidget):
         self.end_date.setDate(end_date)
 
     def refresh_data(self):
-        """Actualizar todos los datos"""
+        """Actualizar todos los datos
+
+        Las consultas corren en segundo plano; una actualización nueva (por
+        ejemplo al cambiar el rango de fechas) reemplaza a la pendiente.
+        """
         print("🔄 Actualizando datos de reportes...")
         
         # Cargar métricas principales
@@ -1120,28 +1107,43 @@ class ReportsView(QWidget):
                 self.load_top_products_data()
             if hasattr(self, 'monthly_table'):
                 self.load_monthly_analysis_data()
-        
-        print("✅ Datos actualizados")
 
     def load_main_metrics(self):
-        """Cargar métricas principales"""
+        """Cargar métricas principales (en segundo plano)"""
+        start_date = self.start_date.date().toPyDate()
+        end_date = self.end_date.date().toPyDate()
+        
+        self.loader.submit(
+            "main_metrics",
+            self.fetch_main_metrics, start_date, end_date,
+            on_result=self.show_main_metrics,
+            on_error=self.show_main_metrics_error
+        )
+
+    def fetch_main_metrics(self, start_date, end_date):
+        """Consultar resumen de ventas y margen (se ejecuta en el pool)"""
+        sales_summary = self.reports_ctrl.get_sales_summary(start_date, end_date)
+        
+        overall_margin = 0.0
+        if sales_summary and isinstance(sales_summary, dict):
+            try:
+                margin_data = self.reports_ctrl.get_profit_margin_analysis(start_date, end_date)
+                overall_margin = margin_data.get('overall_margin', 0.0) if margin_data else 0.0
+            except:
+                overall_margin = 0.0
+        
+        return sales_summary, overall_margin
+
+    def show_main_metrics(self, data):
+        """Mostrar métricas principales recibidas del pool"""
         try:
-            start_date = self.start_date.date().toPyDate()
-            end_date = self.end_date.date().toPyDate()
-            
-            sales_summary = self.reports_ctrl.get_sales_summary(start_date, end_date)
+            sales_summary, overall_margin = data
             
             if sales_summary and isinstance(sales_summary, dict):
                 total_sales = sales_summary.get('total_sales', 0.0)
                 total_orders = sales_summary.get('total_orders', 0)
                 avg_ticket = sales_summary.get('avg_ticket', 0.0)
                 
-                try:
-                    margin_data = self.reports_ctrl.get_profit_margin_analysis(start_date, end_date)
-                    overall_margin = margin_data.get('overall_margin', 0.0) if margin_data else 0.0
-                except:
-                    overall_margin = 0.0
-                
                 # Si no hay datos reales, mostrar ceros en lugar de datos falsos
                 if total_orders == 0:
                     print("ℹ️  No hay datos de ventas - mostrando métricas en cero")
@@ -1160,11 +1162,15 @@ class ReportsView(QWidget):
                 self.margin_value.setText("0%")
                 
         except Exception as e:
-            print(f"❌ Error cargando métricas: {e}")
-            self.sales_value.setText("Error")
-            self.orders_value.setText("Error")
-            self.avg_value.setText("Error")
-            self.margin_value.setText("Error")
+            self.show_main_metrics_error(str(e))
+
+    def show_main_metrics_error(self, error):
+        """Marcar las métricas principales con error"""
+        print(f"❌ Error cargando métricas: {error}")
+        self.sales_value.setText("Error")
+        self.orders_value.setText("Error")
+        self.avg_value.setText("Error")
+        self.margin_value.setText("Error")
 
     def export_report(self):
         """Exportar reporte completo a CSV"""